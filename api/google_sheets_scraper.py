@@ -5,6 +5,7 @@ from googleapiclient.errors import HttpError
 import logging
 from datetime import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Logging ayarı - Vercel için sadece console'a log
 logging.basicConfig(
@@ -47,7 +48,7 @@ class GoogleSheetsRestaurantScraper:
         
         logger.info("GoogleSheetsRestaurantScraper başlatıldı")
     
-    def search_restaurants(self, location, restaurant_type, radius=2000, min_rating=4.5, restaurant_name=None):
+    def search_restaurants(self, location, restaurant_type, radius=2000, min_rating=4.5, restaurant_name=None, fetch_details=True):
         """
         Google Maps'te restoran arar
         
@@ -57,6 +58,7 @@ class GoogleSheetsRestaurantScraper:
             radius: Arama yarıçapı (metre)
             min_rating: Minimum puan filtresi (varsayılan: 4.5)
             restaurant_name: Opsiyonel restoran adı filtresi
+            fetch_details: False ise Place Details çağrılmaz (bkz. hydrate_restaurants)
             
         Returns:
             list: Restoran listesi
@@ -205,7 +207,7 @@ class GoogleSheetsRestaurantScraper:
                 filtered_results.append(place)
             
             # Filtrelenmiş sonuçları işle
-            restaurants.extend(self._extract_restaurant_info(filtered_results, min_rating))
+            restaurants.extend(self._extract_restaurant_info(filtered_results, min_rating, fetch_details=fetch_details))
             
             # Eğer yeterli sonuç yoksa, nearby search ile destekle
             if len(restaurants) < 30:
@@ -290,7 +292,7 @@ class GoogleSheetsRestaurantScraper:
                         filtered_results.append(place)
                     
                     # Yeni sonuçları işle
-                    new_restaurants = self._extract_restaurant_info([p for p in filtered_results if p.get('place_id') not in [r.get('place_id') for r in restaurants]], min_rating)
+                    new_restaurants = self._extract_restaurant_info([p for p in filtered_results if p.get('place_id') not in [r.get('place_id') for r in restaurants]], min_rating, fetch_details=fetch_details)
                     restaurants.extend(new_restaurants)
             
             # Puana göre sırala (yüksekten düşüğe)
@@ -303,13 +305,15 @@ class GoogleSheetsRestaurantScraper:
             logger.error(f"Arama hatası: {str(e)}")
             return restaurants
     
-    def _extract_restaurant_info(self, places, min_rating=4.5):
+    def _extract_restaurant_info(self, places, min_rating=4.5, fetch_details=True):
         """
         Google Places API sonuçlarından restoran bilgilerini çıkarır
         
         Args:
             places: Places API sonuçları
             min_rating: Minimum puan filtresi
+            fetch_details: False ise Place Details çağrılmaz, 'Telefon' None kalır
+                (sonradan hydrate_restaurants ile doldurulur)
             
         Returns:
             list: Restoran bilgileri
@@ -321,43 +325,55 @@ class GoogleSheetsRestaurantScraper:
             rating = place.get('rating', 0)
             if rating < min_rating:
                 continue
-                
-            # Detaylı bilgi için place details çağrısı
-            try:
-                place_details = self.gmaps.place(place['place_id'], language='tr')
-                details = place_details.get('result', {})
-                
-                # Çalışma saatlerini al
-                opening_hours = self._format_opening_hours(details.get('opening_hours', {}))
-                
-                restaurant = {
-                    'İsim': place.get('name', ''),
-                    'Adres': place.get('vicinity', ''),
-                    'Puan': rating,
-                    'Yorum Sayısı': place.get('user_ratings_total', 0),
-                    'Telefon': details.get('formatted_phone_number', 'Bilinmiyor'),
-                    'Google Maps URL': f"https://www.google.com/maps/place/?q=place_id:{place.get('place_id')}",
-                    'place_id': place.get('place_id')
-                }
-                restaurants.append(restaurant)
-                
-            except Exception as e:
-                logger.warning(f"Detay alınamadı: {place.get('name', 'Unknown')} - {str(e)}")
-                # Detay alınamazsa temel bilgilerle devam et
-                restaurant = {
-                    'İsim': place.get('name', ''),
-                    'Adres': place.get('vicinity', ''),
-                    'Puan': rating,
-                    'Yorum Sayısı': place.get('user_ratings_total', 0),
-                    'Telefon': 'Bilinmiyor',
-                    'Google Maps URL': f"https://www.google.com/maps/place/?q=place_id:{place.get('place_id')}",
-                    'place_id': place.get('place_id'),
-                    'Tarih': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                restaurants.append(restaurant)
+            
+            restaurant = {
+                'İsim': place.get('name', ''),
+                'Adres': place.get('vicinity', ''),
+                'Puan': rating,
+                'Yorum Sayısı': place.get('user_ratings_total', 0),
+                'Telefon': None,
+                'Google Maps URL': f"https://www.google.com/maps/place/?q=place_id:{place.get('place_id')}",
+                'place_id': place.get('place_id')
+            }
+            if fetch_details:
+                self._hydrate_restaurant(restaurant)
+            restaurants.append(restaurant)
+        
+        return restaurants
+    
+    def hydrate_restaurants(self, restaurants):
+        """
+        Detayı henüz alınmamış restoranlar için Place Details çeker
         
+        Sayfalı aramada sadece istenen sayfadaki satırlar için çağrılır,
+        böylece Details çağrısı sayısı toplam sonuç yerine sayfa boyutu kadar olur.
+        
+        Args:
+            restaurants: _extract_restaurant_info(fetch_details=False) satırları
+            
+        Returns:
+            list: Aynı liste (yerinde güncellenir)
+        """
+        pending = [r for r in restaurants if r.get('Telefon') is None]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(4, len(pending))) as executor:
+                list(executor.map(self._hydrate_restaurant, pending))
         return restaurants
     
+    def _hydrate_restaurant(self, restaurant):
+        """Tek bir restoran satırına Place Details bilgilerini ekler"""
+        try:
+            # Detaylı bilgi için place details çağrısı
+            place_details = self.gmaps.place(restaurant['place_id'], language='tr')
+            details = place_details.get('result', {})
+            restaurant['Telefon'] = details.get('formatted_phone_number', 'Bilinmiyor')
+        except Exception as e:
+            logger.warning(f"Detay alınamadı: {restaurant['İsim'] or 'Unknown'} - {str(e)}")
+            # Detay alınamazsa temel bilgilerle devam et
+            restaurant['Telefon'] = 'Bilinmiyor'
+            restaurant['Tarih'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return restaurant
+    
     def _format_opening_hours(self, opening_hours):
         """Çalışma saatlerini formatlar"""
         if not opening_hours or 'weekday_text' not in opening_hours:
@@ -524,7 +540,8 @@ class GoogleSheetsRestaurantScraper:
             restaurant_name: Opsiyonel restoran adı filtresi
             
         Returns:
-            dict: İşlem sonucu
+            dict: İşlem sonucu ('restaurants' alanında sheet'e yazılan liste döner,
+                böylece çağıran tarafın aynı aramayı tekrar yapmasına gerek kalmaz)
         """
         try:
             # Restoran ara
@@ -534,7 +551,8 @@ class GoogleSheetsRestaurantScraper:
                 return {
                     'success': False,
                     'message': 'Restoran bulunamadı',
-                    'count': 0
+                    'count': 0,
+                    'restaurants': []
                 }
             
             # Sheet'e yaz
@@ -544,13 +562,15 @@ class GoogleSheetsRestaurantScraper:
                 return {
                     'success': True,
                     'message': f'{len(restaurants)} restoran bulundu ve kaydedildi',
-                    'count': len(restaurants)
+                    'count': len(restaurants),
+                    'restaurants': restaurants
                 }
             else:
                 return {
                     'success': False,
                     'message': 'Sheet güncellenemedi',
-                    'count': len(restaurants)
+                    'count': len(restaurants),
+                    'restaurants': restaurants
                 }
             
         except Exception as e:
@@ -558,7 +578,8 @@ class GoogleSheetsRestaurantScraper:
             return {
                 'success': False,
                 'message': str(e),
-                'count': 0
+                'count': 0,
+                'restaurants': []
             }
     
     def batch_search_to_sheets(self, searches):
@@ -581,6 +602,8 @@ class GoogleSheetsRestaurantScraper:
                 search['restaurant_type'],
                 search['sheet_name']
             )
+            # Toplu özet için restoran listesi taşınmaz (sadece sheet'e yazılır)
+            result.pop('restaurants', None)
             
             results.append({
                 'location': search['location'],
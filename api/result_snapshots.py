@@ -0,0 +1,179 @@
+import base64
+import json
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Snapshot'ların varsayılan geçerlilik süresi (saniye)
+DEFAULT_SNAPSHOT_TTL = 15 * 60
+
+
+def encode_cursor(snapshot_id, offset):
+    """Snapshot id ve başlangıç indeksinden opak bir cursor üretir"""
+    raw = json.dumps({'s': snapshot_id, 'o': offset}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Cursor'ı çözer
+
+    Returns:
+        tuple: (snapshot_id, offset) ya da geçersizse None
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        offset = int(payload['o'])
+        if offset < 0:
+            return None
+        return payload['s'], offset
+    except Exception:
+        return None
+
+
+class MemorySnapshotStore:
+    """
+    Sıralanmış arama sonuçlarını process belleğinde tutar (Flask için).
+    Süresi dolan ve sınırı aşan en eski snapshot'lar atılır.
+    """
+
+    def __init__(self, ttl=DEFAULT_SNAPSHOT_TTL, max_snapshots=200):
+        self.ttl = ttl
+        self.max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()  # snapshot_id -> (expires_at, rows, meta)
+        self._lock = threading.Lock()
+
+    def save(self, rows, meta=None):
+        """
+        Sonuç listesini saklar ve snapshot id döner
+
+        Args:
+            rows: Sıralı sonuç satırları
+            meta: Sayfalarla birlikte dönecek ek bilgi (optional, örn. kısmi sonucun devam token'ı)
+        """
+        snapshot_id = secrets.token_urlsafe(12)
+        now = time.time()
+        with self._lock:
+            self._snapshots[snapshot_id] = (now + self.ttl, rows, meta)
+            for key in [k for k, (expires_at, _, _) in self._snapshots.items() if expires_at <= now]:
+                del self._snapshots[key]
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def load_page(self, snapshot_id, offset, limit):
+        """
+        Snapshot'tan bir sayfa döner
+
+        Returns:
+            tuple: (sayfa satırları, toplam satır sayısı, meta) ya da snapshot yoksa/süresi dolduysa None
+        """
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+            if not entry:
+                return None
+            if entry[0] <= time.time():
+                del self._snapshots[snapshot_id]
+                return None
+            _, rows, meta = entry
+            return rows[offset:offset + limit], len(rows), meta
+
+
+class SQLiteSnapshotStore:
+    """
+    Snapshot'ları SQLite dosyasında satır satır tutar (serverless için, örn. /tmp altında).
+    Aynı instance'a düşen sonraki sayfa istekleri Google'a gitmeden,
+    sadece o sayfanın satırları okunarak cevaplanır.
+    """
+
+    def __init__(self, db_path, ttl=DEFAULT_SNAPSHOT_TTL, encode_row=None, decode_row=None):
+        """
+        Args:
+            db_path: SQLite dosya yolu
+            ttl: Snapshot geçerlilik süresi (saniye)
+            encode_row: Satırı JSON'a yazılabilir hale getiren fonksiyon (optional, örn. Restaurant.to_dict;
+                verilmezse satırların zaten dict olduğu varsayılır)
+            decode_row: encode_row'un tersi (optional, örn. Restaurant.from_dict)
+        """
+        self.ttl = ttl
+        self.encode_row = encode_row
+        self.decode_row = decode_row
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_snapshots ("
+            "snapshot_id TEXT PRIMARY KEY, total INTEGER NOT NULL, expires_at REAL NOT NULL, meta TEXT)"
+        )
+        try:
+            # meta kolonu sonradan eklendi - eski dosyalar için
+            self._conn.execute("ALTER TABLE result_snapshots ADD COLUMN meta TEXT")
+        except sqlite3.OperationalError:
+            pass
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_snapshot_rows ("
+            "snapshot_id TEXT NOT NULL, position INTEGER NOT NULL, row TEXT NOT NULL, "
+            "PRIMARY KEY (snapshot_id, position))"
+        )
+        self._conn.commit()
+
+    def save(self, rows, meta=None):
+        """Sonuç listesini (ve JSON'a yazılabilir meta bilgisini) saklar ve snapshot id döner"""
+        snapshot_id = secrets.token_urlsafe(12)
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "DELETE FROM result_snapshot_rows WHERE snapshot_id IN ("
+                    "SELECT snapshot_id FROM result_snapshots WHERE expires_at <= ?)",
+                    (now,)
+                )
+                self._conn.execute("DELETE FROM result_snapshots WHERE expires_at <= ?", (now,))
+                self._conn.execute(
+                    "INSERT INTO result_snapshots (snapshot_id, total, expires_at, meta) VALUES (?, ?, ?, ?)",
+                    (snapshot_id, len(rows), now + self.ttl, json.dumps(meta) if meta is not None else None)
+                )
+                encode = self.encode_row or (lambda row: row)
+                self._conn.executemany(
+                    "INSERT INTO result_snapshot_rows (snapshot_id, position, row) VALUES (?, ?, ?)",
+                    ((snapshot_id, position, json.dumps(encode(row), ensure_ascii=False))
+                     for position, row in enumerate(rows))
+                )
+                self._conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                # Kaydedilemeyen snapshot bulunamamış sayılır - sonraki sayfa aramayla yeniden üretilir
+                logger.warning(f"Snapshot kaydedilemedi: {e}")
+                self._conn.rollback()
+        return snapshot_id
+
+    def load_page(self, snapshot_id, offset, limit):
+        """
+        Snapshot'tan bir sayfa döner
+
+        Returns:
+            tuple: (sayfa satırları, toplam satır sayısı, meta) ya da snapshot yoksa/süresi dolduysa None
+        """
+        with self._lock:
+            try:
+                snapshot = self._conn.execute(
+                    "SELECT total, meta FROM result_snapshots WHERE snapshot_id = ? AND expires_at > ?",
+                    (snapshot_id, time.time())
+                ).fetchone()
+                if not snapshot:
+                    return None
+                rows = self._conn.execute(
+                    "SELECT row FROM result_snapshot_rows WHERE snapshot_id = ? AND position >= ? "
+                    "ORDER BY position LIMIT ?",
+                    (snapshot_id, offset, limit)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Snapshot okunamadı: {e}")
+                return None
+        meta = json.loads(snapshot[1]) if snapshot[1] is not None else None
+        decode = self.decode_row or (lambda row: row)
+        return [decode(json.loads(row[0])) for row in rows], snapshot[0], meta
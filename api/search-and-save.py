@@ -128,12 +128,11 @@ class handler(BaseHTTPRequestHandler):
             
             sheet_name = "_".join(sheet_parts).replace(' ', '_')
             
-            # Search and save to sheets
+            # Search and save to sheets (returns the saved list, so no second search is needed)
             result = scraper.run_search_to_sheets(location, search_food_type, sheet_name, min_rating=min_rating, restaurant_name=restaurant_name)
             
             if result['success'] and result['count'] > 0:
-                # Get the restaurant data for response
-                restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name)
+                restaurants = result['restaurants']
                 
                 self.end_headers()
                 response = {
@@ -18,6 +18,16 @@ except ImportError as e:
     logger.error(f"Failed to import GoogleSheetsRestaurantScraper: {e}")
     GoogleSheetsRestaurantScraper = None
 
+from result_snapshots import SQLiteSnapshotStore, encode_cursor, decode_cursor
+
+# Sonuç snapshot'ları - serverless instance sıcak kaldığı sürece /tmp altında yaşar.
+# Snapshot bulunamazsa arama 'page' parametresiyle yeniden yapılır.
+snapshot_store = None
+try:
+    snapshot_store = SQLiteSnapshotStore('/tmp/result_snapshots.db')
+except Exception as e:
+    logger.error(f"Snapshot store error: {e}")
+
 # Initialize scraper
 scraper = None
 try:
@@ -58,28 +68,52 @@ try:
 except Exception as e:
     logger.error(f"Config error: {e}")
 
+# İstekle verilebilecek en büyük sayfa boyutu - üstündekiler bu sınıra çekilir (bkz. backend/flask_app.py)
+MAX_PER_PAGE = 500
+
+def _positive_param(data, name, cast, default, maximum=None):
+    """
+    İstekteki sayısal parametreyi okur ve doğrular (backend/flask_app.py ile aynı kurallar)
+    
+    Raises:
+        ValueError: Değer sayı değilse ya da sıfırdan büyük değilse
+    """
+    value = data.get(name)
+    if value is None:
+        return default
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        value = cast(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} geçerli bir sayı olmalı")
+    if not value > 0:
+        raise ValueError(f"{name} sıfırdan büyük olmalı")
+    return min(value, maximum) if maximum is not None else value
+
 class handler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
-        
+    def _send_json(self, status, response):
+        self.send_response(status)
         # Handle CORS
-        self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode())
+    
+    def do_POST(self):
+        content_length = int(self.headers['Content-Length'])
+        post_data = self.rfile.read(content_length)
         
         try:
             data = json.loads(post_data.decode('utf-8'))
             
             if not scraper:
-                self.end_headers()
-                response = {
+                self._send_json(500, {
                     "success": False,
                     "error": "API yapılandırması eksik. Lütfen environment variables kontrolü yapın."
-                }
-                self.wfile.write(json.dumps(response).encode())
+                })
                 return
                 
             city = data.get('city')
@@ -87,26 +121,23 @@ class handler(BaseHTTPRequestHandler):
             food_type = data.get('foodType')
             min_rating = data.get('minRating', 4.5)
             restaurant_name = data.get('restaurantName', None)
-            page = data.get('page', 1)
-            per_page = data.get('perPage', 20)
+            # Geçersiz sayfa değerleri 400 döner (negatif perPage LIMIT -1 ile tüm satırları okuturdu)
+            page = _positive_param(data, 'page', int, 1)
+            per_page = _positive_param(data, 'perPage', int, 20, MAX_PER_PAGE)
             
             # En az şehir ve (ilçe veya yemek türü veya restoran adı) gerekli
             if not city:
-                self.end_headers()
-                response = {
+                self._send_json(400, {
                     "success": False,
                     "error": "Şehir seçimi zorunludur"
-                }
-                self.wfile.write(json.dumps(response).encode())
+                })
                 return
             
             if not any([district, food_type, restaurant_name]):
-                self.end_headers()
-                response = {
+                self._send_json(400, {
                     "success": False,
                     "error": "İlçe, yemek türü veya restoran adından en az birini belirtmelisiniz"
-                }
-                self.wfile.write(json.dumps(response).encode())
+                })
                 return
             
             # Lokasyon oluştur
@@ -118,34 +149,54 @@ class handler(BaseHTTPRequestHandler):
             # Yemek türü yoksa genel arama yap
             search_food_type = food_type if food_type else "restaurant"
             
-            all_restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name)
+            # Not: maxCalls/timeLimit/enoughResults/resumeToken (çağrı bütçesi ve kısmi sonuç) sadece
+            # Flask backend'inde var; buradaki eski scraper kopyası aramayı her zaman tamamlar ve
+            # bu parametreleri yok sayar (bkz. VERCEL_DEPLOYMENT.md)
+            cursor = data.get('cursor')
+            decoded = decode_cursor(cursor) if cursor and snapshot_store else None
+            snapshot_page = snapshot_store.load_page(decoded[0], decoded[1], per_page) if decoded else None
+            
+            if snapshot_page:
+                # Sonraki sayfa: Google'a gitmeden snapshot'tan oku
+                snapshot_id, start_idx = decoded
+                restaurants, total_count, _ = snapshot_page
+            else:
+                # Sıralama ve filtreleme temel arama verisiyle yapılır, detaylar sadece istenen sayfa için çekilir
+                all_restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name, fetch_details=False)
+                snapshot_id = snapshot_store.save(all_restaurants) if snapshot_store else None
+                
+                # Pagination uygula
+                start_idx = (page - 1) * per_page
+                restaurants = all_restaurants[start_idx:start_idx + per_page]
+                total_count = len(all_restaurants)
             
-            # Pagination uygula
-            start_idx = (page - 1) * per_page
             end_idx = start_idx + per_page
-            restaurants = all_restaurants[start_idx:end_idx]
+            restaurants = scraper.hydrate_restaurants(restaurants)
+            has_more = end_idx < total_count
             
-            self.end_headers()
-            response = {
+            self._send_json(200, {
                 "success": True,
                 "data": restaurants,
                 "count": len(restaurants),
-                "totalCount": len(all_restaurants),
+                "totalCount": total_count,
                 "page": page,
                 "perPage": per_page,
-                "hasMore": end_idx < len(all_restaurants),
+                "hasMore": has_more,
+                "nextCursor": encode_cursor(snapshot_id, end_idx) if has_more and snapshot_id else None,
                 "location": location,
                 "foodType": food_type
-            }
-            self.wfile.write(json.dumps(response).encode())
+            })
             
+        except ValueError as e:
+            self._send_json(400, {
+                "success": False,
+                "error": str(e)
+            })
         except Exception as e:
-            self.end_headers()
-            response = {
+            self._send_json(500, {
                 "success": False,
                 "error": str(e)
-            }
-            self.wfile.write(json.dumps(response).encode())
+            })
             
     def do_OPTIONS(self):
         # Handle CORS preflight
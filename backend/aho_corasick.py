@@ -0,0 +1,73 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Çoklu desen eşleyici (Aho–Corasick otomatı).
+
+    Her desen bir etiketle eklenir; metin tek geçişte taranır ve içinde geçen
+    desenlerin etiketleri döner. Geçişler otomat kurulurken başarısızlık
+    bağlantılarıyla birlikte çözülür, böylece tarama karakter başına tek bir
+    sözlük araması yapar.
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns: (desen, etiket) çiftleri - aynı desen birden fazla etiketle eklenebilir
+        """
+        self._delta = [{}]      # durum -> {karakter: sonraki durum}
+        self._outputs = [set()]  # durum -> o durumda biten desenlerin etiketleri
+        self._always = set()     # boş desenler her metinde "geçer"
+
+        for pattern, label in patterns:
+            if not pattern:
+                self._always.add(label)
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._delta[state].get(char)
+                if next_state is None:
+                    next_state = len(self._delta)
+                    self._delta.append({})
+                    self._outputs.append(set())
+                    self._delta[state][char] = next_state
+                state = next_state
+            self._outputs[state].add(label)
+
+        self._build()
+        self._outputs = [frozenset(output) for output in self._outputs]
+        self._always = frozenset(self._always)
+
+    def _build(self):
+        """Başarısızlık bağlantılarını kurar ve geçişleri tam otomata (DFA) çevirir"""
+        fail = [0] * len(self._delta)
+        trie = [dict(transitions) for transitions in self._delta]
+        queue = deque(trie[0].values())
+        while queue:
+            state = queue.popleft()
+            # Eksik geçişler başarısızlık durumunun geçişlerinden devralınır (BFS sırası sayesinde hazır)
+            transitions = dict(self._delta[fail[state]])
+            transitions.update(trie[state])
+            self._delta[state] = transitions
+            self._outputs[state] |= self._outputs[fail[state]]
+            for char, child in trie[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+
+    def scan(self, text):
+        """
+        Metni tek geçişte tarar
+
+        Returns:
+            frozenset: Metinde geçen desenlerin etiketleri
+        """
+        found = self._always
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found = found | outputs[state]
+        return found
@@ -0,0 +1,94 @@
+import math
+
+# 1 derece enlem ~111.32 km
+METRES_PER_LAT_DEGREE = 111320.0
+
+# places_nearby en fazla 3 sayfa x 20 sonuç döner; son sayfası da dolu gelen hücre doymuştur
+NEARBY_MAX_PAGES = 3
+NEARBY_PAGE_SIZE = 20
+
+
+class CoverageCell:
+    """
+    Kapsama planındaki kare hücre. Hücre, merkezinden köşesine kadar olan
+    yarıçaplı bir çemberle (places_nearby radius) tamamen kapsanır.
+    """
+
+    __slots__ = ('lat', 'lng', 'half_lat', 'half_lng', 'radius', 'depth')
+
+    def __init__(self, lat, lng, half_lat, half_lng, radius, depth=0):
+        self.lat = lat
+        self.lng = lng
+        self.half_lat = half_lat
+        self.half_lng = half_lng
+        self.radius = radius
+        self.depth = depth
+
+    @property
+    def center(self):
+        return {'lat': self.lat, 'lng': self.lng}
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def split(self):
+        """Hücreyi quadtree gibi 4 eşit alt hücreye böler"""
+        half_lat = self.half_lat / 2
+        half_lng = self.half_lng / 2
+        return [
+            CoverageCell(self.lat + d_lat * half_lat, self.lng + d_lng * half_lng,
+                         half_lat, half_lng, self.radius / 2, self.depth + 1)
+            for d_lat in (-1, 1) for d_lng in (-1, 1)
+        ]
+
+    def __repr__(self):
+        return f"CoverageCell({self.lat:.4f}, {self.lng:.4f}, r={self.radius:.0f}m, d={self.depth})"
+
+
+def tile_bounds(bounds, radius):
+    """
+    Sınırları, verilen yarıçaptaki çemberlerin boşluksuz kapsayacağı kare hücrelere böler
+
+    Yarıçapı r olan çember, kenarı r*sqrt(2) olan kareyi tamamen kapsar.
+
+    Args:
+        bounds: {'north', 'south', 'east', 'west'} sınırları
+        radius: Hücre başına arama yarıçapı (metre)
+
+    Returns:
+        list: CoverageCell listesi
+    """
+    side = radius * math.sqrt(2)
+    mid_lat = (bounds['north'] + bounds['south']) / 2
+    lat_span_m = (bounds['north'] - bounds['south']) * METRES_PER_LAT_DEGREE
+    lng_span_m = (bounds['east'] - bounds['west']) * METRES_PER_LAT_DEGREE * math.cos(math.radians(mid_lat))
+
+    rows = max(1, math.ceil(lat_span_m / side))
+    cols = max(1, math.ceil(lng_span_m / side))
+    lat_step = (bounds['north'] - bounds['south']) / rows
+    lng_step = (bounds['east'] - bounds['west']) / cols
+
+    # Kenarlar eşit bölündüğü için hücreler side'dan küçük olabilir; yarıçap köşeye göre hesaplanır
+    cell_radius = math.hypot(lat_step * METRES_PER_LAT_DEGREE,
+                             lng_step * METRES_PER_LAT_DEGREE * math.cos(math.radians(mid_lat))) / 2
+
+    cells = []
+    for r in range(rows):
+        for c in range(cols):
+            cells.append(CoverageCell(
+                bounds['south'] + (r + 0.5) * lat_step,
+                bounds['west'] + (c + 0.5) * lng_step,
+                lat_step / 2,
+                lng_step / 2,
+                math.ceil(cell_radius)
+            ))
+    return cells
+
+
+def is_saturated(pages):
+    """places_nearby sonucu sonuç sınırına ulaştıysa (hücrede daha fazla yer olabilir) True"""
+    return len(pages) >= NEARBY_MAX_PAGES and len(pages[-1]) >= NEARBY_PAGE_SIZE
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# next_page_token'lar kısa ömürlü; bundan eski token'lı sorgular baştan çalıştırılır (saniye)
+PAGE_TOKEN_MAX_AGE = 5 * 60
+
+# Bu süredir ilerlemeyen taramalar terk edilmiş sayılır ve silinir (saniye)
+CHECKPOINT_MAX_AGE = 24 * 3600
+
+# Checkpoint'te saklanan place alanları (fotoğraf, ikon vb. taşınmaz)
+CHECKPOINT_PLACE_FIELDS = ('place_id', 'name', 'formatted_address', 'vicinity', 'rating',
+                           'user_ratings_total', 'geometry')
+
+
+def make_crawl_id(key):
+    """Normalize arama anahtarından sabit bir crawl id üretir"""
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False, default=str).encode()).hexdigest()
+
+
+class CrawlCheckpoint:
+    """
+    Uzun süren full scan taramalarının ilerlemesini SQLite'a yazar.
+
+    Biten sorgular, bekleyen page token'lar ve toplanan yerler saklanır;
+    tarama yarıda kesilirse (hata, serverless timeout) aynı arama tekrar
+    başlatıldığında kaldığı yerden devam eder.
+    """
+
+    def __init__(self, db_path='crawl_checkpoints.db', max_age=CHECKPOINT_MAX_AGE):
+        """
+        Args:
+            db_path: SQLite dosya yolu
+            max_age: Son ilerlemesinden bu yana bu kadar saniye geçen taramalar devam ettirilmez, silinir
+        """
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._crawl_locks_guard = threading.Lock()
+        self._crawl_locks = {}  # crawl_id -> [Lock, bekleyen sayısı]
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_jobs ("
+            "crawl_id TEXT NOT NULL, job_id INTEGER NOT NULL, job TEXT NOT NULL, "
+            "done INTEGER NOT NULL DEFAULT 0, page_token TEXT, pages_done INTEGER NOT NULL DEFAULT 0, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (crawl_id, job_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_places ("
+            "crawl_id TEXT NOT NULL, place_id TEXT NOT NULL, position INTEGER NOT NULL, place TEXT NOT NULL, "
+            "PRIMARY KEY (crawl_id, place_id))"
+        )
+        self._conn.commit()
+        self.purge_expired()
+
+    @contextmanager
+    def exclusive(self, crawl_id):
+        """
+        Aynı taramanın bu süreçte tek seferde çalışmasını sağlar
+
+        Aynı crawl_id ile eş zamanlı gelen çalıştırma öncekinin bitmesini bekler;
+        böylece aynı sorgular iki kez eklenmez ve biri diğerinin süren checkpoint'ini silmez.
+        """
+        with self._crawl_locks_guard:
+            entry = self._crawl_locks.setdefault(crawl_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._crawl_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._crawl_locks[crawl_id]
+
+    def load(self, crawl_id):
+        """
+        Kayıtlı bir tarama varsa durumunu döner
+
+        Son ilerlemesi max_age'den eski taramalar silinir ve yokmuş gibi davranılır;
+        tarama baştan başlar.
+
+        Returns:
+            dict: {'jobs': [(job_id, job, page_token, pages_done, done)], 'places': [place]} ya da None
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, job, page_token, pages_done, done, updated_at FROM crawl_jobs "
+                "WHERE crawl_id = ? ORDER BY job_id",
+                (crawl_id,)
+            ).fetchall()
+            if not rows:
+                return None
+            if self.max_age is not None and now - max(row[5] for row in rows) > self.max_age:
+                logger.info(f"Checkpoint süresi dolmuş, tarama baştan başlayacak: {crawl_id}")
+                self._delete(crawl_id)
+                return None
+            places = self._conn.execute(
+                "SELECT place FROM crawl_places WHERE crawl_id = ? ORDER BY position",
+                (crawl_id,)
+            ).fetchall()
+
+        jobs = []
+        for job_id, job, page_token, pages_done, done, updated_at in rows:
+            if page_token and now - updated_at > PAGE_TOKEN_MAX_AGE:
+                # Token'ın süresi dolmuş olabilir - sorguyu baştan al (tekrarlar dedupe ile elenir)
+                page_token, pages_done = None, 0
+            jobs.append((job_id, json.loads(job), page_token, pages_done, bool(done)))
+        return {'jobs': jobs, 'places': [json.loads(row[0]) for row in places]}
+
+    def add_jobs(self, crawl_id, jobs):
+        """
+        Sorguları bekleyen olarak kaydeder
+
+        Returns:
+            list: Sorguların job_id'leri
+        """
+        with self._lock:
+            start = self._conn.execute(
+                "SELECT COALESCE(MAX(job_id), -1) + 1 FROM crawl_jobs WHERE crawl_id = ?",
+                (crawl_id,)
+            ).fetchone()[0]
+            job_ids = list(range(start, start + len(jobs)))
+            now = time.time()
+            self._conn.executemany(
+                "INSERT INTO crawl_jobs (crawl_id, job_id, job, updated_at) VALUES (?, ?, ?, ?)",
+                [(crawl_id, job_id, json.dumps(job, ensure_ascii=False), now) for job_id, job in zip(job_ids, jobs)]
+            )
+            self._conn.commit()
+        return job_ids
+
+    def record_page(self, crawl_id, job_id, places, next_page_token):
+        """Bir sorgunun bir sayfasını (yeni yerler + sonraki token) kaydeder"""
+        with self._lock:
+            position = self._conn.execute(
+                "SELECT COUNT(*) FROM crawl_places WHERE crawl_id = ?", (crawl_id,)
+            ).fetchone()[0]
+            rows = []
+            for place in places:
+                if not place.get('place_id'):
+                    continue
+                slim = {key: place[key] for key in CHECKPOINT_PLACE_FIELDS if key in place}
+                rows.append((crawl_id, place['place_id'], position, json.dumps(slim, ensure_ascii=False)))
+                position += 1
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_places (crawl_id, place_id, position, place) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "UPDATE crawl_jobs SET page_token = ?, pages_done = pages_done + 1, updated_at = ? "
+                "WHERE crawl_id = ? AND job_id = ?",
+                (next_page_token, time.time(), crawl_id, job_id)
+            )
+            self._conn.commit()
+
+    def finish_job(self, crawl_id, job_id):
+        """Sorguyu tamamlandı olarak işaretler"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_jobs SET done = 1, page_token = NULL, updated_at = ? WHERE crawl_id = ? AND job_id = ?",
+                (time.time(), crawl_id, job_id)
+            )
+            self._conn.commit()
+
+    def clear(self, crawl_id):
+        """Tamamlanan taramanın checkpoint'ini siler"""
+        with self._lock:
+            self._delete(crawl_id)
+
+    def purge_expired(self):
+        """
+        Son ilerlemesi max_age'den eski tüm taramaları siler
+
+        Returns:
+            int: Silinen tarama sayısı
+        """
+        if self.max_age is None:
+            return 0
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT crawl_id FROM crawl_jobs GROUP BY crawl_id HAVING MAX(updated_at) < ?",
+                (time.time() - self.max_age,)
+            ).fetchall()]
+            for crawl_id in expired:
+                self._delete(crawl_id, commit=False)
+            self._conn.commit()
+        if expired:
+            logger.info(f"Süresi dolmuş {len(expired)} tarama checkpoint'i silindi")
+        return len(expired)
+
+    def _delete(self, crawl_id, commit=True):
+        # Kilit çağıran tarafından tutulur
+        self._conn.execute("DELETE FROM crawl_jobs WHERE crawl_id = ?", (crawl_id,))
+        self._conn.execute("DELETE FROM crawl_places WHERE crawl_id = ?", (crawl_id,))
+        if commit:
+            self._conn.commit()
+
+
+class CheckpointProgress:
+    """PageTokenScheduler ilerleme olaylarını CrawlCheckpoint'e yazar"""
+
+    def __init__(self, checkpoint, crawl_id, job_ids, serialize_job):
+        """
+        Args:
+            checkpoint: CrawlCheckpoint
+            crawl_id: Tarama id'si
+            job_ids: Zamanlayıcıdaki sorgu sırasına göre job_id listesi
+            serialize_job: Sorguyu JSON'a yazılabilir hale getiren fonksiyon
+        """
+        self.checkpoint = checkpoint
+        self.crawl_id = crawl_id
+        self.job_ids = list(job_ids)
+        self.serialize_job = serialize_job
+
+    def page_fetched(self, index, job, results, next_page_token):
+        self.checkpoint.record_page(self.crawl_id, self.job_ids[index], results, next_page_token)
+
+    def job_finished(self, index, job):
+        self.checkpoint.finish_job(self.crawl_id, self.job_ids[index])
+
+    def jobs_added(self, indices, jobs):
+        self.job_ids.extend(self.checkpoint.add_jobs(self.crawl_id, [self.serialize_job(job) for job in jobs]))
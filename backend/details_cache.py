@@ -0,0 +1,120 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Place Details cevabından sakladığımız alanlar (geri kalanı kullanılmıyor)
+CACHED_DETAIL_FIELDS = ('formatted_phone_number', 'opening_hours', 'rating', 'user_ratings_total')
+
+
+class PlaceDetailsCache:
+    """
+    place_id bazlı Place Details önbelleği.
+
+    İki katmanlıdır: process içi LRU (hızlı) ve SQLite disk katmanı
+    (yeniden başlatmalarda ve farklı worker'lar arasında kalıcı).
+    Kayıtlar TTL süresince geçerlidir, iki katman da boyut sınırlıdır.
+    """
+
+    def __init__(self, ttl=7 * 24 * 3600, max_entries=2000, db_path='place_details_cache.db', max_disk_entries=50000):
+        """
+        Args:
+            ttl: Kaydın geçerlilik süresi (saniye)
+            max_entries: Bellekte tutulacak en fazla kayıt
+            db_path: SQLite dosya yolu (None ise sadece bellek kullanılır)
+            max_disk_entries: Diskte tutulacak en fazla kayıt
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()  # place_id -> (fetched_at, details)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+
+        if db_path:
+            try:
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS place_details ("
+                    "place_id TEXT PRIMARY KEY, details TEXT NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_place_details_fetched_at ON place_details (fetched_at)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Detay önbelleği diski açılamadı, sadece bellek kullanılacak: {e}")
+                self._conn = None
+
+    def get(self, place_id):
+        """Geçerli bir kayıt varsa detayları, yoksa None döner"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(place_id)
+            if entry:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(place_id)
+                    return entry[1]
+                del self._memory[place_id]
+
+            if not self._conn:
+                return None
+
+            try:
+                row = self._conn.execute(
+                    "SELECT details, fetched_at FROM place_details WHERE place_id = ?",
+                    (place_id,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Detay önbelleği okunamadı: {e}")
+                return None
+
+            if not row or now - row[1] >= self.ttl:
+                return None
+
+            details = json.loads(row[0])
+            self._remember(place_id, row[1], details)
+            return details
+
+    def set(self, place_id, details):
+        """Place Details sonucunu (sadece kullanılan alanlar) önbelleğe yazar"""
+        details = {key: details[key] for key in CACHED_DETAIL_FIELDS if key in details}
+        fetched_at = time.time()
+        with self._lock:
+            self._remember(place_id, fetched_at, details)
+
+            if not self._conn:
+                return
+
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO place_details (place_id, details, fetched_at) VALUES (?, ?, ?)",
+                    (place_id, json.dumps(details, ensure_ascii=False), fetched_at)
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._prune_disk(fetched_at)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Detay önbelleğine yazılamadı: {e}")
+
+    def _remember(self, place_id, fetched_at, details):
+        """Bellek katmanına ekler, sınır aşılırsa en eski kullanılanı atar"""
+        self._memory[place_id] = (fetched_at, details)
+        self._memory.move_to_end(place_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune_disk(self, now):
+        """Süresi dolmuş kayıtları ve boyut sınırını aşan en eski kayıtları siler"""
+        self._conn.execute("DELETE FROM place_details WHERE fetched_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM place_details WHERE place_id NOT IN ("
+            "SELECT place_id FROM place_details ORDER BY fetched_at DESC LIMIT ?)",
+            (self.max_disk_entries,)
+        )
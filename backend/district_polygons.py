@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Paketle gelen ilçe sınırları (GeoJSON, properties: city, district). Sadece İstanbul'un
+# 10 ilçesi için (BUNDLED_DISTRICTS) kaba, birbiriyle çakışan dikdörtgenler - kesin sınır
+# değil, filtrede sadece adres başka ilçe söylemiyorsa karar vermek için kullanılır
+# (bkz. PlaceFilter). Poligonu olmayan ilçelerde filtre yalnızca adrese bakar; gerçek
+# sınırlar DISTRICT_POLYGONS_PATH ile verilebilir
+DEFAULT_POLYGONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'district_polygons.geojson')
+
+BUNDLED_DISTRICTS = ('Kadıköy', 'Beşiktaş', 'Şişli', 'Fatih', 'Üsküdar', 'Beyoğlu', 'Maltepe', 'Pendik',
+                     'Kartal', 'Tuzla')
+
+# Aynı anda sınıflandırılan en fazla nokta (nokta x kenar matrisinin boyutunu sınırlar)
+CLASSIFY_CHUNK_SIZE = 512
+
+_TR_TRANSLATION = str.maketrans({
+    'ı': 'i', 'İ': 'i', 'ş': 's', 'Ş': 's', 'ğ': 'g', 'Ğ': 'g',
+    'ü': 'u', 'Ü': 'u', 'ö': 'o', 'Ö': 'o', 'ç': 'c', 'Ç': 'c'
+})
+
+
+def normalize_name(text):
+    """Şehir/ilçe adını karşılaştırma anahtarına çevirir ('Kadıköy' -> 'kadikoy')"""
+    return ' '.join((text or '').translate(_TR_TRANSLATION).lower().split())
+
+
+def _feature_rings(geometry):
+    """GeoJSON Polygon/MultiPolygon geometrisinin tüm halkaları (dış sınır + delikler)"""
+    if geometry['type'] == 'Polygon':
+        return list(geometry['coordinates'])
+    if geometry['type'] == 'MultiPolygon':
+        return [ring for polygon in geometry['coordinates'] for ring in polygon]
+    raise ValueError(f"Desteklenmeyen geometri: {geometry['type']}")
+
+
+class DistrictClassifier:
+    """
+    Koordinatları ilçe poligonlarına göre sınıflandırır.
+
+    Tüm poligonların kenarları tek bir dizide tutulur; bir sonuç grubundaki
+    bütün noktalar için ışın atma (even-odd) testi NumPy ile tek geçişte yapılır.
+    Delikli ve çok parçalı poligonlar even-odd kuralıyla doğal olarak desteklenir.
+    """
+
+    def __init__(self, features):
+        """
+        Args:
+            features: (şehir, ilçe, halkalar) listesi - halka [[lng, lat], ...] köşe listesi
+        """
+        self.names = {}    # (şehir anahtarı, ilçe anahtarı) -> görünen ilçe adı
+        self._keys = []    # poligon sırasıyla (şehir anahtarı, ilçe anahtarı)
+        edges = []
+        starts = []
+        boxes = []
+
+        for city, district, rings in features:
+            key = (normalize_name(city), normalize_name(district))
+            self.names[key] = district
+            self._keys.append(key)
+            starts.append(len(edges))
+            lngs, lats = [], []
+            for ring in rings:
+                for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                    edges.append((x1, y1, x2, y2))
+                lngs.extend(point[0] for point in ring)
+                lats.extend(point[1] for point in ring)
+            boxes.append((min(lats), max(lats), min(lngs), max(lngs)))
+
+        edge_array = np.array(edges, dtype=float).reshape(-1, 4)
+        self._x1, self._y1, self._x2, self._y2 = edge_array.T
+        self._starts = np.array(starts, dtype=int)
+        self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        self._cities = np.array([key[0] for key in self._keys], dtype=object)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def has_district(self, city, district):
+        """İlçe için poligon var mı (yoksa o ilçenin aramasında poligonlara bakılmaz)"""
+        return (normalize_name(city), normalize_name(district)) in self.names
+
+    def districts(self, city):
+        """Şehrin poligonu olan ilçeleri (görünen adlarıyla)"""
+        city_key = normalize_name(city)
+        return [name for (key_city, _), name in self.names.items() if key_city == city_key]
+
+    def classify(self, lats, lngs, city=None):
+        """
+        Noktaları ilçelere atar
+
+        Args:
+            lats, lngs: Enlem/boylam dizileri (aynı uzunlukta)
+            city: Verilirse sadece bu şehrin ilçeleri değerlendirilir
+
+        Returns:
+            list: Her nokta için ilçe anahtarı ('kadikoy') ya da hiçbir poligona düşmüyorsa
+                veya birden fazla poligona düşüyorsa (belirsiz) None
+        """
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        result = [None] * len(lats)
+        if not len(self._keys) or not len(lats):
+            return result
+
+        allowed = np.ones(len(self._keys), dtype=bool)
+        if city is not None:
+            allowed = self._cities == normalize_name(city)
+            if not allowed.any():
+                return result
+
+        for start in range(0, len(lats), CLASSIFY_CHUNK_SIZE):
+            inside = self._contains(lats[start:start + CLASSIFY_CHUNK_SIZE], lngs[start:start + CLASSIFY_CHUNK_SIZE])
+            inside &= allowed
+            # Çakışan poligonlara düşen nokta belirsizdir, hiçbir ilçeye atanmaz
+            matched = inside.sum(axis=1) == 1
+            first = inside.argmax(axis=1)
+            for offset in np.nonzero(matched)[0]:
+                result[start + offset] = self._keys[first[offset]][1]
+        return result
+
+    def classify_places(self, places, city=None):
+        """
+        Places API sonuçlarını ilçelere atar
+
+        Returns:
+            dict: place_id -> ilçe anahtarı (koordinatı olmayan ya da poligona düşmeyen yerler yer almaz)
+        """
+        place_ids, lats, lngs = [], [], []
+        for place in places:
+            location = place.get('geometry', {}).get('location', {})
+            if place.get('place_id') and location.get('lat') is not None and location.get('lng') is not None:
+                place_ids.append(place['place_id'])
+                lats.append(location['lat'])
+                lngs.append(location['lng'])
+
+        districts = self.classify(lats, lngs, city)
+        return {place_id: district for place_id, district in zip(place_ids, districts) if district}
+
+    def _contains(self, lats, lngs):
+        """(nokta, poligon) boyutunda içindelik matrisi"""
+        y = lats[:, None]
+        x = lngs[:, None]
+
+        # Işın atma: noktadan sağa giden yatay ışının kestiği kenar sayısı tekse nokta içeride
+        straddles = (self._y1 > y) != (self._y2 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = self._x1 + (y - self._y1) * (self._x2 - self._x1) / (self._y2 - self._y1)
+        crossings = (straddles & (x < x_cross)).astype(np.int32)
+        inside = np.add.reduceat(crossings, self._starts, axis=1) % 2 == 1
+
+        # Sınır kutusu dışındaki noktalar (kenar üstü yuvarlama hatalarına karşı) elenir
+        south, north, west, east = self._boxes.T
+        inside &= (y >= south) & (y <= north) & (x >= west) & (x <= east)
+        return inside
+
+
+def load_district_polygons(path=DEFAULT_POLYGONS_PATH):
+    """
+    GeoJSON FeatureCollection'dan ilçe sınıflandırıcısı oluşturur
+
+    Her feature'ın properties alanında 'city' ve 'district' bulunmalı;
+    geometri Polygon ya da MultiPolygon olabilir.
+
+    Returns:
+        DistrictClassifier: Dosya okunamazsa boş sınıflandırıcı
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            collection = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"İlçe poligonları yüklenemedi ({path}): {str(e)}")
+        return DistrictClassifier([])
+
+    features = []
+    for feature in collection.get('features', []):
+        properties = feature.get('properties') or {}
+        if not properties.get('city') or not properties.get('district') or not feature.get('geometry'):
+            continue
+        features.append((properties['city'], properties['district'], _feature_rings(feature['geometry'])))
+
+    classifier = DistrictClassifier(features)
+    logger.info(f"{len(features)} ilçe poligonu yüklendi ({path}): {', '.join(classifier.names.values())} - "
+                f"diğer ilçelerde sadece adres eşleşmesi kullanılır")
+    return classifier
@@ -2,7 +2,13 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import json
 import os
-from google_sheets_scraper import GoogleSheetsRestaurantScraper
+from google_sheets_scraper import GoogleSheetsRestaurantScraper, GOOGLE_UNAVAILABLE_ERRORS, DEFAULT_REFRESH_MAX_AGE
+from details_cache import PlaceDetailsCache
+from district_polygons import load_district_polygons, DEFAULT_POLYGONS_PATH
+from place_store import PlaceStore
+from rate_governor import RateGovernor
+from restaurant import Restaurant, serialize_restaurants
+from result_snapshots import MemorySnapshotStore, SQLiteSnapshotStore, encode_cursor, decode_cursor
 from dotenv import load_dotenv
 
 app = Flask(__name__)
@@ -11,12 +17,35 @@ CORS(app)  # Enable CORS for React frontend
 # Load environment variables
 load_dotenv()
 
+# İstekte maxCalls verilmeyen full scan'lerin çağrı bütçesi (FULL_SCAN_MAX_CALLS ile değiştirilebilir)
+DEFAULT_FULL_SCAN_MAX_CALLS = 500
+
 # Get config from environment variables
 config = {
     'maps_api_key': os.getenv('MAPS_API_KEY'),
     'sheets_credentials': os.getenv('SHEETS_CREDENTIALS'),
     'sheets_credentials_path': os.getenv('SHEETS_CREDENTIALS_PATH'),
-    'spreadsheet_id': os.getenv('SPREADSHEET_ID')
+    'spreadsheet_id': os.getenv('SPREADSHEET_ID'),
+    'details_cache_path': os.getenv('DETAILS_CACHE_PATH', 'place_details_cache.db'),
+    'details_cache_ttl': int(os.getenv('DETAILS_CACHE_TTL', 7 * 24 * 3600)),
+    'place_store_path': os.getenv('PLACE_STORE_PATH', 'places.db'),
+    'place_store_ttl': int(os.getenv('PLACE_STORE_TTL', 24 * 3600)),
+    'district_polygons_path': os.getenv('DISTRICT_POLYGONS_PATH') or DEFAULT_POLYGONS_PATH,
+    # Sonuç snapshot'larının SQLite dosyası (boşsa process belleğinde tutulur)
+    'snapshot_store_path': os.getenv('SNAPSHOT_STORE_PATH') or None,
+    # İstekte verilmezse kullanılan arama sınırları (boşsa sınırsız)
+    'search_max_calls': int(os.getenv('SEARCH_MAX_CALLS') or 0) or None,
+    'search_time_limit': float(os.getenv('SEARCH_TIME_LIMIT') or 0) or None,
+    # Full scan (şehir geneli grid) için varsayılan çağrı bütçesi - tek istek binlerce çağrı yapmasın (boşsa sınırsız)
+    'full_scan_max_calls': int(os.getenv('FULL_SCAN_MAX_CALLS', DEFAULT_FULL_SCAN_MAX_CALLS) or 0) or None,
+    # Google çağrı hız sınırları (endpoint başına saniyelik, boşsa varsayılan) ve günlük kota (boşsa sınırsız)
+    'google_qps': {
+        'places': float(os.getenv('GOOGLE_PLACES_QPS') or 0) or None,
+        'places_nearby': float(os.getenv('GOOGLE_PLACES_NEARBY_QPS') or 0) or None,
+        'place': float(os.getenv('GOOGLE_PLACE_QPS') or 0) or None,
+        'geocode': float(os.getenv('GOOGLE_GEOCODE_QPS') or 0) or None
+    },
+    'google_daily_quota': int(os.getenv('GOOGLE_DAILY_QUOTA') or 0) or None
 }
 
 # Initialize scraper
@@ -57,13 +86,149 @@ except Exception as e:
 scraper = GoogleSheetsRestaurantScraper(
     maps_api_key=config['maps_api_key'],
     sheets_credentials_path=creds_path,
-    spreadsheet_id=config['spreadsheet_id']
+    spreadsheet_id=config['spreadsheet_id'],
+    details_cache=PlaceDetailsCache(
+        ttl=config['details_cache_ttl'],
+        db_path=config['details_cache_path']
+    ),
+    place_store=PlaceStore(
+        db_path=config['place_store_path'],
+        coverage_ttl=config['place_store_ttl']
+    ),
+    district_classifier=load_district_polygons(config['district_polygons_path']),
+    rate_governor=RateGovernor(
+        endpoint_qps={endpoint: qps for endpoint, qps in config['google_qps'].items() if qps},
+        daily_quota=config['google_daily_quota']
+    )
 )
 
+# Sıralanmış sonuç snapshot'ları - "daha fazla yükle" istekleri Google'a gitmeden buradan verilir.
+# Dosyaya yazılırsa satırlar Restaurant <-> dict olarak çevrilir; birden çok worker aynı dosyayı paylaşabilir
+if config['snapshot_store_path']:
+    snapshot_store = SQLiteSnapshotStore(config['snapshot_store_path'], encode_row=Restaurant.to_dict,
+                                         decode_row=Restaurant.from_dict)
+else:
+    snapshot_store = MemorySnapshotStore()
+
+# İstekle verilebilecek en büyük değerler - üstündekiler bu sınıra çekilir.
+# "Tümünü getir" (frontend fetchAll) 500'lük sayfalar ister, fazlası nextCursor ile gelir
+MAX_PER_PAGE = 500
+MAX_SEARCH_CALLS = 500
+MAX_SEARCH_TIME_LIMIT = 120.0
+MAX_LOCAL_RADIUS = 50000.0
+
+def _positive_param(data, name, cast, default, maximum=None):
+    """
+    İstekteki sayısal parametreyi okur ve doğrular
+    
+    Args:
+        data: İstek gövdesi
+        name: Parametre adı
+        cast: int ya da float
+        default: Parametre verilmezse dönen değer
+        maximum: Üst sınır (optional) - aşan değerler bu sınıra çekilir
+        
+    Raises:
+        ValueError: Değer sayı değilse ya da sıfırdan büyük değilse
+    """
+    value = data.get(name)
+    if value is None:
+        return default
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        value = cast(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} geçerli bir sayı olmalı")
+    if not value > 0:
+        raise ValueError(f"{name} sıfırdan büyük olmalı")
+    return min(value, maximum) if maximum is not None else value
+
+def _search_limits(data, page, per_page):
+    """
+    İstekteki arama sınırları (maxCalls, timeLimit, resumeToken, enoughResults) - verilmeyenler config'ten
+    
+    enoughResults verilirse tarama istenen sayfayı dolduracak kadar uygun sonuç toplanınca durur.
+    fullScan isteklerinde maxCalls verilmezse full_scan_max_calls kullanılır; sınıra ulaşan tarama
+    kısmi döner ve resumeToken ile devam eder.
+    
+    Returns:
+        dict: _search_page'e geçilecek sınırlar ya da hiç sınır yoksa None
+        
+    Raises:
+        ValueError: maxCalls/timeLimit geçersizse
+    """
+    default_max_calls = config['full_scan_max_calls'] if data.get('fullScan') else config['search_max_calls']
+    limits = {
+        'max_calls': _positive_param(data, 'maxCalls', int, default_max_calls, MAX_SEARCH_CALLS),
+        'time_limit': _positive_param(data, 'timeLimit', float, config['search_time_limit'], MAX_SEARCH_TIME_LIMIT),
+        'resume_token': data.get('resumeToken'),
+        'min_results': page * per_page if data.get('enoughResults') else None
+    }
+    return limits if any(value is not None for value in limits.values()) else None
+
+def _search_page(cursor, location, search_food_type, min_rating, restaurant_name, full_scan, page, per_page, limits=None):
+    """
+    İstenen sonuç sayfasını döner
+    
+    İlk istekte sıralı sonuç listesi snapshot olarak saklanır; cursor ile gelen
+    sonraki sayfalar bu snapshot'tan okunur. Cursor geçersiz ya da süresi dolmuşsa
+    arama 'page' parametresiyle yeniden yapılır. Sınır verilirse arama bütçeli yapılır
+    (bkz. search_with_budget); kısmi sonucun devam token'ı da snapshot'la birlikte
+    saklanır ve cursor sayfalarında tekrar döner, böylece liste bitince istemci
+    taramaya devam edebileceğini bilir.
+    
+    Returns:
+        tuple: (sayfa satırları, toplam sonuç, sayfa sonu indeksi, sonraki sayfa cursor'ı,
+            kısmi sonuç devam token'ı ya da None)
+    """
+    decoded = decode_cursor(cursor) if cursor else None
+    snapshot_page = snapshot_store.load_page(decoded[0], decoded[1], per_page) if decoded else None
+    resume_token = None
+    
+    if snapshot_page:
+        snapshot_id, start_idx = decoded
+        restaurants, total_count, meta = snapshot_page
+        resume_token = (meta or {}).get('resume_token')
+    else:
+        # Sıralama ve filtreleme temel arama verisiyle yapılır, detaylar sadece istenen sayfa için çekilir
+        if limits:
+            result = scraper.search_with_budget(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name, full_scan=full_scan, fetch_details=False, **limits)
+            all_restaurants, resume_token = result['restaurants'], result['resume_token']
+        else:
+            all_restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name, full_scan=full_scan, fetch_details=False)
+        snapshot_id = snapshot_store.save(all_restaurants, {'resume_token': resume_token} if resume_token else None)
+        
+        # Pagination uygula
+        start_idx = (page - 1) * per_page
+        restaurants = all_restaurants[start_idx:start_idx + per_page]
+        total_count = len(all_restaurants)
+    
+    end_idx = start_idx + per_page
+    next_cursor = encode_cursor(snapshot_id, end_idx) if end_idx < total_count else None
+    # Satırlar sadece cevap için serileştirilir, snapshot'ta kompakt Restaurant olarak kalır
+    return serialize_restaurants(scraper.hydrate_restaurants(restaurants)), total_count, end_idx, next_cursor, resume_token
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """API sağlık kontrolü"""
-    return jsonify({"status": "healthy", "message": "Restaurant Scraper API is running"})
+    return jsonify({
+        "status": "healthy",
+        "message": "Restaurant Scraper API is running",
+        "googleCalls": _google_call_metrics()
+    })
+
+def _google_call_metrics():
+    """Google çağrı sayaçları: günlük çağrı, tekrar denemeler, tekrar sonrası başarılar, devre kesmeler"""
+    metrics = scraper.gmaps.get_metrics()
+    return {
+        "callsToday": scraper.rate_governor.calls_today,
+        "retries": metrics['retries'],
+        "recoveredAfterRetry": metrics['recovered'],
+        "shortCircuits": metrics['short_circuits'],
+        "failures": metrics['failures'],
+        "circuits": metrics['circuits']
+    }
 
 @app.route('/api/search', methods=['POST'])
 def search_restaurants():
@@ -77,8 +242,8 @@ def search_restaurants():
         food_type = data.get('foodType')
         min_rating = data.get('minRating', 4.5)
         restaurant_name = data.get('restaurantName', None)
-        page = data.get('page', 1)
-        per_page = data.get('perPage', 20)
+        page = _positive_param(data, 'page', int, 1)
+        per_page = _positive_param(data, 'perPage', int, 20, MAX_PER_PAGE)
         
         # En az şehir ve (ilçe veya yemek türü veya restoran adı) gerekli
         if not city:
@@ -104,26 +269,143 @@ def search_restaurants():
         
         # Google Maps'te ara (Google Sheets'e kaydetmeden)
         full_scan = bool(data.get('fullScan', False))
-        all_restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name, full_scan=full_scan)
-        
-        # Pagination uygula
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        restaurants = all_restaurants[start_idx:end_idx]
+        restaurants, total_count, end_idx, next_cursor, resume_token = _search_page(
+            data.get('cursor'), location, search_food_type, min_rating, restaurant_name, full_scan, page, per_page,
+            _search_limits(data, page, per_page)
+        )
         
         # Sonuçları döndür
         return jsonify({
             "success": True,
             "data": restaurants,
             "count": len(restaurants),
-            "totalCount": len(all_restaurants),
+            "totalCount": total_count,
             "page": page,
             "perPage": per_page,
-            "hasMore": end_idx < len(all_restaurants),
+            "hasMore": end_idx < total_count,
+            "nextCursor": next_cursor,
+            "partial": resume_token is not None,
+            "resumeToken": resume_token,
+            "location": location,
+            "foodType": food_type
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except GOOGLE_UNAVAILABLE_ERRORS as e:
+        # Devre açık ya da günlük kota dolmuş - eksik sonuç yerine geçici hata
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/local-search', methods=['POST'])
+def local_search_restaurants():
+    """Daha önce toplanmış yerler arasında, Google'a gitmeden arama (ilçe ya da koordinat + yarıçap)"""
+    try:
+        data = request.get_json()
+        
+        city = data.get('city')
+        district = data.get('district')
+        lat = data.get('lat')
+        lng = data.get('lng')
+        radius = _positive_param(data, 'radius', float, 2000, MAX_LOCAL_RADIUS)
+        min_rating = data.get('minRating', 4.5)
+        
+        if not city and (lat is None or lng is None):
+            return jsonify({
+                "success": False,
+                "error": "Şehir ya da koordinat (lat, lng) belirtmelisiniz"
+            }), 400
+        
+        location = f"{district}, {city}" if district else city
+        restaurants = serialize_restaurants(scraper.search_local(location=location, lat=lat, lng=lng, radius=radius, min_rating=min_rating))
+        
+        return jsonify({
+            "success": True,
+            "data": restaurants,
+            "count": len(restaurants),
+            "location": location
+        })
+        
+    except ValueError as e:
+        # Desteklenmeyen şehir/ilçe ya da geçersiz parametre
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/refresh', methods=['POST'])
+def refresh_search():
+    """
+    Daha önce yapılmış bir aramayı artımlı yeniler (örn. zamanlanmış görevden)
+    
+    Sadece bayat yerlerin puanları Place Details ile çekilir; bu baştan taramadan
+    pahalıysa kapsam yeniden taranır. Yenilenen sonuç arama önbelleğine yazılır,
+    cevapta çağrı raporu döner.
+    """
+    try:
+        data = request.get_json()
+        
+        city = data.get('city')
+        district = data.get('district')
+        food_type = data.get('foodType')
+        min_rating = data.get('minRating', 4.5)
+        restaurant_name = data.get('restaurantName', None)
+        max_age = _positive_param(data, 'maxAge', float, DEFAULT_REFRESH_MAX_AGE)
+        scope_max_age = _positive_param(data, 'scopeMaxAge', float, None)
+        
+        if not city:
+            return jsonify({
+                "success": False,
+                "error": "Şehir seçimi zorunludur"
+            }), 400
+        
+        if not any([district, food_type, restaurant_name]):
+            return jsonify({
+                "success": False,
+                "error": "İlçe, yemek türü veya restoran adından en az birini belirtmelisiniz"
+            }), 400
+        
+        location = f"{district}, {city}" if district else city
+        search_food_type = food_type if food_type else "restaurant"
+        
+        # Arama önbelleğine sayfalı aramanın anahtarıyla yazılsın diye detaylar çekilmez (bkz. _search_page)
+        result = scraper.refresh_search(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name,
+                                        full_scan=bool(data.get('fullScan', False)), fetch_details=False,
+                                        max_age=max_age, scope_max_age=scope_max_age)
+        
+        return jsonify({
+            "success": True,
+            "count": len(result['restaurants']),
+            "report": result['report'],
             "location": location,
             "foodType": food_type
         })
         
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except GOOGLE_UNAVAILABLE_ERRORS as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             "success": False,
@@ -143,8 +425,8 @@ def search_and_save_restaurants():
         min_rating = data.get('minRating', 4.5)
         restaurant_name = data.get('restaurantName', None)
         save_to_sheets = data.get('saveToSheets', False)
-        page = data.get('page', 1)
-        per_page = data.get('perPage', 20)
+        page = _positive_param(data, 'page', int, 1)
+        per_page = _positive_param(data, 'perPage', int, 20, MAX_PER_PAGE)
         
         # En az şehir ve (ilçe veya yemek türü veya restoran adı) gerekli
         if not city:
@@ -182,11 +464,9 @@ def search_and_save_restaurants():
             sheet_name = "_".join(sheet_parts)
             sheet_name = sheet_name.replace("ı", "i").replace("ş", "s").replace("ğ", "g").replace("ü", "u").replace("ö", "o").replace("ç", "c")
             
-            # Ara ve kaydet
+            # Ara ve kaydet - sheet'e yazılan liste cevap için de kullanılır (tek arama)
             result = scraper.run_search_to_sheets(location, search_food_type, sheet_name, min_rating=min_rating, restaurant_name=restaurant_name)
-            
-            # Kaydedilen restoranlari da getir
-            all_restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name)
+            all_restaurants = result.get('restaurants', [])
             
             # Pagination uygula
             start_idx = (page - 1) * per_page
@@ -207,25 +487,37 @@ def search_and_save_restaurants():
         else:
             # Sadece ara
             full_scan = bool(data.get('fullScan', False))
-            all_restaurants = scraper.search_restaurants(location, search_food_type, min_rating=min_rating, restaurant_name=restaurant_name, full_scan=full_scan)
-            
-            # Pagination uygula
-            start_idx = (page - 1) * per_page
-            end_idx = start_idx + per_page
-            restaurants = all_restaurants[start_idx:end_idx]
+            restaurants, total_count, end_idx, next_cursor, resume_token = _search_page(
+                data.get('cursor'), location, search_food_type, min_rating, restaurant_name, full_scan, page, per_page,
+                _search_limits(data, page, per_page)
+            )
             
             return jsonify({
                 "success": True,
                 "data": restaurants,
                 "count": len(restaurants),
-                "totalCount": len(all_restaurants),
+                "totalCount": total_count,
                 "page": page,
                 "perPage": per_page,
-                "hasMore": end_idx < len(all_restaurants),
+                "hasMore": end_idx < total_count,
+                "nextCursor": next_cursor,
+                "partial": resume_token is not None,
+                "resumeToken": resume_token,
                 "location": location,
                 "foodType": food_type
             })
         
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except GOOGLE_UNAVAILABLE_ERRORS as e:
+        # Devre açık ya da günlük kota dolmuş - eksik sonuç yerine geçici hata
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             "success": False,
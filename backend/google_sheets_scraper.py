@@ -3,8 +3,27 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import logging
+import math
 from datetime import datetime
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from coverage_planner import CoverageCell, tile_bounds, is_saturated
+from crawl_checkpoint import CrawlCheckpoint, CheckpointProgress, make_crawl_id
+from details_cache import PlaceDetailsCache
+from district_polygons import load_district_polygons, normalize_name
+from page_scheduler import PageTokenScheduler
+from place_batch import PlaceBatch, sort_by_rating
+from place_filter import PlaceFilter, normalize_turkish_text
+from query_planner import QueryPlanner
+from rate_governor import RateGovernor, GovernedClient, QuotaExceededError
+from resilient_client import ResilientClient, CircuitOpenError
+from restaurant import Restaurant, serialize_restaurants
+from place_stream import PlaceStream, slim_place, slim_places
+from place_store import PlaceStore, SEARCH_SOURCE, NEARBY_SOURCE, CELL_SOURCE
+from search_budget import SearchBudget
+from search_cache import SearchResultCache, STALE
+from search_coalescing import SingleFlight
 
 # Logging ayarı
 logging.basicConfig(
@@ -17,8 +36,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Full scan kapsama planı: hücreler bu yarıçapla başlar, doyan hücreler bu sınıra kadar bölünür (metre)
+FULL_SCAN_START_RADIUS = 25000
+FULL_SCAN_MIN_RADIUS = 250
+
+# Yenileme modunda puanı bundan eski yerler Place Details ile tekrar sorgulanır (saniye)
+DEFAULT_REFRESH_MAX_AGE = 7 * 24 * 3600
+
+# Yakın çevre desteği: geocode + places_nearby
+NEARBY_FALLBACK_CALLS = 2
+
+# "Yeterli sonuç" modunda istenen sonuç sayısının bu katı kadar uygun aday toplanınca tarama durur
+ENOUGH_RESULTS_MARGIN = 1.5
+
+# Google'a şu an hiç çağrı yapılamıyor (devre açık / günlük kota doldu) - tarama durur, hata yukarı taşınır
+GOOGLE_UNAVAILABLE_ERRORS = (CircuitOpenError, QuotaExceededError)
+
+# Birleştirme indeksinde sorgu dışı kaynak etiketleri
+STORE_SOURCE = 'store'
+CHECKPOINT_SOURCE = 'checkpoint'
+NEARBY_FALLBACK_SOURCE = 'nearby_fallback'
+
 class GoogleSheetsRestaurantScraper:
-    def __init__(self, maps_api_key, sheets_credentials_path=None, spreadsheet_id=None):
+    def __init__(self, maps_api_key, sheets_credentials_path=None, spreadsheet_id=None, max_workers=4, details_cache=None, search_cache=None, crawl_checkpoint=None, place_store=None, district_classifier=None, query_planner=None, rate_governor=None):
         """
         Google Maps ve Sheets API'lerini başlatır
         
@@ -26,9 +66,31 @@ class GoogleSheetsRestaurantScraper:
             maps_api_key: Google Maps API anahtarı
             sheets_credentials_path: Service account JSON dosya yolu (optional)
             spreadsheet_id: Google Sheets ID'si (optional)
+            max_workers: Aynı anda çalışacak en fazla Places sorgusu
+            details_cache: Place Details önbelleği (optional, verilmezse varsayılan ayarlarla oluşturulur)
+            search_cache: Arama sonucu önbelleği (optional, verilmezse varsayılan ayarlarla oluşturulur)
+            crawl_checkpoint: Full scan ilerleme kaydı (optional, verilmezse varsayılan ayarlarla oluşturulur)
+            place_store: Yerel yer deposu (optional, verilmezse varsayılan ayarlarla oluşturulur)
+            district_classifier: İlçe poligonu sınıflandırıcısı (optional, verilmezse paketle gelen poligonlar yüklenir)
+            query_planner: Arama terimi planlayıcısı (optional, verilmezse place_store istatistikleriyle oluşturulur)
+            rate_governor: Google çağrılarının hız/kota denetçisi (optional, verilmezse varsayılan sınırlarla oluşturulur)
         """
-        # Google Maps client
-        self.gmaps = googlemaps.Client(key=maps_api_key)
+        # Google Maps client - tüm çağrılar (tekrar denemeler dahil) endpoint başına hız sınırından ve
+        # günlük kotadan geçer. OVER_QUERY_LIMIT tekrarları client yerine ResilientClient'ta yapılır
+        # (jitter'lı bekleme + devre kesici).
+        self.rate_governor = rate_governor if rate_governor is not None else RateGovernor()
+        self.gmaps = ResilientClient(GovernedClient(
+            googlemaps.Client(key=maps_api_key, retry_over_query_limit=False),
+            self.rate_governor
+        ))
+        self.max_workers = max_workers
+        self.details_cache = details_cache if details_cache is not None else PlaceDetailsCache()
+        self.search_cache = search_cache if search_cache is not None else SearchResultCache()
+        self.crawl_checkpoint = crawl_checkpoint if crawl_checkpoint is not None else CrawlCheckpoint()
+        self.place_store = place_store if place_store is not None else PlaceStore()
+        self.district_classifier = district_classifier if district_classifier is not None else load_district_polygons()
+        self.query_planner = query_planner if query_planner is not None else QueryPlanner(self.place_store)
+        self._search_flights = SingleFlight()
         
         # Google Sheets setup (optional)
         self.spreadsheet_id = spreadsheet_id
@@ -48,7 +110,7 @@ class GoogleSheetsRestaurantScraper:
         
         logger.info("GoogleSheetsRestaurantScraper başlatıldı")
     
-    def search_restaurants(self, location, restaurant_type, radius=2000, min_rating=4.5, restaurant_name=None, full_scan=False):
+    def search_restaurants(self, location, restaurant_type, radius=2000, min_rating=4.5, restaurant_name=None, full_scan=False, fetch_details=True):
         """
         Google Maps'te restoran arar
         
@@ -58,11 +120,246 @@ class GoogleSheetsRestaurantScraper:
             radius: Arama yarıçapı (metre)
             min_rating: Minimum puan filtresi (varsayılan: 4.5)
             restaurant_name: Opsiyonel restoran adı filtresi
+            fetch_details: False ise Place Details çağrılmaz (bkz. hydrate_restaurants)
             
         Returns:
             list: Restoran listesi
+            
+        Raises:
+            CircuitOpenError, QuotaExceededError: Google'a şu an çağrı yapılamıyorsa (eksik liste dönmez)
+            
+        Sonuçlar normalize parametrelere göre önbelleklenir; bayat kayıtlar hemen
+        döner ve arka planda yenilenir. Aynı parametrelerle eş zamanlı gelen aramalar
+        tek bir Google taramasında birleştirilir; her çağıran sonucun kendi kopyasını alır.
+        """
+        key = self._make_search_key(location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details)
+        args = (location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details)
+        
+        restaurants, state = self._get_cached(key, args)
+        if state is None:
+            restaurants, _ = self._search_flights.do(key, lambda: self._search_and_cache(key, args))
+        
+        # Satırlar sonradan yerinde güncellenebildiği için (hydrate_restaurants) kopya döner
+        return [restaurant.copy() for restaurant in restaurants]
+    
+    def _get_cached(self, key, args):
+        """
+        Önbellekteki sonucu döner; kayıt bayatsa arka planda yenilemeyi başlatır
+        
+        Returns:
+            tuple: (restoranlar, durum) - kayıt yoksa (None, None)
+        """
+        restaurants, state = self.search_cache.get(key)
+        if state == STALE and self.search_cache.begin_refresh(key):
+            logger.info(f"Bayat sonuç döndü, arka planda yenileniyor: {key}")
+            threading.Thread(target=self._refresh_search, args=(key, args), daemon=True).start()
+        return restaurants, state
+    
+    def _search_and_cache(self, key, args):
+        """Aramayı çalıştırır ve hatasız tamamlandıysa sonucu önbelleğe yazar"""
+        report = self._new_refresh_report()
+        restaurants = self._search_restaurants(*args, report=report)
+        if not report['errors']:
+            self.search_cache.set(key, restaurants)
+        return restaurants
+    
+    def _refresh_search(self, key, args):
+        """Bayat önbellek kaydını arka planda yeniler"""
+        try:
+            self._search_flights.do(key, lambda: self._search_and_cache(key, args))
+        except Exception as e:
+            logger.warning(f"Arka plan yenileme hatası: {str(e)}")
+        finally:
+            self.search_cache.end_refresh(key)
+    
+    def refresh_search(self, location, restaurant_type, radius=2000, min_rating=4.5, restaurant_name=None,
+                       full_scan=False, fetch_details=True, max_age=DEFAULT_REFRESH_MAX_AGE, scope_max_age=None):
+        """
+        Daha önce taranmış bir aramayı artımlı olarak yeniler
+        
+        Kapsamı (ya da full scan'de hücresi) scope_max_age'den eski olan aramalar
+        yeniden taranır, diğerlerinin yerleri yerel depodan okunur. Sadece yerler
+        bayatsa Text Search yapılmaz; son alınma zamanı max_age'den eski yerlerin
+        puanları Place Details ile yeniden çekilir. Bayat yer sayısı kapsamın kayıtlı
+        arama çağrısı sayısını aşarsa (yer başına bir Details çağrısı baştan taramadan
+        pahalıysa) kapsam baştan taranır ve raporda 'rescanned' True olur. Hatasız
+        tamamlanan sonuç arama önbelleğine de yazılır.
+        
+        Args:
+            max_age: Yer puanlarının taze sayıldığı süre (saniye)
+            scope_max_age: Kapsam/hücre taramalarının taze sayıldığı süre (saniye,
+                None ise yerel deponun coverage_ttl'i)
+            (diğerleri search_restaurants ile aynı)
+            
+        Returns:
+            dict: {'restaurants': restoran listesi, 'report': çağrı raporu}. Rapordaki
+                'api_calls' bu yenilemede yapılan arama + puan yenileme çağrıları,
+                'full_rescan_calls' baştan taramanın gerektireceği arama çağrılarıdır
+                (Text Search puanları da getirdiği için ayrıca puan yenilenmez; telefon için
+                yapılan detay çağrıları iki durumda da aynı olduğundan sayılmaz).
+        """
+        report = self._new_refresh_report()
+        restaurants = self._search_restaurants(location, restaurant_type, radius, min_rating, restaurant_name,
+                                               full_scan, fetch_details, refresh_max_age=max_age,
+                                               scope_max_age=scope_max_age, report=report)
+        
+        if not report['errors']:
+            key = self._make_search_key(location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details)
+            self.search_cache.set(key, restaurants)
+        
+        report['full_rescan_calls'] = report['api_calls'] - report['refreshed_places'] + report['saved_calls']
+        logger.info(f"Artımlı yenileme: {report['api_calls']} çağrı yapıldı, "
+                    f"{report['saved_calls']} çağrı tasarruf edildi (baştan tarama: {report['full_rescan_calls']})")
+        return {'restaurants': [restaurant.copy() for restaurant in restaurants], 'report': report}
+    
+    def search_with_budget(self, location, restaurant_type, radius=2000, min_rating=4.5, restaurant_name=None,
+                           full_scan=False, fetch_details=True, max_calls=None, time_limit=None, resume_token=None,
+                           min_results=None):
+        """
+        Google çağrı bütçesi ve süre sınırıyla arama yapar
+        
+        Bütçe önce geçmişte en çok yeni yer getiren sorgulara harcanır. Sınırlardan
+        birine ulaşılınca o ana kadarki sonuçlar döner ve tarama checkpoint'te kalır;
+        dönen resume_token ile aynı arama tekrar istendiğinde kaldığı yerden devam eder.
+        Sadece tamamlanan aramalar önbelleğe yazılır. Place Details çağrıları bütçeye
+        dahil değildir (sayfalı aramada fetch_details=False ile sayfa başına çekilir).
+        
+        "Yeterli sonuç" modunda (min_results) birleşen adaylar arasında istenen sayfayı
+        güvenle dolduracak kadar uygun sonuç olunca yeni sorgu gönderilmez; ilk sayfa
+        ilk bir iki sorgunun maliyetiyle döner, sonuç yine kısmi işaretlenir.
+        
+        Aynı arama aynı sınırlarla eş zamanlı gelirse tek bir taramada birleştirilir;
+        farklı sınırlarla gelenler aynı checkpoint'i sırayla kullanır.
+        
+        Args:
+            max_calls: En fazla Google arama çağrısı (None ise sınırsız)
+            time_limit: Süre sınırı (saniye, None ise sınırsız)
+            resume_token: Önceki kısmi sonuçta dönen token (optional)
+            min_results: İstenen sayfanın sonuna kadar gereken sonuç sayısı (optional).
+                Sıralamanın da tutması için ENOUGH_RESULTS_MARGIN katı kadar uygun sonuç beklenir
+            (diğerleri search_restaurants ile aynı)
+            
+        Returns:
+            dict: {'restaurants', 'partial', 'resume_token', 'api_calls'}
+            
+        Tarama sırasında devre açılır ya da günlük kota dolarsa sonuç kısmi döner
+        (resume_token ile devam edilir); tarama dışındaki çağrılarda hata yukarı taşınır.
+            
+        Raises:
+            ValueError: resume_token bu aramaya ait değilse
+            CircuitOpenError, QuotaExceededError: Yakın çevre desteği sırasında Google'a erişilemezse
+        """
+        search_scope = self._make_search_key(location, restaurant_type, radius, None, restaurant_name, full_scan, False)
+        if resume_token and resume_token != make_crawl_id(search_scope):
+            raise ValueError("Devam token'ı bu aramaya ait değil")
+        
+        key = self._make_search_key(location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details)
+        args = (location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details)
+        restaurants, state = self._get_cached(key, args) if not resume_token else (None, None)
+        if state is not None:
+            return {'restaurants': [restaurant.copy() for restaurant in restaurants], 'partial': False,
+                    'resume_token': None, 'api_calls': 0}
+        
+        if min_results is not None:
+            min_results = math.ceil(min_results * ENOUGH_RESULTS_MARGIN)
+        # Aynı arama aynı sınırlarla eş zamanlı gelirse tek tarama yapılır (bkz. search_restaurants)
+        flight_key = ('budget', key, max_calls, time_limit, min_results, resume_token)
+        result, _ = self._search_flights.do(
+            flight_key, lambda: self._budgeted_search(key, args, max_calls, time_limit, min_results))
+        return dict(result, restaurants=[restaurant.copy() for restaurant in result['restaurants']])
+    
+    def _budgeted_search(self, key, args, max_calls, time_limit, min_results):
+        """Bütçeli aramayı çalıştırır ve tamamlandıysa sonucu önbelleğe yazar"""
+        budget = SearchBudget(max_calls=max_calls, time_limit=time_limit, min_results=min_results)
+        report = self._new_refresh_report()
+        restaurants = self._search_restaurants(*args, report=report, budget=budget)
+        if not budget.partial and not report['errors']:
+            self.search_cache.set(key, restaurants)
+        return {
+            'restaurants': restaurants,
+            'partial': budget.partial,
+            'resume_token': budget.resume_token,
+            'api_calls': budget.calls
+        }
+    
+    def search_local(self, location=None, lat=None, lng=None, radius=2000, min_rating=4.5):
+        """
+        Google'a gitmeden, yerel depoda toplanmış yerler arasında arar
+        
+        Konum verilirse ilçe/şehir sınırları içindeki, koordinat verilirse noktaya
+        radius metre mesafedeki yerler döner. Telefon bilgisi çekilmez
+        (gerekirse hydrate_restaurants ile doldurulur).
+        
+        Args:
+            location: "ilçe, şehir" ya da şehir
+            lat, lng: Merkez koordinatı (verilirse location yerine kullanılır)
+            radius: Koordinat aramasında yarıçap (metre)
+            min_rating: Minimum puan filtresi
+            
+        Returns:
+            list: Restoran listesi (puana göre sıralı)
+            
+        Raises:
+            ValueError: Şehrin ya da ilçenin sınırı bilinmiyorsa (yerel arama desteklenmiyor)
+        """
+        rating_floor = min_rating if min_rating > 0 else None
+        if lat is not None and lng is not None:
+            places = self.place_store.places_within(lat, lng, radius, rating_floor)
+        else:
+            location_parts = [part.strip() for part in (location or '').split(',')]
+            bounds = self._get_city_bounds(location_parts[-1])
+            if not bounds:
+                raise ValueError(f"'{location_parts[-1]}' için yerel arama desteklenmiyor")
+            if len(location_parts) > 1:
+                # Bilinmeyen ilçede şehrin tamamı dönmesin
+                bounds = self._get_district_bounds(location_parts[0].lower())
+                if not bounds:
+                    raise ValueError(f"'{location_parts[0]}' ilçesi için yerel arama desteklenmiyor")
+            places = self.place_store.places_in_bounds(bounds, rating_floor)
+        
+        return sort_by_rating(self._extract_restaurant_info(places, min_rating, fetch_details=False))
+    
+    def _new_refresh_report(self):
+        """Boş bir yenileme/çağrı raporu döner"""
+        return {
+            'api_calls': 0,          # Yapılan arama + puan yenileme çağrıları
+            'saved_calls': 0,        # Yerel depodan karşılandığı için yapılmayan arama çağrıları
+            'rescanned_cells': 0,
+            'reused_cells': 0,
+            'refreshed_places': 0,
+            'fresh_places': 0,
+            'rescanned': False,      # Bayat yerleri tek tek yenilemek baştan taramadan pahalıydı, tarandı
+            'errors': 0              # Hata alan sorgular (varsa sonuç eksiktir, önbelleğe yazılmaz)
+        }
+    
+    def _make_search_key(self, location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details):
+        """
+        Arama parametrelerinden normalize edilmiş bir anahtar üretir
+        
+        Sadece büyük/küçük harf ve boşluk farkları birleştirilir; Türkçe karakterler
+        korunur çünkü sorgu metni ve terim genişletme bunlara göre değişiyor.
+        """
+        def norm(text):
+            return ' '.join((text or '').lower().split())
+        
+        location_key = ','.join(norm(part) for part in (location or '').split(','))
+        return (location_key, norm(restaurant_type), norm(restaurant_name), min_rating,
+                bool(full_scan), radius, bool(fetch_details))
+    
+    def _search_restaurants(self, location, restaurant_type, radius, min_rating, restaurant_name, full_scan, fetch_details,
+                            refresh_max_age=None, scope_max_age=None, report=None, budget=None):
+        """
+        search_restaurants'ın asıl gövdesi (birleştirme/önbellek katmanları olmadan)
+        
+        Args:
+            refresh_max_age: Verilirse yenileme modu - bundan eski yerlerin puanları yeniden çekilir
+            scope_max_age: Kapsam/hücre tazeliği için süre (None ise deponun varsayılanı)
+            report: Çağrı sayaçlarının yazılacağı rapor (bkz. _new_refresh_report)
+            budget: Çağrı/süre sınırı (optional, bkz. SearchBudget). Sınıra ulaşılırsa tarama
+                checkpoint'te bırakılır, budget.partial True olur ve budget.resume_token dolar
         """
         restaurants = []
+        report = report if report is not None else self._new_refresh_report()
         
         try:
             # İlçe ve şehir bilgilerini ayır
@@ -70,83 +367,49 @@ class GoogleSheetsRestaurantScraper:
             district = location_parts[0].strip() if location_parts else location
             
             # Arama terimlerini belirle
-            all_places = []
-            seen_place_ids = set()  # Duplicate kontrolü için
+            queries = []  # (etiket, metod, parametreler) - hepsi birlikte çalıştırılır
+            query_terms = {}  # Text Search sorgusu -> terim (terim verimi istatistikleri için)
 
             # Eğer kullanıcı sadece restoran adı girdiyse, adı genişleterek ara
             if restaurant_name and not restaurant_type and not full_scan:
                 expanded_terms = self._expand_search_terms(restaurant_name)
                 logger.info(f"(İsim) Genişletilmiş arama terimleri: {expanded_terms}")
+                plan = ('places', restaurant_name)
 
-                for term in [t for t in expanded_terms if t]:
+                for term in self.query_planner.plan(*plan, expanded_terms, by_yield=budget is not None):
                     # "köfte", "köfteci" vb. için sorgu
                     query = f"{term} in {location}"
                     logger.info(f"Arama sorgusu: {query}")
-
-                    try:
-                        # Text Search + pagination (max 3 sayfa)
-                        next_page_token = None
-                        page_count = 0
-                        while page_count < 3:
-                            kwargs = {'query': query, 'type': 'restaurant', 'language': 'tr'}
-                            if next_page_token:
-                                kwargs['page_token'] = next_page_token
-                                time.sleep(2)  # Google next_page_token gereksinimi
-                            places_result = self.gmaps.places(**kwargs)
-
-                            current_results = places_result.get('results', [])
-                            for place in current_results:
-                                place_id = place.get('place_id')
-                                if place_id and place_id not in seen_place_ids:
-                                    all_places.append(place)
-                                    seen_place_ids.add(place_id)
-
-                            next_page_token = places_result.get('next_page_token')
-                            page_count += 1
-                            if not next_page_token:
-                                break
-                    except Exception as e:
-                        logger.warning(f"'{term}' arama terimi için hata: {str(e)}")
-                        continue
+                    query_terms[query] = term
+                    queries.append((
+                        f"'{term}' arama terimi için hata",
+                        'places',
+                        {'query': query, 'type': 'restaurant', 'language': 'tr'}
+                    ))
 
             elif not (restaurant_name and not restaurant_type and full_scan):
                 # Yemek türüne göre ya da hem isim+ tür birlikte
                 expanded_terms = self._expand_search_terms(restaurant_type)
                 logger.info(f"Genişletilmiş arama terimleri: {expanded_terms}")
+                plan = ('places', f"{restaurant_name} {restaurant_type}" if restaurant_name else restaurant_type)
 
-                for search_term in [t for t in expanded_terms if t]:
+                for search_term in self.query_planner.plan(*plan, expanded_terms, by_yield=budget is not None):
                     if restaurant_name and search_term != "restaurant":
                         query = f"{restaurant_name} {search_term} in {location}"
                     elif restaurant_name:
                         query = f"{restaurant_name} in {location}"
                     else:
                         query = f"{search_term} in {location}"
+                    if query in query_terms:
+                        continue  # Farklı terimler aynı sorguya düştü (örn. isim + "restaurant")
 
                     logger.info(f"Arama sorgusu: {query}")
-                    try:
-                        next_page_token = None
-                        page_count = 0
-                        while page_count < 3:
-                            kwargs = {'query': query, 'type': 'restaurant', 'language': 'tr'}
-                            if next_page_token:
-                                kwargs['page_token'] = next_page_token
-                                time.sleep(2)
-                            places_result = self.gmaps.places(**kwargs)
-
-                            current_results = places_result.get('results', [])
-                            for place in current_results:
-                                place_id = place.get('place_id')
-                                if place_id and place_id not in seen_place_ids:
-                                    all_places.append(place)
-                                    seen_place_ids.add(place_id)
-
-                            next_page_token = places_result.get('next_page_token')
-                            page_count += 1
-                            if not next_page_token:
-                                break
-                    except Exception as e:
-                        logger.warning(f"'{search_term}' arama terimi için hata: {str(e)}")
-                        continue
+                    query_terms[query] = search_term
+                    queries.append((
+                        f"'{search_term}' arama terimi için hata",
+                        'places',
+                        {'query': query, 'type': 'restaurant', 'language': 'tr'}
+                    ))
 
             # Şehir genelinde grid tabanlı full scan (isteğe bağlı, daha fazla sonuç ama maliyetli)
             if restaurant_name and not restaurant_type and full_scan:
@@ -155,278 +418,601 @@ class GoogleSheetsRestaurantScraper:
                 if not bounds:
                     # İstanbul varsay
                     bounds = {'north': 41.34, 'south': 40.80, 'east': 29.70, 'west': 27.80}
-                grid_centers = self._generate_grid_centers(bounds, rows=3, cols=3)
+                # Hücreler büyük başlar, sonuç sınırına ulaşan (doymuş) hücreler 4'e bölünür
+                cells = tile_bounds(bounds, FULL_SCAN_START_RADIUS)
                 expanded_terms = self._expand_search_terms(restaurant_name)
+                logger.info(f"Full scan: {len(cells)} başlangıç hücresi, {FULL_SCAN_START_RADIUS}m yarıçap")
+                plan = ('places_nearby', restaurant_name)
+                planned_terms = self.query_planner.plan(*plan, expanded_terms, by_yield=budget is not None)
 
-                for center in grid_centers:
-                    for term in [t for t in expanded_terms if t]:
-                        try:
-                            next_page_token = None
-                            page_count = 0
-                            while page_count < 3:
-                                kwargs = {
-                                    'location': center,
-                                    'radius': radius,
-                                    'keyword': term,
-                                    'type': 'restaurant'
-                                }
-                                if next_page_token:
-                                    kwargs['page_token'] = next_page_token
-                                    time.sleep(2)
-                                nearby_result = self.gmaps.places_nearby(**kwargs)
-
-                                current_results = nearby_result.get('results', [])
-                                for place in current_results:
-                                    place_id = place.get('place_id')
-                                    if place_id and place_id not in seen_place_ids:
-                                        all_places.append(place)
-                                        seen_place_ids.add(place_id)
+                # Bütçeli aramada önce terim döner: bütçe en verimli terimin tüm hücrelerine önce harcanır
+                if budget is not None:
+                    cell_terms = [(cell, term) for term in planned_terms for cell in cells]
+                else:
+                    cell_terms = [(cell, term) for cell in cells for term in planned_terms]
+                for cell, term in cell_terms:
+                    queries.append((
+                        "Full scan nearby hata",
+                        'places_nearby',
+                        {'location': cell.center, 'radius': cell.radius, 'keyword': term, 'type': 'restaurant'},
+                        cell
+                    ))
 
-                                next_page_token = nearby_result.get('next_page_token')
-                                page_count += 1
-                                if not next_page_token:
-                                    break
-                        except Exception as e:
-                            logger.warning(f"Full scan nearby hata: {str(e)}")
-                            continue
+            # Filtre bir kez derlenir; her yer için isim/adres tek sefer normalize edilir
+            city = location_parts[-1].strip()
+            district_key = normalize_name(district)
+            place_filter = PlaceFilter(
+                district=district if len(location_parts) > 1 else None,
+                district_variations=self._get_district_variations(self._normalize_turkish_text(district)),
+                district_key=district_key,
+                restaurant_name=restaurant_name,
+                type_terms=expanded_terms if restaurant_type and restaurant_type != "restaurant" else None
+            )
             
-            logger.info(f"Toplam Google API sonucu: {len(all_places)}")
+            # Poligonlar sadece bazı ilçeler için var (bkz. district_polygons.BUNDLED_DISTRICTS);
+            # diğer ilçelerde koordinat sınıflandırması yapılmaz, filtre adrese bakar
+            polygon_city = city if len(location_parts) > 1 and self.district_classifier.has_district(city, district) else None
             
-            # Sonuçları filtrele - ilçe, isim ve arama terimine uygunluk kontrolü
-            filtered_results = []
+            # Tüm kaynakların yerleri geldikçe birleşir (tekrar kontrolü dahil) ve filtrelenir;
+            # yerler ilçe poligonlarına sayfa sayfa, koordinat dizileriyle atanır
+            def new_stream():
+                return PlaceStream(place_filter, self.district_classifier, polygon_city, min_rating=min_rating)
+            stream = new_stream()
             
-            for place in all_places:
-                # Adres ve isim kontrolü
-                address = place.get('formatted_address', '').lower()
-                place_name = place.get('name', '').lower()
-                place_id = place.get('place_id')
-                
-                # İlçe kontrolü (sadece district belirtilmişse)
-                if len(location_parts) > 1:
-                    district_lower = district.lower()
-                    # Daha esnek ilçe kontrolü
-                    district_found = False
-                    
-                    # 1. Direkt adres kontrolü
-                    if district_lower in address:
-                        district_found = True
-                    
-                    # 2. Normalized kontrol
-                    address_normalized = self._normalize_turkish_text(address)
-                    district_normalized = self._normalize_turkish_text(district)
-                    if district_normalized in address_normalized:
-                        district_found = True
-                    
-                    # 3. İlçe varyasyonları kontrolü
-                    district_variations = self._get_district_variations(district_normalized)
-                    for variation in district_variations:
-                        if variation in address_normalized:
-                            district_found = True
-                            break
-                    
-                    if not district_found:
-                        continue
+            # Puan/detay filtreleri taramayı etkilemez, kapsam ve checkpoint anahtarında yer almaz
+            search_scope = self._make_search_key(location, restaurant_type, radius, None, restaurant_name, full_scan, False)
+            scope_key = PlaceStore.make_scope_key(search_scope)
+            coverage = self.place_store.get_coverage(scope_key, max_age=scope_max_age)
+            
+            if coverage:
+                # Bu kapsam yakın zamanda tarandı - yerler yerel depodan, Google'a gitmeden.
+                # Yenileme modunda puanlar sonradan yenileneceği için puan ön filtresi uygulanmaz
+                rating_floor = min_rating if min_rating > 0 and refresh_max_age is None else None
+                stream.add(self.place_store.scope_places(scope_key, SEARCH_SOURCE, rating_floor), STORE_SOURCE)
+                if refresh_max_age is not None and self._rescan_is_cheaper(stream.filtered(), refresh_max_age,
+                                                                           coverage['api_calls']):
+                    stream = new_stream()
+                    coverage = None
+                    report['rescanned'] = True
+                else:
+                    logger.info(f"Kapsam yerel depoda taze, Google sorguları atlanıyor ({len(queries)} sorgu)")
+                    report['saved_calls'] += coverage['api_calls']
+            
+            if not coverage:
+                # Sorgular paralel çalışır, next_page_token beklemeleri üst üste biner.
+                # Sayfalar geldikçe küçültülüp filtrelenir, ama sorgu sırasıyla birleştirilir
+                # (tekrarlarda ilk görülen kalır) ve çıktı sıralı akışla aynı kalır
+                crawl_id = make_crawl_id(search_scope)
+                if full_scan:
+                    # Tazeliği dolmamış hücreler yeniden taranmaz, yerleri depodan gelir
+                    remaining, cell_places, cell_calls, reused_cells = self._reuse_fresh_cells(queries, scope_max_age)
+                    stream.add(cell_places, STORE_SOURCE)
+                    if refresh_max_age is not None and self._rescan_is_cheaper(stream.filtered(), refresh_max_age,
+                                                                               cell_calls):
+                        stream = new_stream()
+                        cell_calls = 0
+                        report['rescanned'] = True
+                    else:
+                        queries = remaining
+                        report['reused_cells'] += reused_cells
+                        report['saved_calls'] += cell_calls
+                        if cell_calls:
+                            logger.info(f"Full scan: {reused_cells} taze hücre depodan okundu, {cell_calls} çağrı atlandı")
+                    query_results, errors = self._run_checkpointed_queries(crawl_id, queries, stream, budget)
+                    report['rescanned_cells'] += len(query_results)
+                elif budget is not None:
+                    # Bütçeli arama yarıda kalabilir - kaldığı yerden devam edebilmesi için checkpoint'li
+                    query_results, errors = self._run_checkpointed_queries(crawl_id, queries, stream, budget)
+                    cell_calls = 0
+                else:
+                    query_results, errors = self._run_queries(queries, stream=stream)
+                    cell_calls = 0
                 
-                # Restoran adı filtresi (eğer belirtilmişse)
-                if restaurant_name:
-                    restaurant_name_lower = restaurant_name.lower()
-                    restaurant_name_normalized = self._normalize_turkish_text(restaurant_name)
-                    place_name_normalized = self._normalize_turkish_text(place_name)
-                    
-                    name_found = (restaurant_name_lower in place_name or 
-                                restaurant_name_normalized in place_name_normalized)
-                    
-                    if not name_found:
-                        continue
+                logger.debug(f"Kaynak başına yeni yer sayısı: {stream.merged.first_source_counts()}")
                 
-                # Yemek türü ile isim uyumluluğunu kontrol et (daha akıllı filtreleme)
-                if restaurant_type and restaurant_type != "restaurant":
-                    type_match = False
-                    place_name_normalized = self._normalize_turkish_text(place_name)
-                    
-                    # Genişletilmiş terimlerle kontrol
-                    for term in expanded_terms:
-                        term_normalized = self._normalize_turkish_text(term)
-                        if term_normalized in place_name_normalized:
-                            type_match = True
-                            break
-                    
-                    # Eğer restoran adında arama terimi yoksa, genel restoran kategorisinden kabul et
-                    if not type_match:
-                        general_terms = ['restoran', 'restaurant', 'lokanta', 'yemek evi', 'evi', 'salonu']
-                        for general_term in general_terms:
-                            if general_term in place_name_normalized:
-                                type_match = True
-                                break
-                    
-                    # Çok katı olmayalım - eğer bu noktaya kadar geldiyse muhtemelen ilgili bir restoran
-                    if not type_match:
-                        # Puan yüksekse veya yorum sayısı fazlaysa kabul et
-                        rating = place.get('rating', 0)
-                        review_count = place.get('user_ratings_total', 0)
-                        if rating >= 4.0 and review_count >= 50:
-                            type_match = True
-                    
-                    # Hala eşleşme yoksa bu restoranı geç
-                    if not type_match:
-                        continue
+                self._record_term_yields(plan, query_results, stream, query_terms)
                 
-                filtered_results.append(place)
+                search_calls = sum(len(pages) for _, pages in query_results)
+                report['api_calls'] += search_calls
+                report['errors'] += len(errors)
+                if errors and budget is not None:
+                    # Hatalı sorgular checkpoint'te bekliyor - devam token'ıyla tekrar denenir
+                    budget.partial = True
+                if budget is not None and budget.partial:
+                    # Kapsam tamamlanmadı - yerler depoya yazılır ama kapsam "taranmış" sayılmaz
+                    budget.resume_token = crawl_id
+                    self.place_store.upsert_places(stream.places())
+                    logger.info(f"Arama sınıra ulaştı, kısmi sonuç dönüyor ({budget.calls} çağrı)")
+                elif errors:
+                    # Hata alan sorguların sonuçları eksik - kapsam "taranmış" sayılmaz, sonraki arama tekrar dener
+                    self.place_store.upsert_places(stream.places())
+                    logger.warning(f"{len(errors)} sorgu hata aldı, kapsam kaydedilmedi")
+                    for _, error in errors:
+                        if isinstance(error, GOOGLE_UNAVAILABLE_ERRORS):
+                            # Eksik liste başarılı sonuç gibi dönmez - çağıran tarafa (Flask: 503) iletilir
+                            raise error
+                else:
+                    self.place_store.record_scope(scope_key, SEARCH_SOURCE, stream.places(), api_calls=search_calls + cell_calls)
+                    # Kapsam tamamlandı - önceki bütçeli/yarım bir taramadan kalan checkpoint de artık gereksiz
+                    # (aynı taramayı o an sürdüren bir çalıştırma varsa onun bitmesi beklenir)
+                    with self.crawl_checkpoint.exclusive(crawl_id):
+                        self.crawl_checkpoint.clear(crawl_id)
+            
+            logger.info(f"Toplam Google API sonucu: {len(stream)}")
+            
+            # Filtreden geçen sonuçlar - ilçe, isim ve arama terimine uygunluk kontrolü
+            filtered_results = stream.filtered()
             
             # Filtrelenmiş sonuçları işle
-            restaurants.extend(self._extract_restaurant_info(filtered_results, min_rating))
-            
-            # Eğer yeterli sonuç yoksa, nearby search ile destekle
-            if len(restaurants) < 30:
-                # Geocode yap
-                geocode_result = self.gmaps.geocode(f"{location}, Türkiye")
-                if geocode_result:
-                    lat_lng = geocode_result[0]['geometry']['location']
-                    
-                    # Nearby search - daha küçük yarıçap ile
-                    nearby_result = self.gmaps.places_nearby(
-                        location=lat_lng,
-                        radius=radius,
-                        keyword=restaurant_type,
-                        type='restaurant'
-                    )
-                    
+            if refresh_max_age is not None:
+                self._refresh_stale_places(filtered_results, refresh_max_age, report)
+            restaurants.extend(self._extract_restaurant_info(filtered_results, min_rating, fetch_details=fetch_details))
+            
+            # Eğer yeterli sonuç yoksa, nearby search ile destekle (yarıda kalan taramada değil)
+            if len(restaurants) < 30 and not (budget is not None and budget.partial):
+                nearby_places = self._fallback_nearby_places(scope_key, coverage, location, radius, restaurant_type,
+                                                             min_rating if refresh_max_age is None else 0, report, budget)
+                if nearby_places is not None:
                     # Nearby sonuçları da filtrele
-                    seen_places = set([r.get('place_id') for r in restaurants])
-                    for place in nearby_result.get('results', []):
-                        address = place.get('vicinity', '').lower()
-                        place_name = place.get('name', '').lower()
+                    checked_count = len(filtered_results)
+                    restaurant_ids = {r.place_id for r in restaurants}
+                    filtered_ids = {place.get('place_id') for place in filtered_results}
+                    # Koordinat kontrolleri tüm grup için bir kez yapılır (sınır indeksi + ilçe poligonları)
+                    in_bounds_ids = self._place_ids_in_bounds(nearby_places, 'İstanbul', district) if len(location_parts) > 1 else None
+                    nearby_districts = self.district_classifier.classify_places(nearby_places, polygon_city) if polygon_city else {}
+                    for place in nearby_places:
                         place_id = place.get('place_id')
+                        stream.merged.add(place, NEARBY_FALLBACK_SOURCE)
                         
-                        # Duplicate kontrolü
-                        if place_id in seen_places:
+                        # Duplicate kontrolü - zaten sonuçta ya da filtreden geçmiş olanlar atlanır
+                        if place_id in restaurant_ids or place_id in filtered_ids:
                             continue
                         
-                        # İlçe kontrolü (sadece district belirtilmişse) - ESNEK YAKLAŞIM
-                        if len(location_parts) > 1:
-                            address_normalized = self._normalize_turkish_text(address)
-                            district_normalized = self._normalize_turkish_text(district)
-                            
-                            # Birden fazla kontrol yöntemi - DAHA ESNEK
-                            district_found = False
-                            
-                            # 1. Tam isim kontrolü
-                            if district_normalized in address_normalized:
-                                district_found = True
-                            
-                            # 2. Yaygın kısaltmalar kontrolü
-                            district_variations = self._get_district_variations(district_normalized)
-                            for variation in district_variations:
-                                if variation in address_normalized:
-                                    district_found = True
-                                    break
-                            
-                            # 3. İstanbul geneli kontrolü - YENI EKLEME
-                            if not district_found and 'istanbul' in address_normalized:
-                                # Google bazen sadece "İstanbul" yazıyor, ilçe belirtmiyor
-                                # Bu durumda koordinat kontrolü yapalım
-                                lat = place.get('geometry', {}).get('location', {}).get('lat')
-                                lng = place.get('geometry', {}).get('location', {}).get('lng')
-                                
-                                if lat and lng:
-                                    # İstanbul sınırları içindeyse kabul et
-                                    if self._is_location_in_bounds(lat, lng, 'İstanbul', district):
-                                        district_found = True
-                                        logger.debug(f"Koordinat bazlı eşleşme: {district} - {lat},{lng}")
-                            
-                            # 4. ESNEK YAKLAŞIM: Çok katı olmayalım
-                            if not district_found:
-                                # Eğer address'te hiçbir ilçe bilgisi yoksa ve İstanbul içindeyse
-                                # nearby search results olabilir, kabul edelim
-                                if 'istanbul' in address_normalized and not any(
-                                    other_district in address_normalized for other_district in 
-                                    ['kadikoy', 'besiktas', 'sisli', 'fatih', 'beyoglu', 'uskudar', 
-                                     'bagcilar', 'zeytinburnu', 'bakirkoy', 'maltepe']
-                                ):
-                                    district_found = True
-                                    logger.debug(f"Esnek eşleşme (İstanbul genel): {address}")
-                                else:
-                                    logger.debug(f"İlçe eşleşmedi: {district} != {address}")
-                                    continue
-                            else:
-                                logger.debug(f"İlçe eşleşti: {district} = {address}")
-                        
-                        # Restoran adı filtresi (eğer belirtilmişse)
-                        if restaurant_name and restaurant_name.lower() not in place_name:
+                        in_bounds = in_bounds_ids is None or place_id in in_bounds_ids
+                        if not place_filter.matches_nearby(place, nearby_districts.get(place_id), in_bounds):
                             continue
                         
-                        seen_places.add(place_id)
-                        filtered_results.append(place)
+                        filtered_ids.add(place_id)
+                        filtered_results.append(stream.merged.get(place_id) or place)
                     
                     # Yeni sonuçları işle
-                    new_restaurants = self._extract_restaurant_info([p for p in filtered_results if p.get('place_id') not in [r.get('place_id') for r in restaurants]], min_rating)
-                    restaurants.extend(new_restaurants)
+                    new_places = filtered_results[checked_count:]
+                    if refresh_max_age is not None:
+                        self._refresh_stale_places(new_places, refresh_max_age, report)
+                    restaurants.extend(self._extract_restaurant_info(new_places, min_rating, fetch_details=fetch_details))
             
             # Puana göre sırala (yüksekten düşüğe)
-            restaurants.sort(key=lambda x: x['Puan'], reverse=True)
+            restaurants = sort_by_rating(restaurants)
             
             logger.info(f"Toplam {len(restaurants)} restoran bulundu ({district} içinde)")
             return restaurants
             
+        except GOOGLE_UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
+            # O ana kadar bulunanlar döner, ama sonuç eksik - önbelleğe yazılmaz
             logger.error(f"Arama hatası: {str(e)}")
+            report['errors'] += 1
             return restaurants
     
-    def _extract_restaurant_info(self, places, min_rating=4.5):
+    def _refresh_stale_places(self, places, max_age, report):
+        """
+        Son alınma zamanı max_age'den eski yerlerin puanını Place Details ile yeniler
+        
+        Places sonuçları yerinde güncellenir (puan, yorum sayısı); detay önbelleği ve
+        yerel depo da yenilenir, böylece ardından gelen telefon bilgisi ek çağrı yapmaz.
+        """
+        places_by_id = {place['place_id']: place for place in places if place.get('place_id')}
+        stale_ids = self.place_store.stale_place_ids(list(places_by_id), max_age)
+        report['refreshed_places'] += len(stale_ids)
+        report['fresh_places'] += len(places_by_id) - len(stale_ids)
+        # Taze yerler için çağrı yapılmaz, ama baştan tarama da puanları Text Search'ten
+        # alacağı için bunlar tasarruf sayılmaz
+        report['api_calls'] += len(stale_ids)
+        if not stale_ids:
+            return
+        
+        def refresh(place_id):
+            try:
+                return place_id, self._get_place_details(place_id, refresh=True)
+            except Exception as e:
+                logger.warning(f"Puan yenilenemedi: {place_id} - {str(e)}")
+                return place_id, {}
+        
+        logger.info(f"{len(stale_ids)} bayat yer yenileniyor ({len(places_by_id) - len(stale_ids)} yer taze)")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(stale_ids)))) as executor:
+            for place_id, details in executor.map(refresh, stale_ids):
+                place = places_by_id[place_id]
+                for field in ('rating', 'user_ratings_total'):
+                    if details.get(field) is not None:
+                        place[field] = details[field]
+    
+    def _rescan_is_cheaper(self, places, max_age, rescan_calls):
+        """
+        Yenileme modunda bayat yerleri tek tek yenilemek baştan taramadan pahalı mı
+        
+        Her bayat yer bir Place Details çağrısı demektir; kapsamı (ya da taze hücreleri)
+        yeniden taramak ise kaydedilen arama çağrısı kadar tutar ve tüm puanları da yeniler.
+        
+        Args:
+            places: Yenilenecek (filtreden geçen) yerler
+            max_age: Yer puanlarının taze sayıldığı süre (saniye)
+            rescan_calls: Baştan taramanın arama çağrısı sayısı
+        """
+        stale_count = len(self.place_store.stale_place_ids([place['place_id'] for place in places], max_age))
+        if stale_count <= rescan_calls:
+            return False
+        logger.info(f"{stale_count} bayat yer var, {rescan_calls} çağrılık baştan tarama daha ucuz - yeniden taranıyor")
+        return True
+    
+    def _reuse_fresh_cells(self, queries, max_age):
+        """
+        Full scan sorgularından tazeliği dolmamış hücreleri ayıklar
+        
+        Taze hücrenin yerleri depodan okunur; hücre önceki taramada bölündüyse
+        alt hücreleri de aynı şekilde değerlendirilir.
+        
+        Args:
+            max_age: Hücrenin taze sayıldığı süre (None ise deponun varsayılanı)
+            
+        Returns:
+            tuple: (çalıştırılacak sorgular, depodan gelen yerler, atlanan çağrı sayısı, taze hücre sayısı)
+        """
+        remaining = []
+        places = []
+        saved_calls = 0
+        reused_cells = 0
+        
+        def visit(query):
+            nonlocal saved_calls, reused_cells
+            if len(query) > 3:
+                cell_key = self._cell_key(query)
+                cell = self.place_store.get_cell(cell_key, max_age=max_age)
+                if cell:
+                    reused_cells += 1
+                    saved_calls += cell['api_calls']
+                    places.extend(self.place_store.scope_places(cell_key, CELL_SOURCE))
+                    if cell['split']:
+                        for child in self._split_cell(query):
+                            visit(child)
+                    return
+            remaining.append(query)
+        
+        for query in queries:
+            visit(query)
+        return remaining, places, saved_calls, reused_cells
+    
+    def _query_source(self, query):
+        """Birleştirme indeksi için sorgunun kaynak etiketi"""
+        method_name, kwargs = query[1], query[2]
+        if method_name == 'places':
+            return kwargs['query']
+        location = kwargs['location']
+        return f"nearby:{kwargs.get('keyword')}@{location['lat']:.4f},{location['lng']:.4f}/{kwargs['radius']}"
+    
+    def _record_term_yields(self, plan, query_results, stream, query_terms):
+        """
+        Terim başına sayfa çağrısı ve ilk kez bulunan yer sayısını planlayıcıya yazar
+        
+        Sadece filtreden geçen yerler sayılır; ilçe dışı ya da alakasız sonuç getiren
+        genel terimler (örn. "restaurant") çok yer bulsa da düşük verimli sayılır.
+        
+        Args:
+            plan: (sorgu türü, ana arama) - bkz. QueryPlanner.plan
+            query_results: (sorgu, sayfalar) çiftleri
+            stream: Aramanın PlaceStream'i
+            query_terms: Text Search sorgusu -> terim
+        """
+        first_counts = stream.merged.first_source_counts(stream.accepted_ids())
+        term_yields = {}
+        for query, pages in query_results:
+            kwargs = query[2]
+            term = kwargs.get('keyword') if query[1] == 'places_nearby' else query_terms.get(kwargs.get('query'))
+            if not term:
+                continue
+            calls, new_places = term_yields.get(term, (0, 0))
+            term_yields[term] = (calls + len(pages), new_places + first_counts.get(self._query_source(query), 0))
+        self.query_planner.record(*plan, term_yields)
+    
+    def _cell_key(self, query):
+        """Full scan hücre sorgusunun depo anahtarı (hücre + terim; aramalar arasında ortak)"""
+        return PlaceStore.make_scope_key(['cell', query[1], query[2]])
+    
+    def _run_queries(self, queries, progress=None, resume=None, stream=None, budget=None):
+        """
+        Places sorgularını sayfa token zamanlayıcısı ile aynı anda çalıştırır
+        
+        Args:
+            queries: (hata etiketi, gmaps metod adı, parametreler[, CoverageCell]) listesi
+            progress: Zamanlayıcı ilerleme dinleyicisi (optional, bkz. PageTokenScheduler.run)
+            resume: Sorgu başına (page_token, alınmış sayfa sayısı) ya da None (optional)
+            stream: Sayfaların geldikçe (sorgu sırasıyla) ekleneceği PlaceStream (optional)
+            budget: Her sayfa isteği bu bütçeden düşülür; bittiğinde (ya da stream'de
+                budget.min_results kadar uygun sonuç toplandığında) bekleyen istekler
+                gönderilmez ve budget.partial True olur (optional, bkz. SearchBudget)
+            
+        Bir sorgu GOOGLE_UNAVAILABLE_ERRORS hatası alırsa yeni istek gönderilmez; bekleyen
+        sorgular da hatalı sonuçla birlikte çağırana bırakılır (bütçeli aramada kısmi sonuç).
+            
+        Returns:
+            tuple: ((sorgu, sayfa sonuçları) çiftleri, (sorgu, hata) listesi). Çiftler sorgu sırasıyla,
+                bölünen hücrelerin sorguları en sonda. stream verildiyse sayfalar ona aktarılıp
+                bırakılır ve sadece sayıları kalır; verilmediyse yerler kullanılan alanlara
+                indirilmiş olarak döner (bkz. slim_place). Hata alan sorguların sonuçları eksiktir, hücreleri
+                depoya yazılmaz.
+        """
+        # Önceki çalıştırmada başlamış sorguların sayfaları eksik, hücre kaydı yazılmaz
+        resumed = {id(query) for query, state in zip(queries, resume or []) if state}
+        jobs = list(queries)
+        
+        def on_job_done(query, pages):
+            # Zamanlayıcı yeni sorguları dönüş sırasıyla kuyruğun sonuna ekler
+            children = self._finish_query(query, pages, record=id(query) not in resumed)
+            jobs.extend(children)
+            return children
+        
+        errors = []
+        unavailable = []
+        
+        def on_error(query, e):
+            logger.warning(f"{query[0]}: {str(e)}")
+            errors.append((query, e))
+            if isinstance(e, GOOGLE_UNAVAILABLE_ERRORS):
+                unavailable.append(e)
+        
+        def admit(query):
+            if unavailable:
+                return False
+            if budget is None:
+                return True
+            if budget.min_results is not None and stream is not None and stream.qualified_count() >= budget.min_results:
+                return False
+            return budget.spend()
+        
+        scheduler = PageTokenScheduler(max_workers=self.max_workers)
+        query_pages = scheduler.run(
+            queries,
+            self._fetch_query_page,
+            on_error=on_error,
+            on_job_done=on_job_done,
+            progress=progress,
+            resume=resume,
+            reduce_page=slim_places,
+            on_page=(lambda query, results: stream.add(results, self._query_source(query))) if stream is not None else None,
+            admit=admit
+        )
+        if unavailable:
+            logger.warning(f"Google'a erişilemiyor, tarama durduruldu: {str(unavailable[0])}")
+        if scheduler.stopped and budget is not None:
+            budget.partial = True
+        return list(zip(jobs, query_pages)), errors
+    
+    def _run_checkpointed_queries(self, crawl_id, queries, stream, budget=None):
+        """
+        Sorguları ilerlemesini checkpoint'e yazarak çalıştırır
+        
+        Aynı tarama için yarım kalmış bir checkpoint varsa biten sorgular atlanır,
+        yarım kalanlar bekleyen token'larından devam eder ve daha önce toplanan yerler
+        sorgulardan önce stream'e eklenir. Tarama hatasız bitince checkpoint silinir; bütçe
+        yüzünden yarıda kalırsa ya da hata alan sorgular varsa sonraki istekte devam etmek
+        (hatalı sorguları tekrar denemek) üzere saklanır.
+        
+        Args:
+            crawl_id: Tarama id'si (bkz. make_crawl_id)
+            queries: Sorgu listesi
+            stream: Yerlerin ekleneceği PlaceStream
+            budget: Çağrı/süre sınırı (optional)
+        
+        Returns:
+            tuple: Bu çalıştırmadaki (sorgu, sayfalar) çiftleri ve (sorgu, hata) listesi
+        """
+        # Aynı tarama eş zamanlı çalışırsa işler iki kez eklenir ve biten taraf diğerinin checkpoint'ini siler
+        with self.crawl_checkpoint.exclusive(crawl_id):
+            state = self.crawl_checkpoint.load(crawl_id)
+            if state:
+                checkpoint_places = state['places']
+                pending = [job for job in state['jobs'] if not job[4] and (job[2] or job[3] == 0)]
+                logger.info(f"Full scan checkpoint bulundu: {len(checkpoint_places)} yer, {len(pending)} bekleyen sorgu")
+                job_ids = [job[0] for job in pending]
+                queries = [self._deserialize_query(job[1]) for job in pending]
+                resume = [(job[2], job[3]) if job[2] else None for job in pending]
+            else:
+                checkpoint_places = []
+                job_ids = self.crawl_checkpoint.add_jobs(crawl_id, [self._serialize_query(query) for query in queries])
+                resume = None
+            
+            stream.add(checkpoint_places, CHECKPOINT_SOURCE)
+            progress = CheckpointProgress(self.crawl_checkpoint, crawl_id, job_ids, self._serialize_query)
+            query_results, errors = self._run_queries(queries, progress=progress, resume=resume, stream=stream, budget=budget)
+            if not errors and (budget is None or not budget.partial):
+                self.crawl_checkpoint.clear(crawl_id)
+        return query_results, errors
+    
+    def _serialize_query(self, query):
+        """Sorguyu checkpoint için JSON'a yazılabilir hale getirir"""
+        label, method_name, kwargs = query[:3]
+        cell = query[3] if len(query) > 3 else None
+        return [label, method_name, kwargs, cell.to_dict() if cell else None]
+    
+    def _deserialize_query(self, data):
+        """_serialize_query çıktısından sorguyu geri kurar"""
+        label, method_name, kwargs, cell = data
+        if cell:
+            return (label, method_name, kwargs, CoverageCell.from_dict(cell))
+        return (label, method_name, kwargs)
+    
+    def _finish_query(self, query, pages, record=True):
+        """
+        Biten sorgu için zamanlayıcı geri çağrısı - hücre sonucunu depoya yazar, doymuşsa böler
+        
+        Returns:
+            list: Yeni sorgular (bkz. _split_saturated_cell)
+        """
+        children = self._split_saturated_cell(query, pages)
+        if len(query) > 3 and record:
+            self.place_store.record_cell(self._cell_key(query), [place for page in pages for place in page],
+                                         len(pages), bool(children))
+        return children
+    
+    def _split_saturated_cell(self, query, pages):
+        """
+        Full scan hücresi sonuç sınırına ulaştıysa aynı terim için 4 alt hücre sorgusu döner
+        
+        Args:
+            query: (hata etiketi, metod adı, parametreler[, CoverageCell])
+            pages: Sorgunun sayfa sonuçları
+            
+        Returns:
+            list: Yeni sorgular
+        """
+        if len(query) < 4 or not is_saturated(pages):
+            return []
+        
+        children = self._split_cell(query)
+        if children:
+            logger.info(f"Doymuş hücre bölünüyor: {query[3]} - '{query[2].get('keyword')}'")
+        return children
+    
+    def _split_cell(self, query):
+        """Hücre sorgusunu 4 alt hücre sorgusuna böler (en küçük yarıçapa ulaşıldıysa boş liste)"""
+        label, method_name, kwargs, cell = query
+        if cell.radius / 2 < FULL_SCAN_MIN_RADIUS:
+            return []
+        
+        return [
+            (label, method_name, dict(kwargs, location=child.center, radius=child.radius), child)
+            for child in cell.split()
+        ]
+    
+    def _fetch_query_page(self, query, page_token=None):
+        """Tek bir sorgunun bir sayfasını çeker"""
+        _, method_name, kwargs = query[:3]
+        call_kwargs = dict(kwargs)
+        if page_token:
+            call_kwargs['page_token'] = page_token
+        return getattr(self.gmaps, method_name)(**call_kwargs)
+    
+    def _fallback_nearby_places(self, scope_key, coverage, location, radius, restaurant_type, min_rating, report, budget=None):
+        """
+        Yeterli sonuç yoksa kullanılan yakın çevre aramasının sonuçlarını döner (bkz. slim_place)
+        
+        Kapsam yerel depoda tazeyse ve bu arama daha önce yapıldıysa depodan okunur,
+        aksi halde geocode + places_nearby çağrılır ve sonuç depoya yazılır.
+        
+        Returns:
+            list: Place sonuçları ya da geocode sonuç vermezse None
+        """
+        if coverage and coverage['nearby_fetched']:
+            report['saved_calls'] += NEARBY_FALLBACK_CALLS
+            return self.place_store.scope_places(scope_key, NEARBY_SOURCE, min_rating if min_rating > 0 else None)
+        
+        if budget is not None and not budget.spend(NEARBY_FALLBACK_CALLS):
+            logger.info("Çağrı bütçesi yakın çevre desteğine yetmiyor, atlanıyor")
+            return None
+        
+        # Geocode yap
+        geocode_result = self.gmaps.geocode(f"{location}, Türkiye")
+        report['api_calls'] += 1
+        if not geocode_result:
+            self.place_store.record_scope(scope_key, NEARBY_SOURCE, [])
+            return None
+        
+        lat_lng = geocode_result[0]['geometry']['location']
+        
+        # Nearby search - daha küçük yarıçap ile
+        nearby_result = self.gmaps.places_nearby(
+            location=lat_lng,
+            radius=radius,
+            keyword=restaurant_type,
+            type='restaurant'
+        )
+        report['api_calls'] += 1
+        nearby_places = [slim_place(place) for place in nearby_result.get('results', [])]
+        self.place_store.record_scope(scope_key, NEARBY_SOURCE, nearby_places)
+        return nearby_places
+    
+    def _extract_restaurant_info(self, places, min_rating=4.5, fetch_details=True):
         """
         Google Places API sonuçlarından restoran bilgilerini çıkarır
         
         Args:
             places: Places API sonuçları
             min_rating: Minimum puan filtresi
+            fetch_details: False ise Place Details çağrılmaz, telefon None kalır
+                (sonradan hydrate_restaurants ile doldurulur)
             
         Returns:
-            list: Restoran bilgileri
+            list: Restaurant listesi
         """
         restaurants = []
         
-        for place in places:
-            # Puan filtresi
-            rating = place.get('rating', 0)
-            if rating < min_rating:
-                continue
-                
-            # Detaylı bilgi için place details çağrısı
-            try:
-                place_details = self.gmaps.place(place['place_id'], language='tr')
-                details = place_details.get('result', {})
-                
-                # Çalışma saatlerini al
-                opening_hours = self._format_opening_hours(details.get('opening_hours', {}))
-                
-                restaurant = {
-                    'İsim': place.get('name', ''),
-                    'Adres': place.get('vicinity', ''),
-                    'Puan': rating,
-                    'Yorum Sayısı': place.get('user_ratings_total', 0),
-                    'Telefon': details.get('formatted_phone_number', 'Bilinmiyor'),
-                    'Google Maps URL': f"https://www.google.com/maps/place/?q=place_id:{place.get('place_id')}",
-                    'place_id': place.get('place_id')
-                }
-                restaurants.append(restaurant)
-                
-            except Exception as e:
-                logger.warning(f"Detay alınamadı: {place.get('name', 'Unknown')} - {str(e)}")
-                # Detay alınamazsa temel bilgilerle devam et
-                restaurant = {
-                    'İsim': place.get('name', ''),
-                    'Adres': place.get('vicinity', ''),
-                    'Puan': rating,
-                    'Yorum Sayısı': place.get('user_ratings_total', 0),
-                    'Telefon': 'Bilinmiyor',
-                    'Google Maps URL': f"https://www.google.com/maps/place/?q=place_id:{place.get('place_id')}",
-                    'place_id': place.get('place_id'),
-                    'Tarih': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                restaurants.append(restaurant)
+        # Puan filtresi tüm grup için vektörel
+        batch = PlaceBatch.from_places(places)
+        qualified = batch.take(batch.rating_at_least(min_rating))
+        
+        for place in qualified.places:
+            restaurant = Restaurant.from_place(place)
+            if fetch_details:
+                self._hydrate_restaurant(restaurant)
+            restaurants.append(restaurant)
         
         return restaurants
     
+    def hydrate_restaurants(self, restaurants):
+        """
+        Detayı henüz alınmamış restoranlar için Place Details çeker
+        
+        Sayfalı aramada sadece istenen sayfadaki satırlar için çağrılır,
+        böylece Details çağrısı sayısı toplam sonuç yerine sayfa boyutu kadar olur.
+        
+        Args:
+            restaurants: _extract_restaurant_info(fetch_details=False) satırları
+            
+        Returns:
+            list: Aynı liste (yerinde güncellenir)
+        """
+        pending = [r for r in restaurants if r.phone is None]
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+                list(executor.map(self._hydrate_restaurant, pending))
+        return restaurants
+    
+    def _hydrate_restaurant(self, restaurant):
+        """Tek bir restoran satırına Place Details bilgilerini ekler"""
+        try:
+            # Detaylı bilgi için place details çağrısı (önbellekten)
+            details = self._get_place_details(restaurant.place_id)
+            restaurant.phone = details.get('formatted_phone_number', 'Bilinmiyor')
+        except Exception as e:
+            logger.warning(f"Detay alınamadı: {restaurant.name or 'Unknown'} - {str(e)}")
+            # Detay alınamazsa temel bilgilerle devam et
+            restaurant.phone = 'Bilinmiyor'
+            restaurant.date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return restaurant
+    
+    def _get_place_details(self, place_id, refresh=False):
+        """
+        Place Details sonucunu döner, TTL süresince önbellekten okur
+        
+        Args:
+            place_id: Google place_id
+            refresh: True ise önbellek atlanır ve sonuç Google'dan yeniden çekilir
+            
+        Returns:
+            dict: Place Details 'result' alanı
+        """
+        if not refresh:
+            details = self.details_cache.get(place_id)
+            if details is not None:
+                return details
+        
+        place_details = self.gmaps.place(place_id, language='tr')
+        details = place_details.get('result', {})
+        if details:
+            self.details_cache.set(place_id, details)
+            self.place_store.update_details(place_id, details)
+        return details
+    
     def _format_opening_hours(self, opening_hours):
         """Çalışma saatlerini formatlar"""
         if not opening_hours or 'weekday_text' not in opening_hours:
@@ -581,7 +1167,7 @@ class GoogleSheetsRestaurantScraper:
         except Exception as e:
             logger.warning(f"Formatlama hatası (önemsiz): {str(e)}")
     
-    def run_search_to_sheets(self, location, restaurant_type, sheet_name, min_rating=4.5, restaurant_name=None):
+    def run_search_to_sheets(self, location, restaurant_type, sheet_name, min_rating=4.5, restaurant_name=None, refresh_max_age=None):
         """
         Restoran arar ve sonuçları Google Sheets'e yazar
         
@@ -591,35 +1177,53 @@ class GoogleSheetsRestaurantScraper:
             sheet_name: Yazılacak sheet adı
             min_rating: Minimum puan filtresi
             restaurant_name: Opsiyonel restoran adı filtresi
+            refresh_max_age: Verilirse sheet artımlı yenilenir (bkz. refresh_search),
+                çağrı raporu 'refresh' alanında döner
             
         Returns:
-            dict: İşlem sonucu
+            dict: İşlem sonucu ('restaurants' alanında sheet'e yazılan liste döner,
+                böylece çağıran tarafın aynı aramayı tekrar yapmasına gerek kalmaz)
         """
         try:
             # Restoran ara
-            restaurants = self.search_restaurants(location, restaurant_type, min_rating=min_rating, restaurant_name=restaurant_name)
+            refresh_report = None
+            if refresh_max_age is not None:
+                refreshed = self.refresh_search(location, restaurant_type, min_rating=min_rating,
+                                                restaurant_name=restaurant_name, max_age=refresh_max_age)
+                restaurants, refresh_report = refreshed['restaurants'], refreshed['report']
+            else:
+                restaurants = self.search_restaurants(location, restaurant_type, min_rating=min_rating, restaurant_name=restaurant_name)
             
             if not restaurants:
                 return {
                     'success': False,
                     'message': 'Restoran bulunamadı',
-                    'count': 0
+                    'count': 0,
+                    'restaurants': []
                 }
             
+            # Satırlar bir kez serileştirilir; sheet'e yazılan liste cevapta da kullanılır
+            restaurants = serialize_restaurants(restaurants)
+            
             # Sheet'e yaz
             success = self.create_or_update_sheet(sheet_name, restaurants)
             
             if success:
-                return {
+                result = {
                     'success': True,
                     'message': f'{len(restaurants)} restoran bulundu ve kaydedildi',
-                    'count': len(restaurants)
+                    'count': len(restaurants),
+                    'restaurants': restaurants
                 }
+                if refresh_report is not None:
+                    result['refresh'] = refresh_report
+                return result
             else:
                 return {
                     'success': False,
                     'message': 'Sheet güncellenemedi',
-                    'count': len(restaurants)
+                    'count': len(restaurants),
+                    'restaurants': restaurants
                 }
             
         except Exception as e:
@@ -627,7 +1231,8 @@ class GoogleSheetsRestaurantScraper:
             return {
                 'success': False,
                 'message': str(e),
-                'count': 0
+                'count': 0,
+                'restaurants': []
             }
     
     def batch_search_to_sheets(self, searches):
@@ -650,6 +1255,8 @@ class GoogleSheetsRestaurantScraper:
                 search['restaurant_type'],
                 search['sheet_name']
             )
+            # Toplu özet için restoran listesi taşınmaz (sadece sheet'e yazılır)
+            result.pop('restaurants', None)
             
             results.append({
                 'location': search['location'],
@@ -657,28 +1264,12 @@ class GoogleSheetsRestaurantScraper:
                 'sheet_name': search['sheet_name'],
                 'result': result
             })
-            
-            # Rate limit için bekleme
-            time.sleep(2)
         
         return results
     
     def _normalize_turkish_text(self, text):
         """Türkçe karakterleri normalize eder ve küçük harfe çevirir"""
-        if not text:
-            return ""
-        
-        # Türkçe karakter dönüşümü
-        replacements = {
-            'ı': 'i', 'İ': 'i', 'ş': 's', 'Ş': 's', 'ğ': 'g', 'Ğ': 'g',
-            'ü': 'u', 'Ü': 'u', 'ö': 'o', 'Ö': 'o', 'ç': 'c', 'Ç': 'c'
-        }
-        
-        normalized = text.lower()
-        for tr_char, en_char in replacements.items():
-            normalized = normalized.replace(tr_char, en_char)
-        
-        return normalized
+        return normalize_turkish_text(text)
     
     def _get_district_variations(self, district):
         """İlçe isimlerinin yaygın varyasyonlarını döner"""
@@ -730,30 +1321,71 @@ class GoogleSheetsRestaurantScraper:
     def _is_location_in_bounds(self, lat, lng, city, district=None):
         """Verilen koordinatın belirtilen şehir/ilçe sınırları içinde olup olmadığını kontrol eder"""
         try:
-            # İstanbul için genel sınırlar
-            if city.lower() in ['istanbul', 'İstanbul']:
-                istanbul_bounds = {
-                    'north': 41.34, 'south': 40.80,
-                    'east': 29.70, 'west': 27.80
-                }
-                
-                if not (istanbul_bounds['south'] <= lat <= istanbul_bounds['north'] and
-                        istanbul_bounds['west'] <= lng <= istanbul_bounds['east']):
-                    return False
-                
-                # İlçe bazlı detaylı kontrol (sadece bazı büyük ilçeler için)
-                if district:
-                    district_bounds = self._get_district_bounds(district.lower())
-                    if district_bounds:
-                        return (district_bounds['south'] <= lat <= district_bounds['north'] and
-                                district_bounds['west'] <= lng <= district_bounds['east'])
-            
-            return True  # Diğer şehirler için şimdilik true
+            bounds = self._get_location_bounds(city, district)
+            if not bounds:
+                return True  # Diğer şehirler için şimdilik true
+            return (bounds['south'] <= lat <= bounds['north'] and
+                    bounds['west'] <= lng <= bounds['east'])
             
         except Exception as e:
             logger.error(f"Lokasyon sınır kontrolü hatası: {str(e)}")
             return True  # Hata durumunda filtreleme yapma
     
+    def _place_ids_in_bounds(self, places, city, district=None):
+        """
+        Toplu konum kontrolü - sınırlar bir kez hesaplanır, yerler tek tek karşılaştırılır
+        
+        Returns:
+            set: Sınırlar içindeki place_id'ler, sınır bilinmiyorsa None (filtreleme yapılmaz)
+        """
+        try:
+            bounds = self._get_location_bounds(city, district)
+        except Exception as e:
+            logger.error(f"Lokasyon sınır kontrolü hatası: {str(e)}")
+            return None
+        if not bounds:
+            return None
+        
+        in_bounds = set()
+        for place in places:
+            location = place.get('geometry', {}).get('location', {})
+            lat, lng = location.get('lat'), location.get('lng')
+            if (place.get('place_id') and lat is not None and lng is not None and
+                    bounds['south'] <= lat <= bounds['north'] and bounds['west'] <= lng <= bounds['east']):
+                in_bounds.add(place['place_id'])
+        return in_bounds
+    
+    def _get_location_bounds(self, city, district=None):
+        """
+        Şehir/ilçe için kontrol edilecek sınırları döner
+        
+        İlçe sınırı biliniyorsa (ve şehir sınırı içinde kalıyorsa) ilçe, değilse şehir sınırı döner.
+        
+        Returns:
+            dict: {'north', 'south', 'east', 'west'} ya da sınır bilinmiyorsa None
+        """
+        # İstanbul için genel sınırlar
+        if city.lower() not in ['istanbul', 'İstanbul']:
+            return None
+        
+        istanbul_bounds = {
+            'north': 41.34, 'south': 40.80,
+            'east': 29.70, 'west': 27.80
+        }
+        
+        # İlçe bazlı detaylı kontrol (sadece bazı büyük ilçeler için)
+        if district:
+            district_bounds = self._get_district_bounds(district.lower())
+            if district_bounds:
+                return {
+                    'north': min(district_bounds['north'], istanbul_bounds['north']),
+                    'south': max(district_bounds['south'], istanbul_bounds['south']),
+                    'east': min(district_bounds['east'], istanbul_bounds['east']),
+                    'west': max(district_bounds['west'], istanbul_bounds['west'])
+                }
+        
+        return istanbul_bounds
+    
     def _get_district_bounds(self, district):
         """İlçe sınırlarını döner (yaklaşık)"""
         district_bounds = {
@@ -780,19 +1412,6 @@ class GoogleSheetsRestaurantScraper:
             return {'north': 41.34, 'south': 40.80, 'east': 29.70, 'west': 27.80}
         return None
 
-    def _generate_grid_centers(self, bounds, rows=3, cols=3):
-        """Verilen sınırlar içinde grid merkezleri üretir"""
-        centers = []
-        lat_step = (bounds['north'] - bounds['south']) / (rows + 1)
-        lng_step = (bounds['east'] - bounds['west']) / (cols + 1)
-        for r in range(1, rows + 1):
-            for c in range(1, cols + 1):
-                centers.append({
-                    'lat': bounds['south'] + r * lat_step,
-                    'lng': bounds['west'] + c * lng_step
-                })
-        return centers
-    
     def _expand_search_terms(self, restaurant_type):
         """
         Arama terimini genişletir ve benzeri kelimeleri ekler
@@ -888,5 +1507,5 @@ class GoogleSheetsRestaurantScraper:
         if base_term not in ['restoran', 'restaurant', 'lokanta']:
             expanded_terms.extend(['restoran', 'restaurant', 'lokanta'])
         
-        # Tekrarları kaldır ve listeyi döndür
-        return list(set(expanded_terms))
\ No newline at end of file
+        # Tekrarları kaldır ve listeyi döndür (sıra korunur, ana terim başta kalır)
+        return list(dict.fromkeys(expanded_terms))
\ No newline at end of file
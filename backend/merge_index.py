@@ -0,0 +1,107 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# PlaceMergeIndex.merge sonuçları
+NEW = 'new'          # Yer ilk kez görüldü
+UPDATED = 'updated'  # Tekrar görüldü, boş alanları dolduruldu
+SEEN = 'seen'        # Tekrar görüldü, kayıt değişmedi
+
+
+def _is_empty(value):
+    return value is None or value == '' or value == [] or value == {}
+
+
+class PlaceMergeIndex:
+    """
+    Tüm kaynaklardan (metin araması, isim araması, grid nearby, yakın çevre
+    desteği, yerel depo) gelen yerlerin tek birleştirme indeksi.
+
+    Üyelik kontrolü O(1)'dir, yerler ilk görüldükleri sırayla tutulur. Aynı yer
+    tekrar geldiğinde ilk kayıttaki boş alanlar yeni kayıttan doldurulur (ör. metin
+    araması 'formatted_address', nearby 'vicinity' getirir) ve yeri bulan her
+    kaynak kaydedilir.
+    """
+
+    def __init__(self):
+        self._places = {}   # place_id -> yer (ekleme sırasıyla)
+        self._sources = {}  # place_id -> yeri bulan kaynaklar (sırasıyla)
+
+    def __len__(self):
+        return len(self._places)
+
+    def __contains__(self, place_id):
+        return place_id in self._places
+
+    def add(self, place, source):
+        """
+        Yeri indekse ekler ya da mevcut kayıtla birleştirir
+
+        Args:
+            place: Places API sonucu
+            source: Yeri bulan kaynak/sorgu etiketi
+
+        Returns:
+            bool: Yer ilk kez görüldüyse True (place_id'si olmayan yerler eklenmez)
+        """
+        return self.merge(place, source)[1] == NEW
+
+    def merge(self, place, source):
+        """
+        add ile aynı, ama birleştirilmiş kaydı ve sonucu döner
+
+        Returns:
+            tuple: (birleştirilmiş kayıt, NEW/UPDATED/SEEN) - place_id'si olmayan yerler için (None, None)
+        """
+        place_id = place.get('place_id')
+        if not place_id:
+            return None, None
+
+        existing = self._places.get(place_id)
+        if existing is None:
+            self._places[place_id] = place
+            self._sources[place_id] = [source]
+            return place, NEW
+
+        status = SEEN
+        if existing is not place:
+            for key, value in place.items():
+                if _is_empty(existing.get(key)) and not _is_empty(value):
+                    existing[key] = value
+                    status = UPDATED
+        if source not in self._sources[place_id]:
+            self._sources[place_id].append(source)
+        return existing, status
+
+    def add_all(self, places, source):
+        """
+        Returns:
+            int: İlk kez görülen yer sayısı
+        """
+        return sum(1 for place in places if self.add(place, source))
+
+    def get(self, place_id):
+        """Birleştirilmiş yer kaydı (yoksa None)"""
+        return self._places.get(place_id)
+
+    def places(self):
+        """Tüm yerler, ilk görüldükleri sırayla"""
+        return list(self._places.values())
+
+    def sources(self, place_id):
+        """Yeri bulan kaynaklar (ilk bulan başta)"""
+        return list(self._sources.get(place_id, []))
+
+    def first_source_counts(self, place_ids=None):
+        """
+        Args:
+            place_ids: Verilirse sadece bu yerler sayılır (örn. filtreden geçenler)
+
+        Returns:
+            dict: Kaynak -> o kaynağın ilk bulduğu yer sayısı
+        """
+        counts = {}
+        for place_id, sources in self._sources.items():
+            if place_ids is None or place_id in place_ids:
+                counts[sources[0]] = counts.get(sources[0], 0) + 1
+        return counts
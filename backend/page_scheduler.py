@@ -0,0 +1,176 @@
+import heapq
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+
+class PageTokenScheduler:
+    """
+    Places sorgularını ve next_page_token'larını tek bir kuyrukta yönetir.
+
+    Google, next_page_token'ın kullanılabilmesi için ~2 saniye bekletiyor.
+    Her token "hazır olma" zamanıyla kuyruğa girer; o sırada worker'lar
+    diğer sorguların sayfalarını çeker. Böylece bekleme süreleri toplanmak
+    yerine üst üste biner.
+    """
+
+    def __init__(self, max_workers=4, token_delay=2.0, max_pages=3):
+        """
+        Args:
+            max_workers: Aynı anda uçuşta olabilecek en fazla istek
+            token_delay: next_page_token'ın hazır olması için beklenen süre (saniye)
+            max_pages: Sorgu başına en fazla sayfa (Google limiti 3)
+        """
+        self.max_workers = max(1, max_workers)
+        self.token_delay = token_delay
+        self.max_pages = max_pages
+
+    def run(self, jobs, fetch_page, on_error=None, on_job_done=None, progress=None, resume=None,
+            reduce_page=None, on_page=None, admit=None):
+        """
+        Tüm sorguları sayfalarıyla birlikte çalıştırır
+
+        Args:
+            jobs: Sorgu listesi (fetch_page'e aynen geçilir)
+            fetch_page: fetch_page(job, page_token) -> Places API cevabı (dict)
+            on_error: on_error(job, exception) - hata olan sorgunun kalan sayfaları atlanır; sorgu
+                tamamlanmış sayılmaz (progress.job_finished ve on_job_done çağrılmaz), checkpoint'te
+                bekleyen olarak kalır
+            on_job_done: on_job_done(job, pages) -> yeni sorgular (optional). Bir sorgunun
+                tüm sayfaları bittiğinde çağrılır; dönen sorgular kuyruğun sonuna eklenir.
+            progress: İlerleme dinleyicisi (optional) - page_fetched(index, job, results, next_page_token),
+                job_finished(index, job) ve jobs_added(indices, jobs) metodları çağrılır
+            resume: jobs ile aynı sırada (page_token, alınmış sayfa sayısı) ya da None listesi
+                (optional). Yarım kalmış sorgular kaldıkları token'dan devam eder.
+            reduce_page: reduce_page(job, results) -> results (optional). Sayfa gelir gelmez
+                çağrılır; ham sonuç yerine dönen (küçültülmüş) liste saklanır.
+            on_page: on_page(job, results) (optional). Sayfalar geldikçe, ama sorgu sırasıyla
+                verilir: önceki sorgular bitene kadar sonraki sorguların sayfaları bekletilir,
+                böylece tüketici sıralı akışla aynı sırayı görür. Tüm sayfaları verilen ve
+                bitmiş sorguların sayfaları bırakılır; bellekte sadece sırası gelmemiş sayfalar kalır.
+            admit: admit(job) -> bool (optional). Her istek gönderilmeden önce çağrılır;
+                False dönerse yeni istek gönderilmez, uçuştaki istekler bitince tarama
+                durur ve self.stopped True olur. Bekleyen sorgular/token'lar atlanır
+                (checkpoint'te kaldıkları yerden devam edebilirler).
+
+        Returns:
+            list: Her sorgu için sayfa sayfa 'results' listeleri (sorgu sırasıyla,
+                sonradan eklenen sorgular en sonda). Devam eden sorgularda önceki
+                çalıştırmada alınan, on_page verildiyse de tüketiciye verilmiş sayfaların
+                yerinde boş liste bulunur (sayfa sayısı korunur).
+        """
+        self.stopped = False
+        jobs = list(jobs)
+        resume = resume or [None] * len(jobs)
+        pages = [[[] for _ in range(state[1])] if state else [] for state in resume]
+        if not jobs:
+            return pages
+
+        # (hazır olma zamanı, sıra, sorgu indeksi, page_token)
+        queue = [(0.0, index, index, state[0] if state else None) for index, state in enumerate(resume)]
+        heapq.heapify(queue)
+        sequence = len(jobs)
+        in_flight = {}
+        finished = [False] * len(jobs)
+        next_job = 0    # on_page'e sayfaları verilmekte olan sorgu
+        delivered = 0   # o sorgunun verilmiş sayfa sayısı
+
+        def deliver(flush=False):
+            nonlocal next_job, delivered
+            if not on_page:
+                return
+            while next_job < len(jobs):
+                for results in pages[next_job][delivered:]:
+                    on_page(jobs[next_job], results)
+                delivered = len(pages[next_job])
+                if not finished[next_job] and not flush:
+                    return
+                # Sorgu bitti (on_job_done sayfalarını gördü) - içerik bırakılır, sayfa sayısı kalır
+                pages[next_job] = [[] for _ in pages[next_job]]
+                next_job += 1
+                delivered = 0
+
+        def finish(index):
+            nonlocal sequence
+            finished[index] = True
+            if progress:
+                progress.job_finished(index, jobs[index])
+            if not on_job_done:
+                return
+            new_jobs = on_job_done(jobs[index], pages[index]) or []
+            if not new_jobs:
+                return
+            indices = []
+            for new_job in new_jobs:
+                jobs.append(new_job)
+                pages.append([])
+                finished.append(False)
+                indices.append(len(jobs) - 1)
+                heapq.heappush(queue, (0.0, sequence, len(jobs) - 1, None))
+                sequence += 1
+            if progress:
+                progress.jobs_added(indices, new_jobs)
+
+        workers = self.max_workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while (queue and not self.stopped) or in_flight:
+                now = time.monotonic()
+                while queue and not self.stopped and queue[0][0] <= now and len(in_flight) < workers:
+                    if admit and not admit(jobs[queue[0][2]]):
+                        self.stopped = True
+                        break
+                    _, _, index, page_token = heapq.heappop(queue)
+                    future = executor.submit(fetch_page, jobs[index], page_token)
+                    in_flight[future] = index
+
+                # Bir sonraki token ne zaman hazır olacak?
+                timeout = None
+                if queue and not self.stopped and len(in_flight) < workers:
+                    timeout = max(0.0, queue[0][0] - time.monotonic())
+
+                if not in_flight:
+                    if self.stopped:
+                        break
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if on_error:
+                            on_error(jobs[index], e)
+                        else:
+                            logger.warning(f"Sorgu hatası: {str(e)}")
+                        # Sıralı teslimat için bitmiş sayılır, ama tamamlandı olarak bildirilmez
+                        finished[index] = True
+                        deliver()
+                        continue
+
+                    results = result.get('results', [])
+                    if reduce_page:
+                        results = reduce_page(jobs[index], results)
+                    pages[index].append(results)
+                    next_page_token = result.get('next_page_token')
+                    if len(pages[index]) >= self.max_pages:
+                        next_page_token = None
+                    if progress:
+                        progress.page_fetched(index, jobs[index], results, next_page_token)
+
+                    if next_page_token:
+                        ready_at = time.monotonic() + self.token_delay
+                        heapq.heappush(queue, (ready_at, sequence, index, next_page_token))
+                        sequence += 1
+                    else:
+                        finish(index)
+                    deliver()
+
+        if self.stopped:
+            # Yarım kalan sorguların o ana kadarki sayfaları da sırayla verilir
+            logger.info(f"Tarama durduruldu: {len(queue)} bekleyen istek atlandı")
+            deliver(flush=True)
+        return pages
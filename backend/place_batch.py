@@ -0,0 +1,110 @@
+import sys
+from operator import attrgetter
+
+import numpy as np
+
+# "Arama terimi geçmiyor ama popüler" yerler için eşikler
+POPULAR_MIN_RATING = 4.0
+POPULAR_MIN_REVIEWS = 50
+
+
+def _number(value):
+    return 0 if value is None else value
+
+
+class PlaceBatch:
+    """
+    Places sonuçlarının sütunlu (columnar) gösterimi.
+
+    Puan, yorum sayısı, koordinat ve place_id NumPy dizilerinde tutulur;
+    puan eşiği, popülerlik kuralı ve sıralama tüm grup
+    üzerinde vektörel çalışır. Ham yer sözlükleri 'places' listesinde aynı
+    sırayla durur. place_id ve isimler intern edilir.
+    """
+
+    __slots__ = ('places', 'place_ids', 'ratings', 'review_counts', 'lats', 'lngs')
+
+    def __init__(self, places, place_ids, ratings, review_counts, lats, lngs):
+        self.places = places
+        self.place_ids = place_ids
+        self.ratings = ratings
+        self.review_counts = review_counts
+        self.lats = lats
+        self.lngs = lngs
+
+    @classmethod
+    def from_places(cls, places):
+        """
+        Args:
+            places: Places API sonuçları (tekrarlar önceden elenmiş olmalı, bkz. PlaceMergeIndex)
+        """
+        places = list(places)
+        ids, ratings, review_counts, lats, lngs = [], [], [], [], []
+        nan = float('nan')
+        for place in places:
+            place_id = place.get('place_id')
+            if place_id:
+                place_id = sys.intern(place_id)
+                place['place_id'] = place_id
+            name = place.get('name')
+            if isinstance(name, str):
+                place['name'] = sys.intern(name)
+            ids.append(place_id or '')
+            ratings.append(_number(place.get('rating', 0)))
+            review_counts.append(_number(place.get('user_ratings_total', 0)))
+            location = place.get('geometry', {}).get('location', {})
+            lat, lng = location.get('lat'), location.get('lng')
+            if lat is None or lng is None:
+                lat = lng = nan
+            lats.append(lat)
+            lngs.append(lng)
+
+        place_ids = np.array(ids, dtype=object)
+        ratings = np.array(ratings, dtype=float)
+        review_counts = np.array(review_counts, dtype=np.int64)
+        lats = np.array(lats, dtype=float)
+        lngs = np.array(lngs, dtype=float)
+
+        return cls(places, place_ids, ratings, review_counts, lats, lngs)
+
+    def __len__(self):
+        return len(self.places)
+
+    def take(self, selector):
+        """Maske ya da indeks dizisiyle seçilen satırlardan yeni grup"""
+        indices = np.flatnonzero(selector) if np.asarray(selector).dtype == bool else np.asarray(selector, dtype=int)
+        return PlaceBatch(
+            [self.places[i] for i in indices],
+            self.place_ids[indices],
+            self.ratings[indices],
+            self.review_counts[indices],
+            self.lats[indices],
+            self.lngs[indices]
+        )
+
+    def rating_at_least(self, min_rating):
+        """Puanı eşik ve üzerindeki satırların maskesi"""
+        return self.ratings >= min_rating
+
+    def popular(self, min_rating=POPULAR_MIN_RATING, min_reviews=POPULAR_MIN_REVIEWS):
+        """Puanı ve yorum sayısı yüksek satırların maskesi"""
+        return (self.ratings >= min_rating) & (self.review_counts >= min_reviews)
+
+    def rating_order(self):
+        """Puana göre yüksekten düşüğe kararlı sıralama indeksleri"""
+        return np.argsort(-self.ratings, kind='stable')
+
+
+def sort_by_rating(rows, key=attrgetter('rating')):
+    """
+    Satırları puana göre yüksekten düşüğe kararlı sıralar
+    (list.sort(key=..., reverse=True) ile aynı sonuç, vektörel)
+
+    Args:
+        rows: Sıralanacak satırlar (varsayılan: Restaurant)
+        key: Satırın puanını döndüren fonksiyon
+    """
+    if len(rows) < 2:
+        return list(rows)
+    ratings = np.fromiter((_number(key(row)) for row in rows), dtype=float, count=len(rows))
+    return [rows[i] for i in np.argsort(-ratings, kind='stable')]
@@ -0,0 +1,185 @@
+import logging
+
+from aho_corasick import AhoCorasick
+
+logger = logging.getLogger(__name__)
+
+TURKISH_TRANSLATION = str.maketrans({
+    'ı': 'i', 'İ': 'i', 'ş': 's', 'Ş': 's', 'ğ': 'g', 'Ğ': 'g',
+    'ü': 'u', 'Ü': 'u', 'ö': 'o', 'Ö': 'o', 'ç': 'c', 'Ç': 'c'
+})
+
+# İsminde arama terimi geçmeyen yerler bu genel restoran terimlerinden biriyle de kabul edilir
+GENERAL_RESTAURANT_TERMS = ('restoran', 'restaurant', 'lokanta', 'yemek evi', 'evi', 'salonu')
+
+# Yakın çevre desteğinde adreste başka bir ilçe adı geçiyorsa esnek eşleşme yapılmaz
+KNOWN_ISTANBUL_DISTRICTS = ('kadikoy', 'besiktas', 'sisli', 'fatih', 'beyoglu', 'uskudar',
+                            'bagcilar', 'zeytinburnu', 'bakirkoy', 'maltepe')
+
+# Otomat etiketleri
+TARGET_DISTRICT = 'district'
+KNOWN_DISTRICT = 'known_district'
+ISTANBUL = 'istanbul'
+NAME = 'name'
+TYPE_TERM = 'type'
+GENERAL_TERM = 'general'
+
+
+def normalize_turkish_text(text):
+    """Türkçe karakterleri normalize eder ve küçük harfe çevirir (tek str.translate geçişi)"""
+    if not text:
+        return ""
+    # Dönüşüm lower()'dan önce yapılır: 'İ'.lower() noktalı 'i̇' (i + birleşik nokta) üretiyor
+    return text.translate(TURKISH_TRANSLATION).lower()
+
+
+class PlaceFilter:
+    """
+    Bir arama için bir kez derlenen yer filtresi.
+
+    İlçe varyasyonları, isim, tür terimleri ve genel restoran terimleri derleme
+    sırasında normalize edilip tek bir Aho–Corasick otomatında toplanır. Her yer
+    için isim ve adres bir kez normalize edilir ve birer kez taranır; geçen tüm
+    terimler ve ilçeler aynı taramada bulunur.
+    """
+
+    def __init__(self, district=None, district_variations=(), district_key=None,
+                 restaurant_name=None, type_terms=None):
+        """
+        Args:
+            district: İlçe filtresi (None ise ilçe kontrolü yapılmaz)
+            district_variations: Normalize ilçe adının yaygın varyasyonları
+            district_key: İlçe poligonu anahtarı (bkz. district_polygons.normalize_name)
+            restaurant_name: Restoran adı filtresi (optional)
+            type_terms: Genişletilmiş tür terimleri - None ise tür kontrolü yapılmaz
+        """
+        self.district = district
+        self.district_key = district_key
+        if district is not None:
+            self.district_lower = district.lower()
+            # Normalize ilçe adı ve varyasyonları - sıralı, tekrarsız
+            self.district_needles = tuple(dict.fromkeys([normalize_turkish_text(district)] + list(district_variations)))
+
+        self.restaurant_name = restaurant_name
+        if restaurant_name:
+            self.name_lower = restaurant_name.lower()
+            self.name_normalized = normalize_turkish_text(restaurant_name)
+
+        self.type_needles = None
+        if type_terms is not None:
+            self.type_needles = tuple(dict.fromkeys(normalize_turkish_text(term) for term in type_terms))
+
+        patterns = [(needle, TARGET_DISTRICT) for needle in self.district_needles] if district is not None else []
+        # KNOWN_DISTRICT "hedef dışındaki bir ilçe" anlamına gelir
+        own_needles = self.district_needles if district is not None else ()
+        patterns += [(needle, KNOWN_DISTRICT) for needle in KNOWN_ISTANBUL_DISTRICTS if needle not in own_needles]
+        patterns.append(('istanbul', ISTANBUL))
+        if restaurant_name:
+            patterns.append((self.name_normalized, NAME))
+        if self.type_needles is not None:
+            patterns += [(needle, TYPE_TERM) for needle in self.type_needles]
+            patterns += [(term, GENERAL_TERM) for term in GENERAL_RESTAURANT_TERMS]
+        self._matcher = AhoCorasick(patterns)
+
+    def scan(self, text):
+        """
+        Metni (normalize edilip) tek geçişte tarar
+
+        Returns:
+            frozenset: Metinde geçen terim etiketleri (TARGET_DISTRICT, TYPE_TERM, ...)
+        """
+        return self._matcher.scan(normalize_turkish_text(text))
+
+    def matches(self, place, polygon_district=None, is_popular=None):
+        """
+        Metin aramasından gelen yer için ilçe, isim ve tür uygunluğu
+
+        Args:
+            place: Places API sonucu
+            polygon_district: Yerin koordinatına göre düştüğü ilçe anahtarı (optional)
+            is_popular: Puanı/yorum sayısı yüksek mi (optional, bkz. PlaceBatch.popular -
+                verilmezse yerden hesaplanır)
+        """
+        place_name = place.get('name', '').lower()
+        name_terms = None
+
+        # İlçe kontrolü (sadece district belirtilmişse)
+        if self.district is not None:
+            raw_address = place.get('formatted_address', '')
+            # 1. Direkt adres kontrolü, 2-3. normalize ad ve varyasyonlar
+            if self.district_lower not in raw_address.lower():
+                # Ham metin taranır: önce lower() yapılırsa 'İ' noktalı 'i̇' olur ve eşleşmez
+                address_terms = self.scan(raw_address)
+                if TARGET_DISTRICT not in address_terms:
+                    # 4. İlçe poligonu - poligonlar kaba olduğu için adres başka bir ilçe
+                    # söylüyorsa ona uyulur
+                    if not (polygon_district is not None and polygon_district == self.district_key
+                            and KNOWN_DISTRICT not in address_terms):
+                        return False
+
+        # Restoran adı filtresi (eğer belirtilmişse)
+        if self.restaurant_name:
+            if self.name_lower not in place_name:
+                name_terms = self.scan(place.get('name', ''))
+                if NAME not in name_terms:
+                    return False
+
+        # Yemek türü ile isim uyumluluğu
+        if self.type_needles is not None:
+            if name_terms is None:
+                name_terms = self.scan(place.get('name', ''))
+            if not (TYPE_TERM in name_terms or GENERAL_TERM in name_terms):
+                # Puan yüksekse veya yorum sayısı fazlaysa kabul et
+                if is_popular is None:
+                    is_popular = place.get('rating', 0) >= 4.0 and place.get('user_ratings_total', 0) >= 50
+                if not is_popular:
+                    return False
+
+        return True
+
+    def matches_nearby(self, place, polygon_district=None, in_bounds=True):
+        """
+        Yakın çevre desteğinden gelen yer için (daha esnek) ilçe ve isim uygunluğu
+
+        Args:
+            place: Places API sonucu (adres olarak 'vicinity' kullanılır)
+            polygon_district: Yerin koordinatına göre düştüğü ilçe anahtarı (optional)
+            in_bounds: Koordinat şehir/ilçe sınırları içinde mi
+        """
+        place_name = place.get('name', '').lower()
+
+        if self.district is not None:
+            address = place.get('vicinity', '')
+            address_terms = self.scan(address)
+
+            # 1-2. Tam isim ve yaygın kısaltmalar
+            district_found = TARGET_DISTRICT in address_terms
+
+            # 3. İlçe poligonu - sadece adres başka bir ilçe söylemiyorsa kabul sebebi;
+            # poligonlar kaba olduğu için tek başına ret sebebi değildir
+            if (not district_found and polygon_district is not None and polygon_district == self.district_key
+                    and KNOWN_DISTRICT not in address_terms):
+                district_found = True
+
+            # 4. İstanbul geneli - Google bazen sadece "İstanbul" yazıyor, koordinat kontrolü yapılır
+            if not district_found and ISTANBUL in address_terms:
+                location = place.get('geometry', {}).get('location', {})
+                if location.get('lat') and location.get('lng') and in_bounds:
+                    district_found = True
+                    logger.debug(f"Koordinat bazlı eşleşme: {self.district} - {location['lat']},{location['lng']}")
+
+            # 5. Esnek yaklaşım: adreste başka ilçe yoksa ve İstanbul içindeyse kabul et
+            if not district_found:
+                if ISTANBUL in address_terms and KNOWN_DISTRICT not in address_terms:
+                    logger.debug(f"Esnek eşleşme (İstanbul genel): {address}")
+                else:
+                    logger.debug(f"İlçe eşleşmedi: {self.district} != {address}")
+                    return False
+            else:
+                logger.debug(f"İlçe eşleşti: {self.district} = {address}")
+
+        # Restoran adı filtresi (eğer belirtilmişse)
+        if self.restaurant_name and self.name_lower not in place_name:
+            return False
+
+        return True
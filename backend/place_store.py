@@ -0,0 +1,400 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from spatial_index import GeohashIndex
+
+logger = logging.getLogger(__name__)
+
+# Kapsanan arama kapsamları bu süre boyunca Google'a gitmeden yerelden cevaplanır (saniye)
+DEFAULT_COVERAGE_TTL = 24 * 3600
+
+SEARCH_SOURCE = 'search'
+NEARBY_SOURCE = 'nearby'
+CELL_SOURCE = 'cell'
+
+_TR_TRANSLATION = str.maketrans({
+    'ı': 'i', 'İ': 'i', 'ş': 's', 'Ş': 's', 'ğ': 'g', 'Ğ': 'g',
+    'ü': 'u', 'Ü': 'u', 'ö': 'o', 'Ö': 'o', 'ç': 'c', 'Ç': 'c'
+})
+
+
+def _normalize(text):
+    return (text or '').translate(_TR_TRANSLATION).lower()
+
+
+class PlaceStore:
+    """
+    Scraper'ın gördüğü tüm yerleri tutan yerel SQLite deposu.
+
+    Her yer için puan, yorum sayısı, koordinat, adres, normalize isim ve
+    detay alanları saklanır. Ayrıca hangi arama kapsamının (konum + tür + isim)
+    ne zaman tarandığı ve hangi yerleri döndürdüğü kaydedilir; kapsamı taze
+    olan aramalar Google'a gitmeden buradan cevaplanır.
+
+    Bölge ve yarıçap sorguları için yerlerin koordinatları bellekte bir
+    geohash indeksinde tutulur (ilk kullanımda SQLite'tan yüklenir).
+    """
+
+    def __init__(self, db_path='places.db', coverage_ttl=DEFAULT_COVERAGE_TTL):
+        """
+        Args:
+            db_path: SQLite dosya yolu
+            coverage_ttl: Bir kapsamın taze sayıldığı süre (saniye)
+        """
+        self.coverage_ttl = coverage_ttl
+        self._lock = threading.Lock()
+        self._index = None
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS places (
+                place_id TEXT PRIMARY KEY,
+                name TEXT,
+                name_normalized TEXT,
+                formatted_address TEXT,
+                vicinity TEXT,
+                address_normalized TEXT,
+                rating REAL,
+                user_ratings_total INTEGER,
+                lat REAL,
+                lng REAL,
+                phone TEXT,
+                details_fetched_at REAL,
+                last_seen_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_places_rating ON places (rating);
+            CREATE INDEX IF NOT EXISTS idx_places_lat_lng ON places (lat, lng);
+            CREATE INDEX IF NOT EXISTS idx_places_name_normalized ON places (name_normalized);
+            CREATE INDEX IF NOT EXISTS idx_places_last_seen_at ON places (last_seen_at);
+
+            CREATE TABLE IF NOT EXISTS search_coverage (
+                scope_key TEXT PRIMARY KEY,
+                covered_at REAL NOT NULL,
+                nearby_fetched INTEGER NOT NULL DEFAULT 0,
+                api_calls INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS cell_coverage (
+                cell_key TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                api_calls INTEGER NOT NULL,
+                split INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS scope_places (
+                scope_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                place_id TEXT NOT NULL,
+                PRIMARY KEY (scope_key, source, position)
+            );
+
+            CREATE TABLE IF NOT EXISTS term_stats (
+                term_key TEXT PRIMARY KEY,
+                searches INTEGER NOT NULL,
+                calls INTEGER NOT NULL,
+                new_places INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_scope_key(key):
+        """Normalize arama anahtarını saklanabilir bir kapsam anahtarına çevirir"""
+        return json.dumps(key, ensure_ascii=False, default=str)
+
+    def upsert_places(self, places):
+        """Google'dan gelen ham place sonuçlarını depoya yazar/günceller"""
+        now = time.time()
+        rows = []
+        for place in places:
+            place_id = place.get('place_id')
+            if not place_id:
+                continue
+            location = place.get('geometry', {}).get('location', {})
+            address = place.get('formatted_address') or place.get('vicinity') or ''
+            rows.append((
+                place_id, place.get('name'), _normalize(place.get('name')),
+                place.get('formatted_address'), place.get('vicinity'), _normalize(address),
+                place.get('rating'), place.get('user_ratings_total'),
+                location.get('lat'), location.get('lng'), now
+            ))
+
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO places (place_id, name, name_normalized, formatted_address, vicinity,
+                                    address_normalized, rating, user_ratings_total, lat, lng, last_seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(place_id) DO UPDATE SET
+                    name = excluded.name,
+                    name_normalized = excluded.name_normalized,
+                    formatted_address = COALESCE(excluded.formatted_address, places.formatted_address),
+                    vicinity = COALESCE(excluded.vicinity, places.vicinity),
+                    address_normalized = excluded.address_normalized,
+                    rating = excluded.rating,
+                    user_ratings_total = excluded.user_ratings_total,
+                    lat = COALESCE(excluded.lat, places.lat),
+                    lng = COALESCE(excluded.lng, places.lng),
+                    last_seen_at = excluded.last_seen_at
+            """, rows)
+            self._conn.commit()
+            if self._index is not None:
+                for row in rows:
+                    self._index.add(row[0], row[8], row[9])
+
+    def update_details(self, place_id, details):
+        """Place Details alanlarını (telefon, güncel puan) yere işler"""
+        with self._lock:
+            self._conn.execute("""
+                UPDATE places SET
+                    phone = ?,
+                    rating = COALESCE(?, rating),
+                    user_ratings_total = COALESCE(?, user_ratings_total),
+                    details_fetched_at = ?
+                WHERE place_id = ?
+            """, (details.get('formatted_phone_number'), details.get('rating'),
+                  details.get('user_ratings_total'), time.time(), place_id))
+            self._conn.commit()
+
+    def record_scope(self, scope_key, source, places, api_calls=0):
+        """
+        Bir arama kapsamının döndürdüğü yerleri (sırasıyla) kaydeder
+
+        Args:
+            scope_key: make_scope_key çıktısı
+            source: SEARCH_SOURCE (ana arama) ya da NEARBY_SOURCE (yakın çevre desteği)
+            places: Ham place sonuçları
+            api_calls: Kapsamın taranması için yapılan arama çağrısı sayısı (SEARCH_SOURCE)
+        """
+        self.upsert_places(places)
+        with self._lock:
+            self._replace_scope_places(scope_key, source, places)
+            if source == SEARCH_SOURCE:
+                self._conn.execute("""
+                    INSERT INTO search_coverage (scope_key, covered_at, nearby_fetched, api_calls) VALUES (?, ?, 0, ?)
+                    ON CONFLICT(scope_key) DO UPDATE SET
+                        covered_at = excluded.covered_at, nearby_fetched = 0, api_calls = excluded.api_calls
+                """, (scope_key, time.time(), api_calls))
+            else:
+                self._conn.execute(
+                    "UPDATE search_coverage SET nearby_fetched = 1 WHERE scope_key = ?", (scope_key,)
+                )
+            self._conn.commit()
+
+    def get_coverage(self, scope_key, max_age=None):
+        """
+        Args:
+            max_age: Kapsamın taze sayıldığı süre (saniye, verilmezse coverage_ttl)
+
+        Returns:
+            dict: {'covered_at', 'nearby_fetched', 'api_calls'} - kapsam yoksa ya da bayatsa None
+        """
+        max_age = self.coverage_ttl if max_age is None else max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT covered_at, nearby_fetched, api_calls FROM search_coverage WHERE scope_key = ?", (scope_key,)
+            ).fetchone()
+        if not row or time.time() - row[0] >= max_age:
+            return None
+        return {'covered_at': row[0], 'nearby_fetched': bool(row[1]), 'api_calls': row[2]}
+
+    def record_cell(self, cell_key, places, api_calls, split):
+        """
+        Full scan hücre sorgusunun sonucunu kaydeder
+
+        Args:
+            cell_key: make_scope_key çıktısı (hücre + arama terimi)
+            places: Hücrenin döndürdüğü ham place sonuçları
+            api_calls: Hücre için yapılan sayfa çağrısı sayısı
+            split: Hücre doyduğu için alt hücrelere bölündüyse True
+        """
+        self.upsert_places(places)
+        with self._lock:
+            self._replace_scope_places(cell_key, CELL_SOURCE, places)
+            self._conn.execute("""
+                INSERT INTO cell_coverage (cell_key, fetched_at, api_calls, split) VALUES (?, ?, ?, ?)
+                ON CONFLICT(cell_key) DO UPDATE SET
+                    fetched_at = excluded.fetched_at, api_calls = excluded.api_calls, split = excluded.split
+            """, (cell_key, time.time(), api_calls, int(split)))
+            self._conn.commit()
+
+    def get_cell(self, cell_key, max_age=None):
+        """
+        Args:
+            max_age: Hücrenin taze sayıldığı süre (saniye, verilmezse coverage_ttl)
+
+        Returns:
+            dict: {'fetched_at', 'api_calls', 'split'} - hücre yoksa ya da bayatsa None
+        """
+        max_age = self.coverage_ttl if max_age is None else max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, api_calls, split FROM cell_coverage WHERE cell_key = ?", (cell_key,)
+            ).fetchone()
+        if not row or time.time() - row[0] >= max_age:
+            return None
+        return {'fetched_at': row[0], 'api_calls': row[1], 'split': bool(row[2])}
+
+    def record_term_yield(self, term_yields):
+        """
+        Arama terimlerinin bir aramadaki verimini birikimli istatistiklere ekler
+
+        Args:
+            term_yields: term_key -> (sayfa çağrısı, ilk kez bulunan yer sayısı)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO term_stats (term_key, searches, calls, new_places, updated_at) VALUES (?, 1, ?, ?, ?)
+                ON CONFLICT(term_key) DO UPDATE SET
+                    searches = term_stats.searches + 1,
+                    calls = term_stats.calls + excluded.calls,
+                    new_places = term_stats.new_places + excluded.new_places,
+                    updated_at = excluded.updated_at
+            """, [(term_key, calls, new_places, now) for term_key, (calls, new_places) in term_yields.items()])
+            self._conn.commit()
+
+    def get_term_stats(self, term_keys):
+        """
+        Returns:
+            dict: term_key -> {'searches', 'calls', 'new_places', 'updated_at'} (kaydı olmayanlar yer almaz)
+        """
+        term_keys = list(term_keys)
+        if not term_keys:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT term_key, searches, calls, new_places, updated_at FROM term_stats "
+                "WHERE term_key IN (%s)" % ','.join('?' * len(term_keys)),
+                term_keys
+            ).fetchall()
+        return {row[0]: {'searches': row[1], 'calls': row[2], 'new_places': row[3], 'updated_at': row[4]}
+                for row in rows}
+
+    def stale_place_ids(self, place_ids, max_age):
+        """
+        Son alınma zamanı (aramada görülme ya da detay çekilme) max_age'den eski yerleri döner
+
+        Depoda hiç olmayan yerler de bayat sayılır.
+
+        Returns:
+            list: Bayat place_id'ler (verilen sırayla)
+        """
+        place_ids = list(dict.fromkeys(place_ids))
+        cutoff = time.time() - max_age
+        fresh = set()
+        with self._lock:
+            # SQLite parametre sınırına takılmamak için parça parça sorgula
+            for start in range(0, len(place_ids), 500):
+                chunk = place_ids[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT place_id FROM places WHERE place_id IN (%s) "
+                    "AND MAX(last_seen_at, COALESCE(details_fetched_at, 0)) >= ?" % ','.join('?' * len(chunk)),
+                    chunk + [cutoff]
+                ).fetchall()
+                fresh.update(row[0] for row in rows)
+        return [place_id for place_id in place_ids if place_id not in fresh]
+
+    def places_in_bounds(self, bounds, min_rating=None):
+        """
+        Sınırlar içindeki tüm bilinen yerleri döner (geohash indeksi üzerinden)
+
+        Args:
+            bounds: {'north', 'south', 'east', 'west'} sınırları
+            min_rating: Verilirse bu puanın altındaki yerler elenir
+
+        Returns:
+            list: Places API formatında yerler
+        """
+        with self._lock:
+            place_ids = self._spatial_index().in_bounds(bounds)
+        return self._load_places(place_ids, min_rating)
+
+    def places_within(self, lat, lng, radius, min_rating=None):
+        """
+        Noktaya radius metre mesafedeki bilinen yerleri yakından uzağa döner
+
+        Returns:
+            list: Places API formatında yerler
+        """
+        with self._lock:
+            place_ids = [place_id for _, place_id in self._spatial_index().within_radius(lat, lng, radius)]
+        return self._load_places(place_ids, min_rating)
+
+    def _spatial_index(self):
+        """Geohash indeksini döner, ilk çağrıda depodaki koordinatlardan kurar (kilit altında çağrılır)"""
+        if self._index is None:
+            self._index = GeohashIndex()
+            rows = self._conn.execute(
+                "SELECT place_id, lat, lng FROM places WHERE lat IS NOT NULL AND lng IS NOT NULL"
+            ).fetchall()
+            for place_id, lat, lng in rows:
+                self._index.add(place_id, lat, lng)
+        return self._index
+
+    def _load_places(self, place_ids, min_rating=None):
+        """place_id listesini (sırası korunarak) Places API formatında yerlere çevirir"""
+        rows_by_id = {}
+        with self._lock:
+            for start in range(0, len(place_ids), 500):
+                chunk = place_ids[start:start + 500]
+                query = (
+                    "SELECT place_id, name, formatted_address, vicinity, rating, user_ratings_total, lat, lng "
+                    "FROM places WHERE place_id IN (%s)" % ','.join('?' * len(chunk))
+                )
+                params = list(chunk)
+                if min_rating is not None:
+                    query += " AND rating >= ?"
+                    params.append(min_rating)
+                for row in self._conn.execute(query, params).fetchall():
+                    rows_by_id[row[0]] = row
+        return [self._row_to_place(rows_by_id[place_id]) for place_id in place_ids if place_id in rows_by_id]
+
+    def _replace_scope_places(self, scope_key, source, places):
+        """Kapsamın yer listesini yenisiyle değiştirir (kilit altında çağrılır)"""
+        place_ids = [place['place_id'] for place in places if place.get('place_id')]
+        self._conn.execute(
+            "DELETE FROM scope_places WHERE scope_key = ? AND source = ?", (scope_key, source)
+        )
+        self._conn.executemany(
+            "INSERT INTO scope_places (scope_key, source, position, place_id) VALUES (?, ?, ?, ?)",
+            [(scope_key, source, position, place_id) for position, place_id in enumerate(place_ids)]
+        )
+
+    def scope_places(self, scope_key, source, min_rating=None):
+        """
+        Kapsamın yerlerini, kayıt sırasıyla ve Places API formatında döner
+
+        Args:
+            min_rating: Verilirse bu puanın altındaki yerler (indeks üzerinden) elenir
+        """
+        query = """
+            SELECT p.place_id, p.name, p.formatted_address, p.vicinity, p.rating,
+                   p.user_ratings_total, p.lat, p.lng
+            FROM scope_places s JOIN places p ON p.place_id = s.place_id
+            WHERE s.scope_key = ? AND s.source = ?
+        """
+        params = [scope_key, source]
+        if min_rating is not None:
+            query += " AND p.rating >= ?"
+            params.append(min_rating)
+        query += " ORDER BY s.position"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._row_to_place(row) for row in rows]
+
+    @staticmethod
+    def _row_to_place(row):
+        place_id, name, formatted_address, vicinity, rating, user_ratings_total, lat, lng = row
+        place = {'place_id': place_id, 'name': name}
+        for key, value in (('formatted_address', formatted_address), ('vicinity', vicinity),
+                           ('rating', rating), ('user_ratings_total', user_ratings_total)):
+            if value is not None:
+                place[key] = value
+        if lat is not None and lng is not None:
+            place['geometry'] = {'location': {'lat': lat, 'lng': lng}}
+        return place
@@ -0,0 +1,108 @@
+import logging
+
+from merge_index import PlaceMergeIndex, NEW, UPDATED
+from place_batch import PlaceBatch
+
+logger = logging.getLogger(__name__)
+
+# Filtreleme, depo ve restoran satırı için gereken alanlar (fotoğraf, ikon, plus code vb. taşınmaz)
+PLACE_FIELDS = ('place_id', 'name', 'formatted_address', 'vicinity', 'rating', 'user_ratings_total')
+
+
+def slim_place(place):
+    """Ham Places sonucunu sadece kullanılan alanlara indirir (geometry'den sadece konum kalır)"""
+    slim = {key: place[key] for key in PLACE_FIELDS if key in place}
+    location = (place.get('geometry') or {}).get('location')
+    if location:
+        slim['geometry'] = {'location': location}
+    return slim
+
+
+def slim_places(job, results):
+    """PageTokenScheduler reduce_page geri çağrısı - sayfa gelir gelmez ham sonuçlar bırakılır"""
+    return [slim_place(place) for place in results]
+
+
+class PlaceStream:
+    """
+    Sayfa sayfa gelen arama sonuçlarını birleştirir ve filtreler.
+
+    Her sayfa geldiği anda tekrar kontrolünden (PlaceMergeIndex) geçer; sadece
+    yeni yerler (ve boş alanları sonradan dolan, daha önce elenmiş yerler) ilçe
+    poligonlarına atanıp filtrelenir. Böylece filtreleme taramanın sonunu
+    beklemez ve ham sonuçlar tarama boyunca birikmez.
+    """
+
+    def __init__(self, place_filter, district_classifier=None, city=None, min_rating=None):
+        """
+        Args:
+            place_filter: PlaceFilter
+            district_classifier: DistrictClassifier (optional)
+            city: Verilirse yerler bu şehrin ilçe poligonlarına atanır
+            min_rating: Verilirse filtreden geçip bu puanı da tutan yerler sayılır (bkz. qualified_count)
+        """
+        self.place_filter = place_filter
+        self.district_classifier = district_classifier
+        self.city = city
+        self.min_rating = min_rating
+        self.merged = PlaceMergeIndex()
+        self._accepted = set()
+        self._rejected = set()
+        self._qualified = set()
+
+    def __len__(self):
+        return len(self.merged)
+
+    def add(self, places, source):
+        """
+        Bir sayfa (ya da depodan gelen yerler) ekler ve yeni yerleri filtreler
+
+        Returns:
+            int: İlk kez görülen yer sayısı
+        """
+        new_count = 0
+        pending = []
+        for place in places:
+            record, status = self.merged.merge(place, source)
+            if status == NEW:
+                new_count += 1
+                pending.append(record)
+            elif status == UPDATED and record['place_id'] in self._rejected:
+                # Örn. nearby ile gelip adresi olmadığı için elenen yer metin aramasında tekrar geldi
+                pending.append(record)
+        if pending:
+            self._filter(pending)
+        return new_count
+
+    def _filter(self, places):
+        batch = PlaceBatch.from_places(places)
+        if self.city is not None and self.district_classifier is not None:
+            districts = self.district_classifier.classify(batch.lats, batch.lngs, self.city)
+        else:
+            districts = [None] * len(batch)
+
+        qualified = batch.rating_at_least(self.min_rating) if self.min_rating is not None else [False] * len(batch)
+        for place, place_district, is_popular, is_qualified in zip(batch.places, districts, batch.popular(), qualified):
+            if self.place_filter.matches(place, place_district, is_popular):
+                self._accepted.add(place['place_id'])
+                self._rejected.discard(place['place_id'])
+                if is_qualified:
+                    self._qualified.add(place['place_id'])
+            else:
+                self._rejected.add(place['place_id'])
+
+    def qualified_count(self):
+        """Filtreden geçen ve puanı min_rating'i tutan yer sayısı"""
+        return len(self._qualified)
+
+    def places(self):
+        """Tüm yerler, ilk görüldükleri sırayla"""
+        return self.merged.places()
+
+    def accepted_ids(self):
+        """Filtreden geçen yerlerin place_id'leri"""
+        return set(self._accepted)
+
+    def filtered(self):
+        """Filtreden geçen yerler, ilk görüldükleri sırayla"""
+        return [place for place in self.merged.places() if place['place_id'] in self._accepted]
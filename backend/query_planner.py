@@ -0,0 +1,117 @@
+import logging
+import time
+
+from place_filter import normalize_turkish_text
+
+logger = logging.getLogger(__name__)
+
+# Bir terim en az bu kadar aramada görüldükten sonra verimine göre elenebilir
+TERM_MIN_SEARCHES = 3
+
+# Çağrı başına ortalama bu kadardan az yeni yer getiren terimler düşük verimli sayılır
+TERM_MIN_YIELD = 0.1
+
+# Elenen terimler istatistikleri bundan eskiyse tekrar denenir (saniye)
+TERM_RETRY_AFTER = 7 * 24 * 3600
+
+
+def canonical_term(term):
+    """Aynı sorguya denk gelen terimler için ortak anahtar ('Köfte ', 'kofte' -> 'kofte')"""
+    return ' '.join(normalize_turkish_text(term).split())
+
+
+class QueryPlanner:
+    """
+    Genişletilmiş arama terimlerinden çalıştırılacak sorgu kümesini seçer.
+
+    Normalize edildiğinde aynı sorguya düşen terimler tek sorguda birleştirilir.
+    Her terimin aramalardaki marjinal verimi (çağrı başına ilk kez bulduğu, filtreden geçen yer)
+    PlaceStore'da birikir; geçmişte neredeyse hiç yeni yer getirmeyen terimler
+    sorgulanmaz. İlk (ana) terim hiçbir zaman elenmez; elenen terimler
+    istatistikleri eskidiğinde yeniden denenir.
+    """
+
+    def __init__(self, place_store, min_searches=TERM_MIN_SEARCHES, min_yield=TERM_MIN_YIELD,
+                 retry_after=TERM_RETRY_AFTER):
+        """
+        Args:
+            place_store: İstatistiklerin tutulduğu PlaceStore
+            min_searches: Eleme kararı için gereken en az arama sayısı
+            min_yield: Çağrı başına en az yeni yer
+            retry_after: Elenen terimin tekrar denenmesi için geçmesi gereken süre (saniye)
+        """
+        self.place_store = place_store
+        self.min_searches = min_searches
+        self.min_yield = min_yield
+        self.retry_after = retry_after
+
+    @staticmethod
+    def term_key(kind, base, term):
+        """
+        İstatistik anahtarı - terimin verimi aynı sorgu türü ve ana arama içinde anlamlı
+
+        Args:
+            kind: Sorgu türü ('places', 'places_nearby')
+            base: Terimlerin genişletildiği arama (tür ve/veya restoran adı)
+        """
+        return f"{kind}|{canonical_term(base)}|{canonical_term(term)}"
+
+    def plan(self, kind, base, terms, by_yield=False):
+        """
+        Args:
+            kind: Sorgu türü
+            base: Ana arama
+            terms: Genişletilmiş terimler (ilk terim ana terim, bkz. _expand_search_terms)
+            by_yield: True ise terimler geçmiş verimlerine göre sıralanır (ana terim yine başta,
+                istatistiği olmayan terimler bilinenlerden önce) - bütçeli aramalarda bütçe
+                önce en verimli sorgulara harcanır
+
+        Returns:
+            list: Sorgulanacak terimler (verilen sırayla ya da verime göre, boş terimler hariç)
+        """
+        unique = {}
+        for term in terms:
+            if term and canonical_term(term) not in unique:
+                unique[canonical_term(term)] = term
+        unique = list(unique.values())
+        if len(unique) < len(terms):
+            logger.info(f"Eşdeğer terimler birleştirildi: {len(terms)} -> {len(unique)}")
+
+        stats = self.place_store.get_term_stats(self.term_key(kind, base, term) for term in unique)
+        now = time.time()
+        planned = []
+        for position, term in enumerate(unique):
+            term_stats = stats.get(self.term_key(kind, base, term))
+            if position > 0 and self._is_low_yield(term_stats, now):
+                logger.info(f"Düşük verimli terim atlandı: '{term}' "
+                            f"({term_stats['new_places']} yeni yer / {term_stats['calls']} çağrı)")
+                continue
+            planned.append(term)
+
+        if by_yield and len(planned) > 1:
+            def term_yield(term):
+                term_stats = stats.get(self.term_key(kind, base, term))
+                if not term_stats or not term_stats['calls']:
+                    return float('inf')
+                return term_stats['new_places'] / term_stats['calls']
+            planned = planned[:1] + sorted(planned[1:], key=term_yield, reverse=True)
+        return planned
+
+    def _is_low_yield(self, term_stats, now):
+        if not term_stats or term_stats['searches'] < self.min_searches or not term_stats['calls']:
+            return False
+        if now - term_stats['updated_at'] >= self.retry_after:
+            return False
+        return term_stats['new_places'] / term_stats['calls'] < self.min_yield
+
+    def record(self, kind, base, term_yields):
+        """
+        Bir aramadaki terim verimlerini kaydeder
+
+        Args:
+            term_yields: terim -> (sayfa çağrısı, ilk kez bulunan ve filtreden geçen yer sayısı)
+        """
+        if term_yields:
+            self.place_store.record_term_yield({
+                self.term_key(kind, base, term): counts for term, counts in term_yields.items()
+            })
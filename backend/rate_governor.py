@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+# Endpoint başına varsayılan saniyelik istek sınırı (Google proje kotalarının altında kalır)
+DEFAULT_ENDPOINT_QPS = {
+    'places': 10.0,
+    'places_nearby': 10.0,
+    'place': 10.0,
+    'geocode': 25.0
+}
+
+
+class QuotaExceededError(Exception):
+    """Günlük Google çağrı kotası doldu"""
+
+
+class TokenBucket:
+    """
+    Saniyelik istek sınırı için token kovası.
+
+    Kova saniyede rate kadar dolar, en fazla burst token tutar. acquire()
+    token'ı kilit altında ayırır (gerekirse kovayı eksiye düşürür) ve beklemeyi
+    kilit dışında yapar; böylece bekleyen iş parçacıkları sırayla ve aralarında
+    boşluk kalmadan, tam sınır hızında geçer.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate: Saniyede izin verilen istek
+            burst: Boşta biriken en fazla token (varsayılan: 1 saniyelik istek, en az 1)
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Bir token ayırır
+
+        Returns:
+            float: Token'ın kullanılabilmesi için beklenmesi gereken süre (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Token alınana kadar bekler"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateGovernor:
+    """
+    Tüm Google Maps çağrıları için ortak hız ve kota denetçisi.
+
+    Her endpoint'in (places, places_nearby, place, geocode) kendi token kovası
+    vardır; aynı scraper'ı kullanan tüm aramalar ve iş parçacıkları aynı
+    kovalardan geçer. Günlük kota tüm endpoint'ler için ortaktır ve gün
+    değişince (yerel tarih) sıfırlanır; süreç içinde tutulur.
+    """
+
+    def __init__(self, endpoint_qps=None, daily_quota=None):
+        """
+        Args:
+            endpoint_qps: endpoint -> saniyelik istek sınırı (verilmeyenler DEFAULT_ENDPOINT_QPS'ten)
+            daily_quota: Günlük en fazla çağrı (None ise sınırsız)
+        """
+        qps = dict(DEFAULT_ENDPOINT_QPS, **(endpoint_qps or {}))
+        self.endpoints = set(qps)
+        self.buckets = {endpoint: TokenBucket(rate) for endpoint, rate in qps.items() if rate}
+        self.daily_quota = daily_quota
+        self._day = date.today()
+        self._calls_today = 0
+        self._lock = threading.Lock()
+
+    @property
+    def calls_today(self):
+        """Bugün yapılan (kotadan düşülen) çağrı sayısı"""
+        with self._lock:
+            self._roll_day()
+            return self._calls_today
+
+    def _roll_day(self):
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._calls_today = 0
+
+    def acquire(self, endpoint):
+        """
+        Çağrı için günlük kotadan düşer ve endpoint'in hız sınırı kadar bekler
+
+        Args:
+            endpoint: gmaps metod adı (sınırı 0/None olan endpoint'ler sadece kotadan düşülür)
+
+        Raises:
+            QuotaExceededError: Günlük kota dolduysa (çağrı yapılmamalı)
+        """
+        with self._lock:
+            self._roll_day()
+            if self.daily_quota is not None and self._calls_today >= self.daily_quota:
+                raise QuotaExceededError(f"Günlük Google çağrı kotası doldu ({self.daily_quota})")
+            self._calls_today += 1
+
+        bucket = self.buckets.get(endpoint)
+        if bucket is not None:
+            bucket.acquire()
+
+
+class GovernedClient:
+    """
+    googlemaps.Client sarmalayıcısı - denetlenen metodlar çağrılmadan önce RateGovernor'dan izin alır
+
+    Diğer öznitelikler olduğu gibi alttaki client'tan okunur.
+    """
+
+    def __init__(self, client, governor):
+        self.client = client
+        self.governor = governor
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name not in self.governor.endpoints or not callable(attr):
+            return attr
+
+        def governed(*args, **kwargs):
+            self.governor.acquire(name)
+            return attr(*args, **kwargs)
+        return governed
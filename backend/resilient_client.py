@@ -0,0 +1,190 @@
+import logging
+import random
+import threading
+import time
+
+from googlemaps.exceptions import ApiError, TransportError, Timeout
+
+logger = logging.getLogger(__name__)
+
+# Geçici sayılan Google durumları - artan ve rastgele dağıtılmış beklemeyle tekrar denenir
+RETRIABLE_STATUSES = ('OVER_QUERY_LIMIT', 'UNKNOWN_ERROR')
+
+# Devre kesiciyi besleyen durumlar (kota/yetki sorunu - tekrar denemek çoğu zaman boşa çağrıdır)
+BREAKER_STATUSES = ('OVER_QUERY_LIMIT', 'OVER_DAILY_LIMIT', 'REQUEST_DENIED')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Devre açık - çağrı Google'a gönderilmeden reddedildi"""
+
+
+def is_retriable(error, kwargs=None):
+    """
+    Hata geçici mi?
+
+    next_page_token henüz hazır değilse Google INVALID_REQUEST döner; bu yüzden
+    page_token'lı çağrılarda INVALID_REQUEST de geçici sayılır.
+    """
+    if isinstance(error, (Timeout, TransportError)):
+        return True
+    if isinstance(error, ApiError):
+        if error.status in RETRIABLE_STATUSES:
+            return True
+        return error.status == 'INVALID_REQUEST' and bool(kwargs and kwargs.get('page_token'))
+    return False
+
+
+class CircuitBreaker:
+    """
+    Art arda kota/yetki hatalarında bir endpoint'e yapılan çağrıları keser.
+
+    failure_threshold kadar art arda hata olunca devre açılır ve reset_timeout
+    boyunca çağrılar hiç gönderilmeden reddedilir. Süre dolunca tek bir deneme
+    çağrısına izin verilir (yarı açık); başarılı olursa devre kapanır, değilse
+    tekrar açılır.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            failure_threshold: Devreyi açan art arda hata sayısı
+            reset_timeout: Devrenin açık kaldığı süre (saniye)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Çağrı yapılabilirse True (yarı açık durumda sadece bir deneme çağrısına izin verir)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self._failures = 0
+
+    def record_inconclusive(self):
+        """Google'a ulaşılamadı (zaman aşımı vb.) - yarı açık deneme sonuçsuz kaldıysa devre tekrar açılır"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def record_failure(self):
+        """
+        Returns:
+            bool: Bu hatayla devre açıldıysa True
+        """
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+class ResilientClient:
+    """
+    googlemaps.Client sarmalayıcısı - geçici hatalarda tekrar dener, art arda kota/yetki
+    hatalarında endpoint'in devresini keser.
+
+    Tekrar denemeler arasında üstel artan, tam rastgele (full jitter) beklenir;
+    böylece aynı anda hata alan iş parçacıkları Google'a hep birlikte geri dönmez.
+    Sayaçlar (metrics) tüm endpoint'ler için ortaktır.
+    """
+
+    def __init__(self, client, endpoints=('places', 'places_nearby', 'place', 'geocode'),
+                 max_retries=3, base_delay=0.5, max_delay=8.0, failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            client: googlemaps.Client (ya da GovernedClient - her deneme hız sınırından geçer)
+            endpoints: Korunan metodlar
+            max_retries: İlk denemeden sonra en fazla tekrar sayısı
+            base_delay: İlk tekrar için en uzun bekleme (saniye), her tekrarda iki katına çıkar
+            max_delay: En uzun bekleme (saniye)
+            failure_threshold: Devreyi açan art arda kota/yetki hatası (bkz. CircuitBreaker)
+            reset_timeout: Devrenin açık kaldığı süre (saniye)
+        """
+        self.client = client
+        self.endpoints = set(endpoints)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breakers = {
+            endpoint: CircuitBreaker(failure_threshold, reset_timeout) for endpoint in self.endpoints
+        }
+        self.metrics = {'retries': 0, 'recovered': 0, 'short_circuits': 0, 'failures': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, metric):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def get_metrics(self):
+        """Sayaçlar ve endpoint devre durumları"""
+        with self._lock:
+            metrics = dict(self.metrics)
+        metrics['circuits'] = {endpoint: breaker.state for endpoint, breaker in self.breakers.items()}
+        return metrics
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name not in self.endpoints or not callable(attr):
+            return attr
+
+        def resilient(*args, **kwargs):
+            return self._call(name, attr, args, kwargs)
+        return resilient
+
+    def _call(self, endpoint, method, args, kwargs):
+        breaker = self.breakers[endpoint]
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self._count('short_circuits')
+                raise CircuitOpenError(f"{endpoint} devresi açık, çağrı gönderilmedi")
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                opened = False
+                if isinstance(e, ApiError) and e.status in BREAKER_STATUSES:
+                    opened = breaker.record_failure()
+                    if opened:
+                        logger.warning(f"{endpoint} devresi açıldı ({e.status}), "
+                                       f"{breaker.reset_timeout:.0f} sn çağrı yapılmayacak")
+                elif isinstance(e, ApiError):
+                    # Google cevap verdi, kota/yetki sorunu yok
+                    breaker.record_success()
+                else:
+                    breaker.record_inconclusive()
+                if opened or attempt >= self.max_retries or not is_retriable(e, kwargs):
+                    self._count('failures')
+                    raise
+                delay = self._backoff(attempt)
+                attempt += 1
+                self._count('retries')
+                logger.info(f"{endpoint} geçici hata ({str(e)}), {attempt}. tekrar {delay:.2f} sn sonra")
+                time.sleep(delay)
+                continue
+
+            breaker.record_success()
+            if attempt:
+                self._count('recovered')
+            return result
@@ -0,0 +1,69 @@
+MAPS_URL_TEMPLATE = "https://www.google.com/maps/place/?q=place_id:{}"
+
+
+class Restaurant:
+    """
+    Arama sonucundaki tek restoran satırı.
+
+    Sadece kullanılan alanlar tutulur (ham Places sonucu tutulmaz); Google Maps
+    URL'i place_id'den türetilir. JSON/sheet satırı (Türkçe başlıklı dict) sadece
+    serileştirme sırasında to_dict ile üretilir.
+    """
+
+    __slots__ = ('name', 'address', 'rating', 'review_count', 'phone', 'place_id', 'date')
+
+    def __init__(self, name, address, rating, review_count, place_id, phone=None, date=None):
+        self.name = name
+        self.address = address
+        self.rating = rating
+        self.review_count = review_count
+        self.place_id = place_id
+        self.phone = phone  # None: Place Details henüz alınmadı (bkz. hydrate_restaurants)
+        self.date = date    # Sadece detay alınamadığında dolar
+
+    @classmethod
+    def from_place(cls, place):
+        """Places API sonucundan restoran satırı"""
+        return cls(
+            place.get('name', ''),
+            place.get('vicinity', ''),
+            place.get('rating', 0),
+            place.get('user_ratings_total', 0),
+            place.get('place_id')
+        )
+
+    @property
+    def maps_url(self):
+        return MAPS_URL_TEMPLATE.format(self.place_id)
+
+    def copy(self):
+        return Restaurant(self.name, self.address, self.rating, self.review_count,
+                          self.place_id, self.phone, self.date)
+
+    def to_dict(self):
+        """API cevabı / sheet satırı"""
+        row = {
+            'İsim': self.name,
+            'Adres': self.address,
+            'Puan': self.rating,
+            'Yorum Sayısı': self.review_count,
+            'Telefon': self.phone,
+            'Google Maps URL': self.maps_url,
+            'place_id': self.place_id
+        }
+        if self.date is not None:
+            row['Tarih'] = self.date
+        return row
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('İsim', ''), data.get('Adres', ''), data.get('Puan', 0), data.get('Yorum Sayısı', 0),
+                   data.get('place_id'), data.get('Telefon'), data.get('Tarih'))
+
+    def __repr__(self):
+        return f"Restaurant({self.name!r}, {self.rating}, {self.place_id})"
+
+
+def serialize_restaurants(restaurants):
+    """Restoran satırlarını JSON/sheet için dict listesine çevirir"""
+    return [restaurant.to_dict() for restaurant in restaurants]
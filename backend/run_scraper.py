@@ -16,7 +16,7 @@ scraper = GoogleSheetsRestaurantScraper(
 def single_search():
     print("\n4.5+ puan filtresine sahip restoranlar aranıyor...")
     result = scraper.run_search_to_sheets("üsküdar", "köfteci", "Uskudar_Kofte_4.5+")
-    print(f"Sonuç: {result}")
+    print(f"Sonuç: {result['message']}")
 
 # Toplu arama örneği ilçe ve restorant türüne göre
 def batch_search():
@@ -33,7 +33,7 @@ def custom_search():
     print(f"Sheet adı: {sheet_name}")
     
     result = scraper.run_search_to_sheets(location, restaurant_type, sheet_name)
-    print(f"\nSonuç: {result}")
+    print(f"\nSonuç: {result['message']}")
 
 # Çoklu özel arama
 def multiple_custom_search():
@@ -0,0 +1,60 @@
+import threading
+import time
+
+
+class SearchBudget:
+    """
+    Tek bir arama isteğinin Google çağrı bütçesi ve süre sınırı.
+
+    Çağrılar gönderilmeden önce bütçeden düşülür (uçuştaki istekler de sayılır),
+    böylece bütçe hiçbir zaman aşılmaz. Sınırlardan birine ulaşılınca (ya da
+    "yeterli sonuç" modunda istenen sayıda uygun sonuç toplanınca) tarama yeni
+    istek göndermez; o ana kadar toplanan sonuçlar kısmi sonuç olarak döner.
+    """
+
+    def __init__(self, max_calls=None, time_limit=None, min_results=None):
+        """
+        Args:
+            max_calls: En fazla Google çağrısı (None ise sınırsız)
+            time_limit: Saniye cinsinden süre sınırı (None ise sınırsız)
+            min_results: Bu kadar uygun (filtreden geçen, puanı tutan) sonuç toplanınca
+                yeni istek gönderilmez (None ise tarama sonuna kadar sürer)
+        """
+        self.max_calls = max_calls
+        self.time_limit = time_limit
+        self.min_results = min_results
+        self.deadline = time.monotonic() + time_limit if time_limit is not None else None
+        self.calls = 0
+        self.partial = False  # Tarama sınırlar yüzünden yarıda kaldıysa True
+        self.resume_token = None  # Kısmi sonuçta taramanın devam anahtarı
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_calls(self):
+        """Kalan çağrı sayısı (sınırsızsa None)"""
+        if self.max_calls is None:
+            return None
+        return max(0, self.max_calls - self.calls)
+
+    def can_spend(self, calls=1):
+        """Süre dolmadıysa ve bütçede yer varsa True"""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return False
+        return self.max_calls is None or self.calls + calls <= self.max_calls
+
+    def spend(self, calls=1):
+        """
+        Bütçeden çağrı düşer
+
+        Returns:
+            bool: Çağrı yapılabilirse True (yapılamıyorsa bütçe değişmez)
+        """
+        with self._lock:
+            if not self.can_spend(calls):
+                return False
+            self.calls += calls
+            return True
+
+    def exhausted(self):
+        """Yeni bir çağrı yapılamıyorsa True"""
+        return not self.can_spend()
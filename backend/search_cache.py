@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+class SearchResultCache:
+    """
+    Normalize arama parametreleri bazlı sonuç önbelleği (stale-while-revalidate).
+
+    - fresh_ttl içindeki kayıtlar doğrudan döner.
+    - fresh_ttl ile stale_ttl arasındaki kayıtlar yine hemen döner, ama arka
+      planda yenilenmeleri gerekir (bkz. begin_refresh / end_refresh).
+    - Sonuçsuz aramalar negative_ttl süresince önbellekte kalır (stale penceresi yok).
+    """
+
+    def __init__(self, fresh_ttl=6 * 3600, stale_ttl=3 * 24 * 3600, negative_ttl=10 * 60, max_entries=500):
+        """
+        Args:
+            fresh_ttl: Kaydın taze sayıldığı süre (saniye)
+            stale_ttl: Kaydın (bayat da olsa) sunulabileceği en uzun süre (saniye)
+            negative_ttl: Sonuçsuz aramaların önbellekte kalma süresi (saniye)
+            max_entries: Bellekte tutulacak en fazla arama
+        """
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (değer, durum) - durum FRESH, STALE ya da kayıt yoksa (None, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None, None
+
+            stored_at, value = entry
+            age = time.time() - stored_at
+            fresh_ttl, stale_ttl = (self.negative_ttl, self.negative_ttl) if not value else (self.fresh_ttl, self.stale_ttl)
+            if age < fresh_ttl:
+                self._entries.move_to_end(key)
+                return value, FRESH
+            if age < stale_ttl:
+                self._entries.move_to_end(key)
+                return value, STALE
+
+            del self._entries[key]
+            return None, None
+
+    def set(self, key, value):
+        """Arama sonucunu önbelleğe yazar"""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def begin_refresh(self, key):
+        """Anahtar için yenileme başlatılabiliyorsa True döner (aynı anda tek yenileme)"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        """Yenileme bittiğinde çağrılır"""
+        with self._lock:
+            self._refreshing.discard(key)
@@ -0,0 +1,52 @@
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla eş zamanlı gelen çağrıları tek bir çalıştırmada birleştirir.
+
+    İlk çağıran işi yapar; iş sürerken aynı anahtarla gelenler aynı
+    Future'ı bekler ve ortak sonucu alır. İş bitince anahtar silinir,
+    sonraki çağrılar yeniden çalıştırır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future
+
+    def do(self, key, fn):
+        """
+        fn'i anahtar başına en fazla bir kez aynı anda çalıştırır
+
+        Args:
+            key: Hashlenebilir istek anahtarı
+            fn: Argümansız çağrılacak fonksiyon
+
+        Returns:
+            tuple: (sonuç, paylaşıldı mı) - bekleyen çağrılar için paylaşıldı=True
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            logger.info(f"Aynı arama zaten sürüyor, sonucu bekleniyor: {key}")
+            return future.result(), True
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,151 @@
+import math
+from bisect import bisect_left, insort
+
+from coverage_planner import METRES_PER_LAT_DEGREE
+
+# Boyut başına geohash biti (26 bit ~ 0.3 m çözünürlük)
+GEOHASH_BITS = 26
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def _spread_bits(value):
+    """26 bitlik sayının bitlerini araya birer boş bit koyarak yayar (Morton kodu için)"""
+    result = 0
+    for bit in range(GEOHASH_BITS):
+        result |= ((value >> bit) & 1) << (2 * bit)
+    return result
+
+
+def _cell_coords(lat, lng, bits=GEOHASH_BITS):
+    """Koordinatın verilen çözünürlükteki (enlem, boylam) hücre indeksleri"""
+    scale = 1 << bits
+    y = min(scale - 1, max(0, int((lat + 90.0) / 180.0 * scale)))
+    x = min(scale - 1, max(0, int((lng + 180.0) / 360.0 * scale)))
+    return y, x
+
+
+def geohash_key(lat, lng):
+    """
+    Koordinatın tamsayı geohash'i (Morton / Z-order kodu)
+
+    Enlem ve boylam bitleri iç içe geçirilir; aynı önekle başlayan anahtarlar aynı
+    kare hücrededir, bu yüzden sıralı listede bir hücre tek bir aralık olur.
+    """
+    y, x = _cell_coords(lat, lng)
+    return (_spread_bits(y) << 1) | _spread_bits(x)
+
+
+def distance_m(lat1, lng1, lat2, lng2):
+    """İki nokta arası büyük daire mesafesi (metre)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeohashIndex:
+    """
+    Geohash'e göre sıralı yer indeksi.
+
+    Bölge ve yarıçap sorguları, sorgu alanını kapsayan en fazla 4 geohash
+    hücresine çevrilir; her hücre sıralı listede bisect ile bulunan bir aralıktır.
+    Sorgu maliyeti O(log n + aday sayısı) olur.
+    """
+
+    def __init__(self):
+        self._keys = []    # sıralı (geohash, id) listesi
+        self._items = {}   # id -> (geohash, lat, lng, değer)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def add(self, item_id, lat, lng, value=None):
+        """Kaydı ekler; aynı id varsa konumu güncellenir"""
+        if lat is None or lng is None:
+            return
+        self.remove(item_id)
+        key = geohash_key(lat, lng)
+        insort(self._keys, (key, item_id))
+        self._items[item_id] = (key, lat, lng, item_id if value is None else value)
+
+    def remove(self, item_id):
+        entry = self._items.pop(item_id, None)
+        if entry is None:
+            return
+        position = bisect_left(self._keys, (entry[0], item_id))
+        del self._keys[position]
+
+    def in_bounds(self, bounds):
+        """
+        Sınırlar içindeki kayıtları döner
+
+        Args:
+            bounds: {'north', 'south', 'east', 'west'} sınırları
+
+        Returns:
+            list: Kayıt değerleri (geohash sırasıyla)
+        """
+        south, north, west, east = bounds['south'], bounds['north'], bounds['west'], bounds['east']
+        results = []
+        for low, high in self._cover_ranges(south, north, west, east):
+            start = bisect_left(self._keys, (low,))
+            end = bisect_left(self._keys, (high,))
+            for _, item_id in self._keys[start:end]:
+                _, lat, lng, value = self._items[item_id]
+                if south <= lat <= north and west <= lng <= east:
+                    results.append(value)
+        return results
+
+    def within_radius(self, lat, lng, radius):
+        """
+        Noktaya radius metre mesafedeki kayıtları yakından uzağa döner
+
+        Returns:
+            list: (mesafe, değer) listesi
+        """
+        d_lat = radius / METRES_PER_LAT_DEGREE
+        d_lng = radius / (METRES_PER_LAT_DEGREE * max(0.01, math.cos(math.radians(lat))))
+        bounds = {'south': lat - d_lat, 'north': lat + d_lat, 'west': lng - d_lng, 'east': lng + d_lng}
+
+        results = []
+        for low, high in self._cover_ranges(bounds['south'], bounds['north'], bounds['west'], bounds['east']):
+            start = bisect_left(self._keys, (low,))
+            end = bisect_left(self._keys, (high,))
+            for _, item_id in self._keys[start:end]:
+                _, item_lat, item_lng, value = self._items[item_id]
+                distance = distance_m(lat, lng, item_lat, item_lng)
+                if distance <= radius:
+                    results.append((distance, value))
+        results.sort(key=lambda result: result[0])
+        return results
+
+    def _cover_ranges(self, south, north, west, east):
+        """Alanı kapsayan geohash hücrelerinin [başlangıç, bitiş) anahtar aralıkları"""
+        lat_span = max(north - south, 1e-9)
+        lng_span = max(east - west, 1e-9)
+        # Hücre en az alan kadar büyük olsun - alan en fazla 2x2 hücreye düşer
+        bits = int(min(math.log2(180.0 / lat_span), math.log2(360.0 / lng_span)))
+        bits = max(0, min(GEOHASH_BITS, bits))
+
+        y0, x0 = _cell_coords(south, west, bits)
+        y1, x1 = _cell_coords(north, east, bits)
+        shift = 2 * (GEOHASH_BITS - bits)
+        prefixes = sorted(
+            (_spread_bits(y) << 1) | _spread_bits(x)
+            for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)
+        )
+
+        # Ardışık hücreler tek aralıkta birleştirilir
+        ranges = []
+        for prefix in prefixes:
+            low, high = prefix << shift, (prefix + 1) << shift
+            if ranges and ranges[-1][1] == low:
+                ranges[-1] = (ranges[-1][0], high)
+            else:
+                ranges.append((low, high))
+        return ranges
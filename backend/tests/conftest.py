@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+
+# Modüller backend/ altında düz import ediliyor (bkz. flask_app.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """time modülünün yerine geçen, elle ilerletilen saat (sleep beklemez, saati ilerletir)"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_scraper(tmp_path, monkeypatch):
+    """
+    Google yerine FakeGoogleMaps kullanan, tüm depoları geçici dizinde olan scraper kurar
+
+    next_page_token beklemesi kapatılır; client yine hız denetçisi ve devre kesiciden geçer.
+    """
+    import google_sheets_scraper
+    from crawl_checkpoint import CrawlCheckpoint
+    from details_cache import PlaceDetailsCache
+    from fake_gmaps import FakeGoogleMaps
+    from page_scheduler import PageTokenScheduler
+    from place_store import PlaceStore
+    from rate_governor import DEFAULT_ENDPOINT_QPS, GovernedClient, RateGovernor
+    from resilient_client import ResilientClient
+
+    monkeypatch.setattr(google_sheets_scraper, 'PageTokenScheduler',
+                        lambda **kwargs: PageTokenScheduler(token_delay=0, **kwargs))
+
+    def make(fake=None, **kwargs):
+        fake = fake if fake is not None else FakeGoogleMaps()
+        # Her scraper kendi dizininde - depoları paylaşmaz
+        directory = tmp_path / f"scraper{len(list(tmp_path.iterdir()))}"
+        directory.mkdir()
+        kwargs.setdefault('details_cache', PlaceDetailsCache(db_path=str(directory / 'details.db')))
+        kwargs.setdefault('crawl_checkpoint', CrawlCheckpoint(str(directory / 'crawl.db')))
+        kwargs.setdefault('place_store', PlaceStore(str(directory / 'places.db')))
+        kwargs.setdefault('rate_governor', RateGovernor({endpoint: 1000 for endpoint in DEFAULT_ENDPOINT_QPS}))
+        scraper = google_sheets_scraper.GoogleSheetsRestaurantScraper('AIza' + 'x' * 35, **kwargs)
+        scraper.gmaps = ResilientClient(GovernedClient(fake, scraper.rate_governor))
+        return scraper, fake
+
+    return make
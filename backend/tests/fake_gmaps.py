@@ -0,0 +1,91 @@
+import hashlib
+import random
+import threading
+import time
+
+from query_planner import canonical_term
+
+DISTRICTS = ['Kadıköy', 'Beşiktaş', 'Şişli', 'Fatih', 'Üsküdar', 'Maltepe']
+NAMES = ['Ali', 'Veli', 'Hacı', 'Usta']
+WORDS = ['Köfteci', 'Kebapçı', 'Restoran', 'Lokanta', 'Cafe', 'Ev Yemekleri', 'Pide Salonu', 'Dönerci']
+
+
+def _rng(seed):
+    """Aynı tohum için her çalıştırmada aynı diziyi üreten Random"""
+    return random.Random(int(hashlib.md5(seed.encode()).hexdigest(), 16))
+
+
+def make_place(number):
+    """Numarası verilen sahte yeri üretir (aynı numara hep aynı yer)"""
+    rng = _rng(f"place{number}")
+    district = rng.choice(DISTRICTS)
+    return {
+        'place_id': f"p{number}",
+        'name': f"{rng.choice(NAMES)} {rng.choice(WORDS)}",
+        'formatted_address': f"Sok. No:{rng.randint(1, 99)}, {district}/İstanbul",
+        'vicinity': f"Sok. No:{rng.randint(1, 99)}, {district}",
+        'rating': round(rng.uniform(3.5, 5.0), 1),
+        'user_ratings_total': rng.randint(0, 500),
+        'geometry': {'location': {'lat': 40.9 + rng.random() * 0.3, 'lng': 28.9 + rng.random() * 0.3}},
+        'photos': [{'photo_reference': 'x' * 100}],
+    }
+
+
+class FakeGoogleMaps:
+    """
+    googlemaps.Client yerine geçen, ağa çıkmayan deterministik client
+
+    Her sorgu (metin, konum, yarıçap, anahtar kelime) sabit bir yer havuzundan
+    hep aynı 1-3 sayfalık sonucu döner; yapılan çağrılar calls'ta tutulur.
+    """
+
+    def __init__(self, pool=400, delay=0.0, canonical_queries=False):
+        """
+        Args:
+            pool: Sonuçların seçildiği yer sayısı
+            delay: Her çağrıda beklenen süre (saniye) - eş zamanlılık testleri için
+            canonical_queries: True ise yazımı farklı ama normalize edilince aynı olan metin
+                sorguları ('kebapçı' / 'kebapci') Google'daki gibi aynı sonucu döner
+        """
+        self.pool = pool
+        self.delay = delay
+        self.canonical_queries = canonical_queries
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+        if self.delay:
+            time.sleep(self.delay)
+
+    def count(self, method):
+        """Bir endpoint'e yapılan çağrı sayısı"""
+        with self._lock:
+            return sum(1 for call in self.calls if call[0] == method)
+
+    def _page(self, seed, page_token):
+        page = int(page_token.split(':')[-1]) if page_token else 0
+        n_pages = _rng(seed).randint(1, 3)
+        rng = _rng(f"{seed}{page}")
+        response = {'results': [make_place(rng.randint(0, self.pool)) for _ in range(20)], 'status': 'OK'}
+        if page + 1 < n_pages:
+            response['next_page_token'] = f"{seed}:{page + 1}"
+        return response
+
+    def places(self, query=None, type=None, language=None, page_token=None, **kwargs):
+        self._record('places', query, page_token)
+        seed = canonical_term(query) if self.canonical_queries else query
+        return self._page(f"T{seed}", page_token)
+
+    def places_nearby(self, location=None, radius=None, keyword=None, type=None, page_token=None, **kwargs):
+        self._record('places_nearby', str(location), radius, keyword, page_token)
+        return self._page(f"N{location}{radius}{keyword}", page_token)
+
+    def place(self, place_id, language=None, **kwargs):
+        self._record('place', place_id)
+        return {'result': {'formatted_phone_number': f"0216 {place_id}", 'rating': 4.6}}
+
+    def geocode(self, address, **kwargs):
+        self._record('geocode', address)
+        return [{'geometry': {'location': {'lat': 40.99, 'lng': 29.03}}}]
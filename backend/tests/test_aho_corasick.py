@@ -0,0 +1,38 @@
+from aho_corasick import AhoCorasick
+
+
+def test_scan_finds_all_labels_in_one_pass():
+    matcher = AhoCorasick([('kadikoy', 'district'), ('kofte', 'type'), ('istanbul', 'city')])
+    assert matcher.scan('moda, kadikoy/istanbul') == {'district', 'city'}
+    assert matcher.scan('besiktas') == frozenset()
+
+
+def test_overlapping_and_nested_patterns():
+    matcher = AhoCorasick([('he', 'he'), ('she', 'she'), ('his', 'his'), ('hers', 'hers')])
+    assert matcher.scan('ushers') == {'he', 'she', 'hers'}
+    assert matcher.scan('ahishers') == {'he', 'she', 'his', 'hers'}
+
+
+def test_failure_links_recover_partial_matches():
+    # 'kof' ile başlayan yanlış yol 'kofte' eşleşmesini kaçırmamalı
+    matcher = AhoCorasick([('koftex', 'long'), ('ofte', 'short')])
+    assert matcher.scan('koftey') == {'short'}
+
+
+def test_same_pattern_with_multiple_labels():
+    matcher = AhoCorasick([('evi', 'general'), ('evi', 'type')])
+    assert matcher.scan('köfte evi') == {'general', 'type'}
+
+
+def test_empty_pattern_always_matches():
+    matcher = AhoCorasick([('', 'always'), ('abc', 'abc')])
+    assert matcher.scan('') == {'always'}
+    assert matcher.scan('xabcx') == {'always', 'abc'}
+
+
+def test_matches_naive_substring_search():
+    patterns = [('ab', 'ab'), ('bc', 'bc'), ('abc', 'abc'), ('cab', 'cab'), ('b', 'b'), ('ca', 'ca')]
+    matcher = AhoCorasick(patterns)
+    for text in ('abcab', 'cccc', 'babc', 'acbca', 'cabcab', ''):
+        expected = {label for pattern, label in patterns if pattern in text}
+        assert matcher.scan(text) == expected, text
@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from coverage_planner import METRES_PER_LAT_DEGREE, CoverageCell, is_saturated, tile_bounds
+
+BOUNDS = {'north': 41.02, 'south': 40.96, 'east': 29.10, 'west': 29.00}
+
+
+def corner_distance(cell):
+    """Hücre merkezinden köşesine metre cinsinden uzaklık"""
+    return math.hypot(cell.half_lat * METRES_PER_LAT_DEGREE,
+                      cell.half_lng * METRES_PER_LAT_DEGREE * math.cos(math.radians(cell.lat)))
+
+
+def test_tile_bounds_covers_bounds_without_gaps():
+    cells = tile_bounds(BOUNDS, 1000)
+    assert len(cells) > 1
+    assert min(cell.lat - cell.half_lat for cell in cells) == pytest.approx(BOUNDS['south'])
+    assert max(cell.lat + cell.half_lat for cell in cells) == pytest.approx(BOUNDS['north'])
+    assert min(cell.lng - cell.half_lng for cell in cells) == pytest.approx(BOUNDS['west'])
+    assert max(cell.lng + cell.half_lng for cell in cells) == pytest.approx(BOUNDS['east'])
+    # Toplam alan sınırların alanına eşit - hücreler üst üste binmez ve boşluk bırakmaz
+    area = sum(4 * cell.half_lat * cell.half_lng for cell in cells)
+    assert area == pytest.approx((BOUNDS['north'] - BOUNDS['south']) * (BOUNDS['east'] - BOUNDS['west']))
+
+
+def test_tile_bounds_radius_reaches_cell_corners():
+    for cell in tile_bounds(BOUNDS, 1000):
+        assert cell.radius <= 1000
+        assert cell.radius >= corner_distance(cell) * 0.99
+
+
+def test_tile_bounds_small_area_is_single_cell():
+    cells = tile_bounds({'north': 41.0001, 'south': 41.0, 'east': 29.0001, 'west': 29.0}, 5000)
+    assert len(cells) == 1
+
+
+def test_split_halves_cell_and_radius():
+    cell = CoverageCell(41.0, 29.0, 0.02, 0.03, 3000)
+    children = cell.split()
+    assert len(children) == 4
+    assert {(child.lat, child.lng) for child in children} == {
+        (40.99, 28.985), (40.99, 29.015), (41.01, 28.985), (41.01, 29.015)}
+    for child in children:
+        assert child.half_lat == cell.half_lat / 2
+        assert child.half_lng == cell.half_lng / 2
+        assert child.radius == 1500
+        assert child.depth == 1
+
+
+def test_cell_dict_round_trip():
+    cell = CoverageCell(41.0, 29.0, 0.02, 0.03, 3000, depth=2)
+    copy = CoverageCell.from_dict(cell.to_dict())
+    assert copy.to_dict() == cell.to_dict()
+    assert copy.center == {'lat': 41.0, 'lng': 29.0}
+
+
+def test_is_saturated_only_when_last_page_is_full():
+    full = [{}] * 20
+    assert is_saturated([full, full, full])
+    assert not is_saturated([full, full, [{}] * 19])
+    assert not is_saturated([full, full])
+    assert not is_saturated([])
@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+import crawl_checkpoint
+from crawl_checkpoint import PAGE_TOKEN_MAX_AGE, CheckpointProgress, CrawlCheckpoint, make_crawl_id
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(crawl_checkpoint, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return CrawlCheckpoint(str(tmp_path / 'crawl.db'), max_age=3600)
+
+
+def place(place_id):
+    return {'place_id': place_id, 'name': place_id, 'rating': 4.5, 'photos': [{'big': 'x'}],
+            'geometry': {'location': {'lat': 41.0, 'lng': 29.0}}}
+
+
+def test_make_crawl_id_is_stable():
+    assert make_crawl_id(('a', 1)) == make_crawl_id(('a', 1))
+    assert make_crawl_id(('a', 1)) != make_crawl_id(('a', 2))
+
+
+def test_load_unknown_crawl_returns_none(checkpoint):
+    assert checkpoint.load('missing') is None
+
+
+def test_load_returns_jobs_tokens_and_slim_places(checkpoint):
+    job_ids = checkpoint.add_jobs('c', [{'q': 'a'}, {'q': 'b'}])
+    checkpoint.record_page('c', job_ids[0], [place('p1'), place('p2')], 'token-1')
+    checkpoint.record_page('c', job_ids[1], [place('p2'), place('p3')], None)
+    checkpoint.finish_job('c', job_ids[1])
+
+    state = checkpoint.load('c')
+    assert state['jobs'] == [(0, {'q': 'a'}, 'token-1', 1, False), (1, {'q': 'b'}, None, 1, True)]
+    # Tekrar eden yer bir kez, fotoğraf gibi alanlar olmadan saklanır
+    assert [p['place_id'] for p in state['places']] == ['p1', 'p2', 'p3']
+    assert 'photos' not in state['places'][0]
+
+
+def test_expired_page_token_restarts_query(checkpoint, clock):
+    job_id = checkpoint.add_jobs('c', [{'q': 'a'}])[0]
+    checkpoint.record_page('c', job_id, [place('p1')], 'token-1')
+    clock.advance(PAGE_TOKEN_MAX_AGE + 1)
+    assert checkpoint.load('c')['jobs'] == [(0, {'q': 'a'}, None, 0, False)]
+
+
+def test_expired_crawl_is_deleted(checkpoint, clock):
+    checkpoint.add_jobs('old', [{'q': 'a'}])
+    clock.advance(1800)
+    job_id = checkpoint.add_jobs('recent', [{'q': 'b'}])[0]
+    clock.advance(1800)
+    # 'recent' yarım saat önce ilerledi, 'old' bir saatten uzun süredir ilerlemiyor
+    checkpoint.record_page('recent', job_id, [place('p1')], 'token')
+    clock.advance(1)
+
+    assert checkpoint.load('old') is None
+    assert checkpoint.load('recent') is not None
+    # Silindi - yeni eklenen işler 0'dan başlar
+    assert checkpoint.add_jobs('old', [{'q': 'a'}]) == [0]
+
+
+def test_expired_crawls_are_purged_on_open(tmp_path, clock):
+    path = str(tmp_path / 'crawl.db')
+    CrawlCheckpoint(path, max_age=3600).add_jobs('old', [{'q': 'a'}])
+    clock.advance(3601)
+    reopened = CrawlCheckpoint(path, max_age=3600)
+    assert reopened._conn.execute("SELECT COUNT(*) FROM crawl_jobs").fetchone()[0] == 0
+
+
+def test_clear_removes_jobs_and_places(checkpoint):
+    job_id = checkpoint.add_jobs('c', [{'q': 'a'}])[0]
+    checkpoint.record_page('c', job_id, [place('p1')], None)
+    checkpoint.clear('c')
+    assert checkpoint.load('c') is None
+
+
+def test_checkpoint_progress_maps_scheduler_indices(checkpoint):
+    job_ids = checkpoint.add_jobs('c', [{'q': 'a'}])
+    progress = CheckpointProgress(checkpoint, 'c', job_ids, lambda job: {'q': job})
+    progress.jobs_added([1], ['child'])
+    progress.page_fetched(1, 'child', [place('p1')], None)
+    progress.job_finished(1, 'child')
+    assert checkpoint.load('c')['jobs'] == [(0, {'q': 'a'}, None, 0, False), (1, {'q': 'child'}, None, 1, True)]
+
+
+def test_exclusive_serializes_runs_of_the_same_crawl(checkpoint):
+    order = []
+    entered = threading.Event()
+
+    def second():
+        with checkpoint.exclusive('c'):
+            order.append('second')
+
+    with checkpoint.exclusive('c'):
+        thread = threading.Thread(target=second)
+        thread.start()
+        # Farklı tarama beklemez
+        with checkpoint.exclusive('other'):
+            entered.set()
+        thread.join(0.05)
+        order.append('first')
+    thread.join()
+
+    assert entered.is_set()
+    assert order == ['first', 'second']
+    assert checkpoint._crawl_locks == {}
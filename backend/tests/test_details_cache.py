@@ -0,0 +1,56 @@
+import pytest
+
+import details_cache
+from details_cache import PlaceDetailsCache
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(details_cache, 'time', clock)
+    return clock
+
+
+def test_stores_only_used_fields():
+    cache = PlaceDetailsCache(db_path=None)
+    cache.set('p1', {'formatted_phone_number': '0216', 'rating': 4.5, 'reviews': ['long']})
+    assert cache.get('p1') == {'formatted_phone_number': '0216', 'rating': 4.5}
+
+
+def test_memory_layer_evicts_least_recently_used():
+    cache = PlaceDetailsCache(db_path=None, max_entries=2)
+    cache.set('a', {'rating': 1})
+    cache.set('b', {'rating': 2})
+    cache.get('a')
+    cache.set('c', {'rating': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'rating': 1}
+    assert cache.get('c') == {'rating': 3}
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = PlaceDetailsCache(ttl=60, db_path=str(tmp_path / 'details.db'))
+    cache.set('p1', {'rating': 4.0})
+    clock.advance(59)
+    assert cache.get('p1') == {'rating': 4.0}
+    clock.advance(2)
+    assert cache.get('p1') is None
+
+
+def test_disk_layer_survives_restart_and_memory_eviction(tmp_path):
+    path = str(tmp_path / 'details.db')
+    cache = PlaceDetailsCache(db_path=path, max_entries=1)
+    cache.set('a', {'rating': 1})
+    cache.set('b', {'rating': 2})
+    # 'a' bellekten atıldı ama diskten okunur
+    assert cache.get('a') == {'rating': 1}
+    assert PlaceDetailsCache(db_path=path).get('b') == {'rating': 2}
+
+
+def test_disk_layer_is_pruned_to_size_limit(tmp_path, clock):
+    cache = PlaceDetailsCache(db_path=str(tmp_path / 'details.db'), max_entries=1, max_disk_entries=10)
+    for i in range(100):
+        cache.set(f"p{i}", {'rating': i})
+        clock.advance(1)
+    assert cache._conn.execute("SELECT COUNT(*) FROM place_details").fetchone()[0] == 10
+    assert cache.get('p99') == {'rating': 99}
+    assert cache.get('p0') is None
@@ -0,0 +1,91 @@
+import json
+
+from district_polygons import BUNDLED_DISTRICTS, DistrictClassifier, load_district_polygons, normalize_name
+
+
+def square(west, south, size):
+    return [[west, south], [west + size, south], [west + size, south + size], [west, south + size]]
+
+
+def classifier():
+    return DistrictClassifier([
+        ('İstanbul', 'Kadıköy', [square(29.0, 40.9, 0.1)]),
+        # Delikli poligon: ortadaki kare Beşiktaş'a ait değil
+        ('İstanbul', 'Beşiktaş', [square(29.2, 40.9, 0.3), square(29.3, 41.0, 0.1)]),
+        # Kadıköy ile çakışan kenar şeridi
+        ('İstanbul', 'Üsküdar', [square(29.08, 40.9, 0.1)]),
+        ('Ankara', 'Çankaya', [square(29.0, 40.9, 0.05)]),
+    ])
+
+
+def test_normalize_name():
+    assert normalize_name(' KADIKÖY ') == 'kadikoy'
+    assert normalize_name('İstanbul') == 'istanbul'
+
+
+def test_classify_points_with_holes_overlaps_and_city_filter():
+    districts = classifier().classify(
+        [40.95, 41.05, 41.15, 40.95, 40.5],
+        [29.03, 29.35, 29.25, 29.09, 29.0],
+        'İstanbul'
+    )
+    # İçeride, delikte, delik dışında, iki ilçenin çakıştığı yerde (belirsiz), hiçbir poligonda değil
+    assert districts == ['kadikoy', None, 'besiktas', None, None]
+
+
+def test_city_filter_excludes_other_cities():
+    shared = ([40.92], [29.02])
+    assert classifier().classify(*shared, city='Ankara') == ['cankaya']
+    assert classifier().classify(*shared, city='İzmir') == [None]
+
+
+def test_classify_places_skips_places_without_coordinates():
+    places = [
+        {'place_id': 'a', 'geometry': {'location': {'lat': 40.95, 'lng': 29.03}}},
+        {'place_id': 'b', 'geometry': {}},
+        {'place_id': 'c', 'geometry': {'location': {'lat': 40.0, 'lng': 20.0}}},
+    ]
+    assert classifier().classify_places(places, 'İstanbul') == {'a': 'kadikoy'}
+
+
+def test_has_district_and_districts():
+    polygons = classifier()
+    assert polygons.has_district('istanbul', 'KADIKÖY')
+    assert not polygons.has_district('İstanbul', 'Ataşehir')
+    assert polygons.districts('İstanbul') == ['Kadıköy', 'Beşiktaş', 'Üsküdar']
+
+
+def test_load_multipolygon_file(tmp_path):
+    path = tmp_path / 'polygons.geojson'
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': [
+        {'properties': {'city': 'İstanbul', 'district': 'Adalar'},
+         'geometry': {'type': 'MultiPolygon', 'coordinates': [[square(29.0, 40.8, 0.05)], [square(29.1, 40.8, 0.05)]]}},
+        {'properties': {'city': 'İstanbul'}, 'geometry': {'type': 'Polygon', 'coordinates': [square(0, 0, 1)]}},
+    ]}), encoding='utf-8')
+    polygons = load_district_polygons(str(path))
+    assert len(polygons) == 1
+    assert polygons.classify([40.82, 40.82, 40.82], [29.02, 29.12, 29.07]) == ['adalar', 'adalar', None]
+
+
+def test_missing_file_gives_empty_classifier(tmp_path):
+    polygons = load_district_polygons(str(tmp_path / 'missing.geojson'))
+    assert len(polygons) == 0
+    assert polygons.classify([41.0], [29.0]) == [None]
+
+
+def test_bundled_file_covers_only_the_documented_districts():
+    assert sorted(load_district_polygons().districts('İstanbul')) == sorted(BUNDLED_DISTRICTS)
+
+
+def test_scraper_skips_polygons_for_districts_without_one(make_scraper, monkeypatch):
+    scraper, _ = make_scraper()
+    cities = []
+    classify = scraper.district_classifier.classify
+    monkeypatch.setattr(scraper.district_classifier, 'classify',
+                        lambda lats, lngs, city=None: cities.append(city) or classify(lats, lngs, city))
+
+    scraper.search_restaurants('Ataşehir, İstanbul', 'köfte', fetch_details=False)
+    assert cities == []
+
+    scraper.search_restaurants('Kadıköy, İstanbul', 'köfte', fetch_details=False)
+    assert cities and set(cities) == {'İstanbul'}
@@ -0,0 +1,205 @@
+import os
+
+import pytest
+
+from restaurant import Restaurant
+from result_snapshots import MemorySnapshotStore, SQLiteSnapshotStore
+
+
+@pytest.fixture(scope='module')
+def flask_module(tmp_path_factory):
+    """flask_app'i geçici dosya yollarıyla bir kez import eder (modül import sırasında scraper kurar)"""
+    tmp = tmp_path_factory.mktemp('flask')
+    env = {
+        'MAPS_API_KEY': 'AIza' + 'x' * 35,
+        'PLACE_STORE_PATH': str(tmp / 'places.db'),
+        'DETAILS_CACHE_PATH': str(tmp / 'details.db'),
+        'SEARCH_MAX_CALLS': '',
+        'SEARCH_TIME_LIMIT': '',
+        'FULL_SCAN_MAX_CALLS': '500'
+    }
+    saved = {key: os.environ.get(key) for key in env}
+    cwd = os.getcwd()
+    os.environ.update(env)
+    os.chdir(tmp)  # Varsayılan yollu SQLite dosyaları (crawl checkpoint) geçici dizine düşer
+    try:
+        import flask_app
+    finally:
+        os.chdir(cwd)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return flask_app
+
+
+class FakeScraper:
+    """Google'a gitmeden sabit sayıda sonuç dönen scraper"""
+
+    def __init__(self, count):
+        self.rows = [Restaurant(f"Köfteci {i}", 'Kadıköy', 5.0 - i / 1000, 100, f"p{i}") for i in range(count)]
+        self.calls = []
+
+    def search_restaurants(self, location, restaurant_type, **kwargs):
+        self.calls.append(('search', kwargs))
+        return [row.copy() for row in self.rows]
+
+    def search_with_budget(self, location, restaurant_type, **kwargs):
+        self.calls.append(('budget', kwargs))
+        return {'restaurants': [row.copy() for row in self.rows], 'partial': False, 'resume_token': None,
+                'api_calls': 1}
+
+    def refresh_search(self, location, restaurant_type, **kwargs):
+        self.calls.append(('refresh', kwargs))
+        return {'restaurants': [row.copy() for row in self.rows], 'report': {'api_calls': 3, 'rescanned': False}}
+
+    def hydrate_restaurants(self, restaurants):
+        for restaurant in restaurants:
+            restaurant.phone = '0216'
+        return restaurants
+
+
+@pytest.fixture
+def app(flask_module, monkeypatch):
+    def install(count):
+        scraper = FakeScraper(count)
+        monkeypatch.setattr(flask_module, 'scraper', scraper)
+        monkeypatch.setattr(flask_module, 'snapshot_store', MemorySnapshotStore())
+        return flask_module.app.test_client(), scraper
+    return install
+
+
+def search(client, **body):
+    request = {'city': 'İstanbul', 'district': 'Kadıköy', 'foodType': 'köfte'}
+    request.update(body)
+    return client.post('/api/search', json=request)
+
+
+def test_fetch_all_returns_500_rows_and_pages_the_rest(app):
+    client, _ = app(650)
+    first = search(client, perPage=500, fullScan=True).get_json()
+    assert first['count'] == 500
+    assert first['totalCount'] == 650
+    assert first['hasMore'] is True
+
+    rest = search(client, perPage=500, fullScan=True, page=2, cursor=first['nextCursor']).get_json()
+    assert rest['count'] == 150
+    assert rest['hasMore'] is False
+    names = [row['İsim'] for row in first['data'] + rest['data']]
+    assert len(set(names)) == 650
+
+
+@pytest.mark.parametrize('body, message', [
+    ({'perPage': 0}, 'perPage'),
+    ({'page': -1}, 'page'),
+    ({'page': 'abc'}, 'page'),
+    ({'perPage': True}, 'perPage'),
+    ({'maxCalls': 'abc'}, 'maxCalls'),
+    ({'timeLimit': 0}, 'timeLimit'),
+    ({'maxCalls': 1e400}, 'maxCalls'),
+])
+def test_invalid_numeric_params_return_400(app, body, message):
+    client, scraper = app(5)
+    response = search(client, **body)
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+    assert scraper.calls == []
+
+
+def test_limits_are_clamped(app, flask_module):
+    client, scraper = app(5)
+    response = search(client, perPage=10000, maxCalls=10 ** 6, timeLimit=10 ** 6)
+    assert response.get_json()['perPage'] == flask_module.MAX_PER_PAGE
+    kind, kwargs = scraper.calls[-1]
+    assert kind == 'budget'
+    assert kwargs['max_calls'] == flask_module.MAX_SEARCH_CALLS
+    assert kwargs['time_limit'] == flask_module.MAX_SEARCH_TIME_LIMIT
+
+
+def test_cursor_pages_come_from_sqlite_snapshot(app, flask_module, monkeypatch, tmp_path):
+    client, scraper = app(30)
+    monkeypatch.setattr(flask_module, 'snapshot_store', SQLiteSnapshotStore(
+        str(tmp_path / 'snapshots.db'), encode_row=Restaurant.to_dict, decode_row=Restaurant.from_dict))
+    first = search(client, perPage=20).get_json()
+    second = search(client, perPage=20, page=2, cursor=first['nextCursor']).get_json()
+
+    # İkinci sayfa aramayı tekrarlamaz, Restaurant satırları snapshot'tan geri okunur
+    assert len(scraper.calls) == 1
+    assert second['count'] == 10
+    assert all(row['Telefon'] == '0216' for row in second['data'])
+    assert [row['place_id'] for row in first['data'] + second['data']] == [f"p{i}" for i in range(30)]
+
+
+def test_refresh_endpoint_returns_report(app, flask_module):
+    client, scraper = app(7)
+    response = client.post('/api/refresh', json={'city': 'İstanbul', 'district': 'Kadıköy', 'foodType': 'köfte',
+                                                 'maxAge': 3600})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['count'] == 7
+    assert body['report'] == {'api_calls': 3, 'rescanned': False}
+    kind, kwargs = scraper.calls[-1]
+    assert kind == 'refresh'
+    assert kwargs['max_age'] == 3600
+    assert kwargs['scope_max_age'] is None
+    # Sayfalı aramanın önbellek anahtarıyla aynı kalsın diye detaysız yenilenir
+    assert kwargs['fetch_details'] is False
+
+
+@pytest.mark.parametrize('body', [{'maxAge': 0}, {'scopeMaxAge': 'abc'}, {'city': None}])
+def test_refresh_endpoint_rejects_bad_input(app, body):
+    client, scraper = app(1)
+    request = {'city': 'İstanbul', 'district': 'Kadıköy'}
+    request.update(body)
+    response = client.post('/api/refresh', json=request)
+    assert response.status_code == 400
+    assert scraper.calls == []
+
+
+def test_full_scan_gets_default_call_budget(app, flask_module):
+    client, scraper = app(5)
+    search(client, fullScan=True)
+    kind, kwargs = scraper.calls[-1]
+    assert kind == 'budget'
+    assert kwargs['max_calls'] == flask_module.config['full_scan_max_calls'] == 500
+    assert kwargs['full_scan'] is True
+
+    search(client, fullScan=True, maxCalls=50)
+    assert scraper.calls[-1][1]['max_calls'] == 50
+
+    # Normal arama varsayılan olarak sınırsız kalır
+    search(client)
+    assert scraper.calls[-1][0] == 'search'
+
+
+class PartialScraper(FakeScraper):
+    """İlk aramada ilk 25 sonuçla kısmi kalan, devam token'ıyla tamamlanan scraper"""
+
+    def search_with_budget(self, location, restaurant_type, **kwargs):
+        self.calls.append(('budget', kwargs))
+        if kwargs.get('resume_token') == 'token':
+            return {'restaurants': [row.copy() for row in self.rows], 'partial': False, 'resume_token': None,
+                    'api_calls': 5}
+        return {'restaurants': [row.copy() for row in self.rows[:25]], 'partial': True, 'resume_token': 'token',
+                'api_calls': 1}
+
+
+def test_enough_results_page_then_cursor_then_resume(app, flask_module, monkeypatch):
+    client, _ = app(0)
+    scraper = PartialScraper(60)
+    monkeypatch.setattr(flask_module, 'scraper', scraper)
+
+    # Frontend akışı: ilk sayfa enoughResults ile, sonra snapshot'tan cursor sayfası,
+    # snapshot bitince resumeToken ile gösterilenler + bir sayfa
+    first = search(client, perPage=20, enoughResults=True).get_json()
+    assert scraper.calls[-1][1]['min_results'] == 20
+    assert (first['count'], first['partial'], first['resumeToken'], first['hasMore']) == (20, True, 'token', True)
+
+    second = search(client, perPage=20, page=2, enoughResults=True, cursor=first['nextCursor']).get_json()
+    assert (second['count'], second['partial'], second['resumeToken'], second['hasMore']) == (5, True, 'token', False)
+    assert len(scraper.calls) == 1
+
+    resumed = search(client, perPage=45, page=1, enoughResults=True, resumeToken='token').get_json()
+    assert scraper.calls[-1][1]['resume_token'] == 'token'
+    assert (resumed['count'], resumed['partial'], resumed['resumeToken'], resumed['hasMore']) == (45, False, None, True)
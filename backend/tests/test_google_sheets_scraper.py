@@ -0,0 +1,128 @@
+import threading
+
+from fake_gmaps import FakeGoogleMaps
+
+KADIKOY_KOFTE = ('Kadıköy, İstanbul', 'köfte')
+
+
+def run_concurrently(count, fn):
+    """fn'i count iş parçacığında aynı anda başlatır, sonuçları sırayla döner"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        results[index] = fn()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_budgeted_searches_share_one_crawl(make_scraper):
+    scraper, single = make_scraper()
+    expected = scraper.search_with_budget(*KADIKOY_KOFTE, max_calls=6, fetch_details=False)
+    single_calls = single.count('places')
+
+    fake = FakeGoogleMaps(delay=0.01)
+    scraper, _ = make_scraper(fake)
+    results = run_concurrently(3, lambda: scraper.search_with_budget(*KADIKOY_KOFTE, max_calls=6,
+                                                                     fetch_details=False))
+
+    assert fake.count('places') == single_calls
+    for result in results:
+        assert result['partial'] == expected['partial']
+        assert [r.place_id for r in result['restaurants']] == [r.place_id for r in expected['restaurants']]
+    # Her çağıran kendi kopyasını alır
+    assert results[0]['restaurants'][0] is not results[1]['restaurants'][0]
+
+
+def stale_scraper(make_scraper, monkeypatch, clock, **search):
+    """Aramayı bir kez yapar, sonra yer puanlarını bayatlatacak kadar saati ilerletir"""
+    import place_store
+    monkeypatch.setattr(place_store, 'time', clock)
+    scraper, fake = make_scraper()
+    scraper.search_restaurants(*KADIKOY_KOFTE, fetch_details=False, **search)
+    clock.advance(2 * 24 * 3600)
+    fake.calls.clear()
+    return scraper, fake
+
+
+def test_refresh_uses_details_when_cheaper_than_rescan(make_scraper, monkeypatch, clock):
+    scraper, fake = stale_scraper(make_scraper, monkeypatch, clock)
+    # Kapsamı baştan taramak pahalı olsun
+    scraper.place_store._conn.execute("UPDATE search_coverage SET api_calls = 1000")
+
+    result = scraper.refresh_search(*KADIKOY_KOFTE, fetch_details=False, max_age=24 * 3600,
+                                    scope_max_age=7 * 24 * 3600)
+
+    report = result['report']
+    assert report['rescanned'] is False
+    assert fake.count('places') == 0
+    assert report['refreshed_places'] == len(result['restaurants']) > 0
+    assert fake.count('place') == report['refreshed_places']
+
+
+def test_refresh_rescans_when_stale_places_outnumber_scan_calls(make_scraper, monkeypatch, clock):
+    scraper, fake = stale_scraper(make_scraper, monkeypatch, clock)
+    scan_calls = scraper.place_store._conn.execute("SELECT api_calls FROM search_coverage").fetchone()[0]
+    # Kapsam tek çağrıyla taranmış gibi - bayat yerleri tek tek yenilemek daha pahalı
+    scraper.place_store._conn.execute("UPDATE search_coverage SET api_calls = 1")
+
+    result = scraper.refresh_search(*KADIKOY_KOFTE, fetch_details=False, max_age=24 * 3600,
+                                    scope_max_age=7 * 24 * 3600)
+
+    report = result['report']
+    assert report['rescanned'] is True
+    assert fake.count('places') == scan_calls
+    # Taranan yerlerin puanları taze - tek tek yenilenmez
+    assert report['refreshed_places'] == 0
+    assert fake.count('place') == 0
+
+
+def full_scan_refresh(make_scraper, monkeypatch, clock, rescan_calls=None):
+    """
+    Full scan yapar, puanları bayatlatır ve aramayı yeniler
+
+    rescan_calls verilirse kapsam ve hücreler toplam bu kadar çağrıyla taranmış gibi kaydedilir.
+    """
+    import google_sheets_scraper
+    import place_store
+    monkeypatch.setattr(place_store, 'time', clock)
+    # Bölünme erken dursun - test taraması küçük kalır
+    monkeypatch.setattr(google_sheets_scraper, 'FULL_SCAN_MIN_RADIUS', 6000)
+    scraper, fake = make_scraper()
+    search = ('İstanbul', '')
+    scraper.search_restaurants(*search, restaurant_name='Hacı', full_scan=True, fetch_details=False)
+    scan_calls = fake.count('places_nearby')
+    if rescan_calls is not None:
+        scraper.place_store._conn.execute("UPDATE search_coverage SET api_calls = ?", (rescan_calls,))
+        scraper.place_store._conn.execute("UPDATE cell_coverage SET api_calls = 0")
+    clock.advance(2 * 24 * 3600)
+    fake.calls.clear()
+
+    result = scraper.refresh_search(*search, restaurant_name='Hacı', full_scan=True, fetch_details=False,
+                                    max_age=24 * 3600, scope_max_age=7 * 24 * 3600)
+    return result, fake, scan_calls
+
+
+def test_full_scan_refresh_uses_details_when_cheaper(make_scraper, monkeypatch, clock):
+    result, fake, _ = full_scan_refresh(make_scraper, monkeypatch, clock)
+
+    report = result['report']
+    assert report['rescanned'] is False
+    assert fake.count('places_nearby') == 0
+    assert 0 < report['refreshed_places'] == fake.count('place') < report['saved_calls']
+
+
+def test_full_scan_refresh_rescans_when_cheaper(make_scraper, monkeypatch, clock):
+    result, fake, scan_calls = full_scan_refresh(make_scraper, monkeypatch, clock, rescan_calls=1)
+
+    report = result['report']
+    assert report['rescanned'] is True
+    assert report['reused_cells'] == 0
+    assert fake.count('places_nearby') == scan_calls
+    assert fake.count('place') == 0
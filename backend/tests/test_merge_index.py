@@ -0,0 +1,55 @@
+from merge_index import NEW, SEEN, UPDATED, PlaceMergeIndex
+
+
+def test_merge_new_seen_and_updated():
+    index = PlaceMergeIndex()
+    record, status = index.merge({'place_id': 'a', 'name': 'Köfteci', 'vicinity': 'Moda'}, 'nearby')
+    assert status == NEW
+
+    same, status = index.merge({'place_id': 'a', 'name': 'Başka Ad'}, 'nearby')
+    assert status == SEEN
+    assert same is record
+    # Dolu alanlar ilk kayıttaki gibi kalır
+    assert record['name'] == 'Köfteci'
+
+    _, status = index.merge({'place_id': 'a', 'formatted_address': 'Moda, Kadıköy/İstanbul', 'vicinity': ''}, 'text')
+    assert status == UPDATED
+    assert record['formatted_address'] == 'Moda, Kadıköy/İstanbul'
+    assert record['vicinity'] == 'Moda'
+    assert index.sources('a') == ['nearby', 'text']
+
+
+def test_empty_fields_are_filled():
+    index = PlaceMergeIndex()
+    record, _ = index.merge({'place_id': 'a', 'rating': None, 'types': []}, 'nearby')
+    _, status = index.merge({'place_id': 'a', 'rating': 4.5, 'types': ['restaurant']}, 'text')
+    assert status == UPDATED
+    assert record == {'place_id': 'a', 'rating': 4.5, 'types': ['restaurant']}
+
+
+def test_places_without_id_are_ignored():
+    index = PlaceMergeIndex()
+    assert index.merge({'name': 'Kimliksiz'}, 'text') == (None, None)
+    assert not index.add({'place_id': ''}, 'text')
+    assert len(index) == 0
+
+
+def test_add_all_counts_new_places_in_first_seen_order():
+    index = PlaceMergeIndex()
+    assert index.add_all([{'place_id': 'b'}, {'place_id': 'a'}], 'text') == 2
+    assert index.add_all([{'place_id': 'a'}, {'place_id': 'c'}], 'nearby') == 1
+    assert [place['place_id'] for place in index.places()] == ['b', 'a', 'c']
+    assert 'c' in index
+    assert index.get('x') is None
+    assert index.sources('x') == []
+
+
+def test_first_source_counts():
+    index = PlaceMergeIndex()
+    index.add_all([{'place_id': 'a'}, {'place_id': 'b'}], 'köfte')
+    index.add_all([{'place_id': 'b'}, {'place_id': 'c'}, {'place_id': 'd'}], 'köfteci')
+    assert index.first_source_counts() == {'köfte': 2, 'köfteci': 2}
+    # Sadece verilen yerler (ör. filtreden geçenler) sayılır
+    assert index.first_source_counts({'a', 'c'}) == {'köfte': 1, 'köfteci': 1}
+    assert index.first_source_counts({'b'}) == {'köfte': 1}
+    assert index.first_source_counts(set()) == {}
@@ -0,0 +1,102 @@
+from page_scheduler import PageTokenScheduler
+
+
+def fake_fetch(pages_per_job, failing=()):
+    """job -> sayfa sayısı; her sayfa [(job, sayfa no)] sonuç listesi döner"""
+    calls = []
+
+    def fetch_page(job, page_token):
+        calls.append((job, page_token))
+        if job in failing:
+            raise RuntimeError(f"{job} hata")
+        page = int(page_token) if page_token else 0
+        result = {'results': [(job, page)]}
+        if page + 1 < pages_per_job[job]:
+            result['next_page_token'] = str(page + 1)
+        return result
+    return fetch_page, calls
+
+
+def scheduler():
+    return PageTokenScheduler(max_workers=3, token_delay=0.0)
+
+
+def test_run_collects_pages_in_job_order():
+    fetch_page, _ = fake_fetch({'a': 3, 'b': 1, 'c': 2})
+    pages = scheduler().run(['a', 'b', 'c'], fetch_page)
+    assert pages == [[[('a', 0)], [('a', 1)], [('a', 2)]], [[('b', 0)]], [[('c', 0)], [('c', 1)]]]
+
+
+def test_max_pages_limits_tokens():
+    fetch_page, calls = fake_fetch({'a': 5})
+    pages = PageTokenScheduler(token_delay=0.0, max_pages=2).run(['a'], fetch_page)
+    assert len(pages[0]) == 2
+    assert len(calls) == 2
+
+
+def test_on_page_sees_sequential_order_and_pages_are_released():
+    fetch_page, _ = fake_fetch({'a': 3, 'b': 2, 'c': 1})
+    seen = []
+    pages = scheduler().run(['a', 'b', 'c'], fetch_page, on_page=lambda job, results: seen.extend(results))
+    assert seen == [('a', 0), ('a', 1), ('a', 2), ('b', 0), ('b', 1), ('c', 0)]
+    # Teslim edilen sayfaların içeriği bırakılır, sayıları kalır
+    assert pages == [[[], [], []], [[], []], [[]]]
+
+
+def test_on_job_done_sees_pages_and_appends_jobs():
+    fetch_page, _ = fake_fetch({'a': 2, 'a1': 1, 'a2': 1})
+    done = []
+
+    def on_job_done(job, pages):
+        done.append((job, list(pages)))
+        return ['a1', 'a2'] if job == 'a' else []
+
+    seen = []
+    pages = scheduler().run(['a'], fetch_page, on_job_done=on_job_done, on_page=lambda job, results: seen.extend(results))
+    assert done[0] == ('a', [[('a', 0)], [('a', 1)]])
+    assert seen == [('a', 0), ('a', 1), ('a1', 0), ('a2', 0)]
+    assert [len(job_pages) for job_pages in pages] == [2, 1, 1]
+
+
+def test_resume_continues_from_token():
+    fetch_page, calls = fake_fetch({'a': 3, 'b': 1})
+    pages = scheduler().run(['a', 'b'], fetch_page, resume=[('2', 2), None])
+    assert ('a', None) not in calls
+    assert pages[0] == [[], [], [('a', 2)]]
+
+
+def test_failed_job_is_not_finished():
+    fetch_page, _ = fake_fetch({'a': 1, 'b': 1}, failing={'a'})
+    errors, finished, seen = [], [], []
+
+    class Progress:
+        def page_fetched(self, index, job, results, next_page_token):
+            pass
+
+        def job_finished(self, index, job):
+            finished.append(job)
+
+    scheduler().run(['a', 'b'], fetch_page, on_error=lambda job, e: errors.append(job), progress=Progress(),
+                    on_page=lambda job, results: seen.extend(results))
+    assert errors == ['a']
+    assert finished == ['b']
+    # Hatalı sorgu sıralı teslimatı tıkamaz
+    assert seen == [('b', 0)]
+
+
+def test_admit_stops_scan_and_flushes_partial_pages():
+    fetch_page, calls = fake_fetch({'a': 3, 'b': 1})
+    budget = [2]
+
+    def admit(job):
+        budget[0] -= 1
+        return budget[0] >= 0
+
+    seen = []
+    run = PageTokenScheduler(max_workers=1, token_delay=0.0)
+    pages = run.run(['a', 'b'], fetch_page, admit=admit, on_page=lambda job, results: seen.extend(results))
+    assert run.stopped
+    assert len(calls) == 2
+    # Token'lı ikinci sayfa 'b'den sonra hazır olur; durunca yarım 'a' da sırayla verilir
+    assert seen == [('a', 0), ('b', 0)]
+    assert [len(job_pages) for job_pages in pages] == [1, 1]
@@ -0,0 +1,60 @@
+import math
+from types import SimpleNamespace
+
+from place_batch import PlaceBatch, sort_by_rating
+
+PLACES = [
+    {'place_id': 'a', 'name': 'Köfteci', 'rating': 4.5, 'user_ratings_total': 120,
+     'geometry': {'location': {'lat': 40.99, 'lng': 29.03}}},
+    {'place_id': 'b', 'name': 'Kebapçı', 'rating': None, 'user_ratings_total': None},
+    {'place_id': 'c', 'name': 'Lokanta', 'rating': 4.0, 'user_ratings_total': 49,
+     'geometry': {'location': {'lat': 41.04}}},
+    {'place_id': 'd', 'name': 'Pideci', 'rating': 4.8, 'user_ratings_total': 50,
+     'geometry': {'location': {'lat': 41.05, 'lng': 29.01}}},
+]
+
+
+def batch():
+    return PlaceBatch.from_places([dict(place) for place in PLACES])
+
+
+def test_from_places_builds_columns():
+    places = batch()
+    assert len(places) == 4
+    assert list(places.place_ids) == ['a', 'b', 'c', 'd']
+    assert list(places.ratings) == [4.5, 0.0, 4.0, 4.8]
+    assert list(places.review_counts) == [120, 0, 49, 50]
+    assert places.lats[0] == 40.99 and places.lngs[0] == 29.03
+    # Eksik koordinatlar NaN olur
+    assert math.isnan(places.lats[1]) and math.isnan(places.lngs[2])
+    assert [place['name'] for place in places.places] == ['Köfteci', 'Kebapçı', 'Lokanta', 'Pideci']
+
+
+def test_rating_and_popular_masks():
+    places = batch()
+    assert list(places.rating_at_least(4.5)) == [True, False, False, True]
+    assert list(places.popular()) == [True, False, False, True]
+    assert list(places.popular(min_rating=4.0, min_reviews=40)) == [True, False, True, True]
+
+
+def test_take_with_mask_and_indices():
+    places = batch()
+    rated = places.take(places.rating_at_least(4.5))
+    assert list(rated.place_ids) == ['a', 'd']
+    assert [place['place_id'] for place in rated.places] == ['a', 'd']
+    ordered = places.take(places.rating_order())
+    assert list(ordered.place_ids) == ['d', 'a', 'c', 'b']
+
+
+def test_sort_by_rating_matches_stable_sort():
+    rows = [SimpleNamespace(name=name, rating=rating)
+            for name, rating in [('a', 4.5), ('b', None), ('c', 4.8), ('d', 4.5), ('e', 0)]]
+    expected = sorted(rows, key=lambda row: row.rating or 0, reverse=True)
+    assert [row.name for row in sort_by_rating(rows)] == [row.name for row in expected] == ['c', 'a', 'd', 'b', 'e']
+    assert sort_by_rating(rows[:1]) == rows[:1]
+    assert sort_by_rating([]) == []
+
+
+def test_sort_by_rating_with_key():
+    rows = [{'rating': 3.0}, {'rating': 4.9}]
+    assert sort_by_rating(rows, key=lambda row: row['rating']) == [{'rating': 4.9}, {'rating': 3.0}]
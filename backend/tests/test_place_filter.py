@@ -0,0 +1,82 @@
+from place_filter import PlaceFilter, normalize_turkish_text
+
+
+def make_place(name='Ali Usta Köfteci', address='Moda Cd. No:5, Kadıköy/İstanbul', vicinity='Moda Cd. No:5, Kadıköy',
+               rating=4.2, reviews=10):
+    return {
+        'place_id': 'p1',
+        'name': name,
+        'formatted_address': address,
+        'vicinity': vicinity,
+        'rating': rating,
+        'user_ratings_total': reviews,
+        'geometry': {'location': {'lat': 40.99, 'lng': 29.03}},
+    }
+
+
+def kadikoy_filter(**kwargs):
+    return PlaceFilter(district='Kadıköy', district_variations=['kadikoy', 'kadiköy', 'kadıkoy', 'kadıköy'],
+                       district_key='kadikoy', **kwargs)
+
+
+def test_normalize_turkish_text_handles_dotted_capital_i():
+    assert normalize_turkish_text('İSTANBUL Şişli Çırağan') == 'istanbul sisli ciragan'
+    assert normalize_turkish_text(None) == ''
+
+
+def test_matches_district_in_address_variations():
+    place_filter = kadikoy_filter()
+    assert place_filter.matches(make_place())
+    assert place_filter.matches(make_place(address='Moda Cd. No:5, KADIKOY/Istanbul'))
+    assert not place_filter.matches(make_place(address='Barbaros Blv. No:1, Beşiktaş/İstanbul'))
+
+
+def test_matches_without_district_accepts_any_address():
+    assert PlaceFilter().matches(make_place(address='Barbaros Blv. No:1, Beşiktaş/İstanbul'))
+
+
+def test_polygon_district_accepts_place_without_district_in_address():
+    place_filter = kadikoy_filter()
+    place = make_place(address='Moda Cd. No:5, İstanbul')
+    assert not place_filter.matches(place)
+    assert place_filter.matches(place, polygon_district='kadikoy')
+    assert not place_filter.matches(place, polygon_district='uskudar')
+
+
+def test_address_naming_another_district_wins_over_polygon():
+    place = make_place(address='Moda Cd. No:5, Üsküdar/İstanbul')
+    assert not kadikoy_filter().matches(place, polygon_district='kadikoy')
+
+
+def test_restaurant_name_filter_normalizes_turkish_characters():
+    place_filter = kadikoy_filter(restaurant_name='Köfteci')
+    assert place_filter.matches(make_place(name='Ali Usta KOFTECI'))
+    assert not place_filter.matches(make_place(name='Ali Usta Kebapçı'))
+    assert kadikoy_filter(restaurant_name='iskender').matches(make_place(name='Bursa İSKENDER'))
+
+
+def test_type_terms_accept_term_general_term_or_popular_place():
+    place_filter = kadikoy_filter(type_terms=['köfte', 'köfteci'])
+    assert place_filter.matches(make_place(name='Ali Usta Köfteci'))
+    assert place_filter.matches(make_place(name='Ali Usta Lokanta'))
+    assert not place_filter.matches(make_place(name='Ali Usta Kebapçı'))
+    assert place_filter.matches(make_place(name='Ali Usta Kebapçı', rating=4.5, reviews=120))
+    assert place_filter.matches(make_place(name='Ali Usta Kebapçı'), is_popular=True)
+    assert not place_filter.matches(make_place(name='Ali Usta Kebapçı', rating=4.5, reviews=120), is_popular=False)
+
+
+def test_matches_nearby_uses_vicinity_and_istanbul_fallback():
+    place_filter = kadikoy_filter()
+    assert place_filter.matches_nearby(make_place())
+    # Sadece "İstanbul" yazan adres koordinat sınır içindeyse kabul edilir
+    assert place_filter.matches_nearby(make_place(vicinity='Moda Cd. No:5, İstanbul'))
+    # Başka bir ilçe adı geçiyorsa esnek eşleşme yapılmaz
+    assert not place_filter.matches_nearby(make_place(vicinity='Barbaros Blv., Beşiktaş'))
+    assert not place_filter.matches_nearby(make_place(vicinity='Barbaros Blv., Beşiktaş, İstanbul'),
+                                           in_bounds=False)
+
+
+def test_matches_nearby_polygon_ignored_when_vicinity_names_another_district():
+    place_filter = kadikoy_filter()
+    assert place_filter.matches_nearby(make_place(vicinity='Moda Cd. No:5'), polygon_district='kadikoy')
+    assert not place_filter.matches_nearby(make_place(vicinity='Moda Cd., Üsküdar'), polygon_district='kadikoy')
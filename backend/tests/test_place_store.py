@@ -0,0 +1,64 @@
+import pytest
+
+import place_store
+from place_store import PlaceStore
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(place_store, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PlaceStore(str(tmp_path / 'places.db'), coverage_ttl=3600)
+
+
+def place(place_id, lat=41.0, lng=29.0, rating=4.5):
+    return {'place_id': place_id, 'name': f"Köfteci {place_id}", 'formatted_address': 'Kadıköy/İstanbul',
+            'rating': rating, 'user_ratings_total': 10, 'geometry': {'location': {'lat': lat, 'lng': lng}}}
+
+
+def test_stale_place_ids_uses_last_seen_time(store, clock):
+    store.upsert_places([place('old')])
+    clock.advance(100)
+    store.upsert_places([place('new')])
+    clock.advance(60)
+    assert store.stale_place_ids(['old', 'new'], max_age=120) == ['old']
+    assert store.stale_place_ids(['old', 'new'], max_age=200) == []
+
+
+def test_stale_place_ids_counts_details_refresh(store, clock):
+    store.upsert_places([place('p1')])
+    clock.advance(100)
+    store.update_details('p1', {'rating': 4.7, 'user_ratings_total': 12})
+    clock.advance(10)
+    assert store.stale_place_ids(['p1'], max_age=50) == []
+
+
+def test_unknown_places_are_stale_and_order_is_kept(store):
+    store.upsert_places([place('known')])
+    assert store.stale_place_ids(['x', 'known', 'y', 'x'], max_age=60) == ['x', 'y']
+
+
+def test_stale_place_ids_handles_large_batches(store):
+    store.upsert_places([place(f"p{i}") for i in range(1200)])
+    ids = [f"p{i}" for i in range(1200)] + ['missing']
+    assert store.stale_place_ids(ids, max_age=60) == ['missing']
+
+
+def test_coverage_expires_after_ttl(store, clock):
+    store.record_scope('scope', place_store.SEARCH_SOURCE, [place('p1')], api_calls=3)
+    assert store.get_coverage('scope')['api_calls'] == 3
+    clock.advance(3601)
+    assert store.get_coverage('scope') is None
+    assert store.get_coverage('scope', max_age=7200) is not None
+
+
+def test_spatial_queries(store):
+    store.upsert_places([place('in', 41.0, 29.0), place('out', 41.2, 29.2), place('low', 41.001, 29.001, rating=3.0)])
+    bounds = {'north': 41.05, 'south': 40.95, 'east': 29.05, 'west': 28.95}
+    assert {p['place_id'] for p in store.places_in_bounds(bounds)} == {'in', 'low'}
+    assert {p['place_id'] for p in store.places_in_bounds(bounds, min_rating=4.0)} == {'in'}
+    assert [p['place_id'] for p in store.places_within(41.0, 29.0, 500)] == ['in', 'low']
@@ -0,0 +1,77 @@
+import pytest
+
+import place_store
+import query_planner
+from place_store import PlaceStore
+from query_planner import QueryPlanner, canonical_term
+
+TERMS = ['köfte', 'köfteci', 'köfte salonu']
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(place_store, 'time', clock)
+    monkeypatch.setattr(query_planner, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def planner(tmp_path):
+    return QueryPlanner(PlaceStore(str(tmp_path / 'places.db')), min_searches=2, min_yield=0.5, retry_after=3600)
+
+
+def record_searches(planner, count, term_yields):
+    for _ in range(count):
+        planner.record('places', 'köfte', term_yields)
+
+
+def test_canonical_term_merges_equivalent_spellings():
+    assert canonical_term(' Köfte  Salonu ') == canonical_term('kofte salonu')
+
+
+def test_equivalent_terms_are_queried_once(planner):
+    assert planner.plan('places', 'köfte', ['köfte', 'Kofte', '', 'köfteci']) == ['köfte', 'köfteci']
+
+
+def test_low_yield_terms_are_skipped_after_enough_searches(planner):
+    record_searches(planner, 1, {'köfte': (2, 0), 'köfteci': (2, 0), 'köfte salonu': (2, 5)})
+    # Tek aramayla karar verilmez
+    assert planner.plan('places', 'köfte', TERMS) == TERMS
+
+    record_searches(planner, 1, {'köfte': (2, 0), 'köfteci': (2, 0), 'köfte salonu': (2, 5)})
+    # Ana terim verimsiz olsa da kalır
+    assert planner.plan('places', 'köfte', TERMS) == ['köfte', 'köfte salonu']
+
+
+def test_skipped_terms_are_retried_when_stats_age(planner, clock):
+    record_searches(planner, 2, {'köfteci': (2, 0)})
+    assert 'köfteci' not in planner.plan('places', 'köfte', TERMS)
+    clock.advance(3600)
+    assert 'köfteci' in planner.plan('places', 'köfte', TERMS)
+
+
+def test_stats_are_kept_per_search(planner):
+    record_searches(planner, 2, {'köfteci': (2, 0)})
+    assert planner.plan('places', 'ızgara köfte', TERMS) == TERMS
+    assert planner.plan('places_nearby', 'köfte', TERMS) == TERMS
+
+
+def test_by_yield_orders_unknown_terms_first_then_best(planner):
+    record_searches(planner, 1, {'köfteci': (4, 2), 'köfte salonu': (4, 4)})
+    terms = TERMS + ['köfte evi']
+    assert planner.plan('places', 'köfte', terms, by_yield=True) == ['köfte', 'köfte evi', 'köfte salonu', 'köfteci']
+
+
+def test_scraper_counts_only_places_that_pass_the_filter(make_scraper):
+    scraper, _ = make_scraper()
+    scraper.search_restaurants('Kadıköy, İstanbul', 'köfte', fetch_details=False)
+
+    planner = scraper.query_planner
+    keys = [planner.term_key('places', 'köfte', term) for term in scraper._expand_search_terms('köfte')]
+    stats = scraper.place_store.get_term_stats(keys)
+    recorded = sum(term['new_places'] for term in stats.values())
+    scanned = scraper.place_store._conn.execute(
+        "SELECT COUNT(*) FROM scope_places WHERE source = 'search'").fetchone()[0]
+
+    # Fake sonuçların çoğu başka ilçede; taranan tüm yerler değil, sadece filtreden geçenler sayılır
+    assert 0 < recorded < scanned
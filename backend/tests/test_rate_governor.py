@@ -0,0 +1,81 @@
+import pytest
+
+import rate_governor
+from rate_governor import GovernedClient, QuotaExceededError, RateGovernor, TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(rate_governor, 'time', clock)
+    return clock
+
+
+def test_token_bucket_allows_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # Kova boş - sonraki token'lar 0.5 sn arayla
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_over_time_up_to_burst(clock):
+    bucket = TokenBucket(rate=1)
+    assert bucket.reserve() == 0
+    clock.advance(10)
+    assert bucket.reserve() == 0
+    # Birikim burst (1) ile sınırlı
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_token_bucket_acquire_sleeps_for_delay(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.25)]
+
+
+def test_governor_enforces_daily_quota():
+    governor = RateGovernor(daily_quota=2)
+    governor.acquire('places')
+    governor.acquire('geocode')
+    with pytest.raises(QuotaExceededError):
+        governor.acquire('place')
+    assert governor.calls_today == 2
+
+
+def test_governor_quota_resets_on_new_day(monkeypatch):
+    governor = RateGovernor(daily_quota=1)
+    governor.acquire('places')
+    monkeypatch.setattr(governor, '_day', rate_governor.date(2000, 1, 1))
+    governor.acquire('places')
+    assert governor.calls_today == 1
+
+
+def test_governor_uses_per_endpoint_buckets(clock):
+    governor = RateGovernor(endpoint_qps={'places': 1, 'geocode': 0})
+    governor.acquire('places')
+    governor.acquire('places')
+    assert clock.sleeps == [pytest.approx(1.0)]
+    # Sınırı 0 olan endpoint sadece kotadan düşülür
+    governor.acquire('geocode')
+    governor.acquire('geocode')
+    assert len(clock.sleeps) == 1
+
+
+def test_governed_client_checks_quota_before_calling():
+    calls = []
+
+    class Client:
+        key = 'k'
+
+        def places(self, **kwargs):
+            calls.append(kwargs)
+            return {'results': []}
+
+    client = GovernedClient(Client(), RateGovernor(daily_quota=1))
+    assert client.places(query='a') == {'results': []}
+    with pytest.raises(QuotaExceededError):
+        client.places(query='b')
+    assert calls == [{'query': 'a'}]
+    assert client.key == 'k'
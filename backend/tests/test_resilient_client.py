@@ -0,0 +1,125 @@
+import pytest
+from googlemaps.exceptions import ApiError, Timeout
+
+import resilient_client
+from resilient_client import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ResilientClient
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(resilient_client, 'time', clock)
+    return clock
+
+
+class ScriptedClient:
+    """Sıradaki cevabı (ya da hatayı) dönen sahte googlemaps.Client"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def places(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+
+    clock.advance(30)
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    # Yarı açıkta tek deneme
+    assert breaker.allow() is False
+
+
+def test_half_open_trial_closes_or_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.allow()
+    assert breaker.record_failure() is True
+    assert breaker.state == OPEN
+
+
+def test_inconclusive_half_open_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.allow()
+    breaker.record_inconclusive()
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+
+
+def test_retries_transient_errors_then_recovers(clock):
+    client = ScriptedClient(Timeout(), ApiError('UNKNOWN_ERROR'), {'results': [1]})
+    resilient = ResilientClient(client, max_retries=3)
+    assert resilient.places(query='x') == {'results': [1]}
+    assert client.calls == 3
+    assert len(clock.sleeps) == 2
+    metrics = resilient.get_metrics()
+    assert metrics['retries'] == 2
+    assert metrics['recovered'] == 1
+    assert metrics['circuits']['places'] == CLOSED
+
+
+def test_non_retriable_error_is_raised_immediately():
+    client = ScriptedClient(ApiError('INVALID_REQUEST'))
+    resilient = ResilientClient(client)
+    with pytest.raises(ApiError):
+        resilient.places(query='x')
+    assert client.calls == 1
+    assert resilient.get_metrics()['failures'] == 1
+
+
+def test_invalid_request_with_page_token_is_retried():
+    client = ScriptedClient(ApiError('INVALID_REQUEST'), {'results': []})
+    resilient = ResilientClient(client)
+    assert resilient.places(page_token='t') == {'results': []}
+    assert client.calls == 2
+
+
+def test_breaker_short_circuits_until_reset(clock):
+    client = ScriptedClient(*[ApiError('OVER_QUERY_LIMIT')] * 3, {'results': []})
+    resilient = ResilientClient(client, max_retries=5, failure_threshold=3, reset_timeout=30)
+
+    # Üçüncü kota hatası devreyi açar ve asıl hata yukarı taşınır
+    with pytest.raises(ApiError):
+        resilient.places(query='x')
+    assert client.calls == 3
+    assert resilient.get_metrics()['circuits']['places'] == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        resilient.places(query='x')
+    assert client.calls == 3
+    assert resilient.get_metrics()['short_circuits'] == 1
+
+    clock.advance(30)
+    assert resilient.places(query='x') == {'results': []}
+    assert resilient.get_metrics()['circuits']['places'] == CLOSED
+
+
+def test_unprotected_attributes_pass_through():
+    class Client(ScriptedClient):
+        key = 'k'
+
+        def other(self):
+            return 'other'
+
+    resilient = ResilientClient(Client(), endpoints=('places',))
+    assert resilient.key == 'k'
+    assert resilient.other() == 'other'
@@ -0,0 +1,58 @@
+import json
+
+from restaurant import Restaurant, serialize_restaurants
+
+PLACE = {
+    'place_id': 'ChIJ123',
+    'name': 'Ali Usta Köfteci',
+    'vicinity': 'Moda Cd. No:5, Kadıköy',
+    'formatted_address': 'Moda Cd. No:5, Kadıköy/İstanbul',
+    'rating': 4.7,
+    'user_ratings_total': 230,
+}
+
+
+def test_from_place_keeps_used_fields_only():
+    restaurant = Restaurant.from_place(PLACE)
+    assert (restaurant.name, restaurant.address, restaurant.rating, restaurant.review_count, restaurant.place_id) == (
+        'Ali Usta Köfteci', 'Moda Cd. No:5, Kadıköy', 4.7, 230, 'ChIJ123')
+    assert restaurant.phone is None
+    assert restaurant.date is None
+
+
+def test_from_place_defaults():
+    restaurant = Restaurant.from_place({'place_id': 'x'})
+    assert (restaurant.name, restaurant.address, restaurant.rating, restaurant.review_count) == ('', '', 0, 0)
+
+
+def test_to_dict_row_shape():
+    restaurant = Restaurant.from_place(PLACE)
+    restaurant.phone = '0216 000 00 00'
+    assert restaurant.maps_url == 'https://www.google.com/maps/place/?q=place_id:ChIJ123'
+    row = restaurant.to_dict()
+    assert list(row) == ['İsim', 'Adres', 'Puan', 'Yorum Sayısı', 'Telefon', 'Google Maps URL', 'place_id']
+    assert row['Telefon'] == '0216 000 00 00'
+    assert row['Google Maps URL'] == restaurant.maps_url
+
+    restaurant.date = '2024-01-01 12:00:00'
+    assert restaurant.to_dict()['Tarih'] == '2024-01-01 12:00:00'
+
+
+def test_dict_round_trip_through_json():
+    restaurant = Restaurant('Köfteci', 'Moda', 4.5, 10, 'p1', phone='Bilinmiyor', date='2024-01-01 12:00:00')
+    copy = Restaurant.from_dict(json.loads(json.dumps(restaurant.to_dict())))
+    assert copy.to_dict() == restaurant.to_dict()
+
+
+def test_copy_is_independent():
+    restaurant = Restaurant.from_place(PLACE)
+    copy = restaurant.copy()
+    copy.phone = '0216'
+    assert restaurant.phone is None
+    assert copy.to_dict()['place_id'] == restaurant.place_id
+
+
+def test_serialize_restaurants():
+    restaurants = [Restaurant.from_place(PLACE), Restaurant('Lokanta', 'Moda', 4.0, 3, 'p2')]
+    assert serialize_restaurants(restaurants) == [restaurant.to_dict() for restaurant in restaurants]
+    assert serialize_restaurants([]) == []
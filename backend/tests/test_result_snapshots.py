@@ -0,0 +1,64 @@
+import pytest
+
+import result_snapshots
+from restaurant import Restaurant
+from result_snapshots import MemorySnapshotStore, SQLiteSnapshotStore, decode_cursor, encode_cursor
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(result_snapshots, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemorySnapshotStore(ttl=60)
+    return SQLiteSnapshotStore(str(tmp_path / 'snapshots.db'), ttl=60,
+                               encode_row=Restaurant.to_dict, decode_row=Restaurant.from_dict)
+
+
+def restaurants(count):
+    return [Restaurant(f"Köfteci {i}", 'Kadıköy', 4.5, 10 + i, f"p{i}") for i in range(count)]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor('snap', 40)
+    assert decode_cursor(cursor) == ('snap', 40)
+
+
+@pytest.mark.parametrize('cursor', ['', 'bozuk!', encode_cursor('snap', -1)])
+def test_invalid_cursor_decodes_to_none(cursor):
+    assert decode_cursor(cursor) is None
+
+
+def test_load_page_returns_restaurant_rows_and_meta(store):
+    rows = restaurants(5)
+    rows[1].phone = '0216'
+    rows[2].date = '2024-01-01'
+    snapshot_id = store.save(rows, {'resume_token': 'abc'})
+
+    page, total, meta = store.load_page(snapshot_id, 1, 2)
+    assert total == 5
+    assert meta == {'resume_token': 'abc'}
+    assert [r.to_dict() for r in page] == [r.to_dict() for r in rows[1:3]]
+
+
+def test_expired_snapshot_is_not_found(store, clock):
+    snapshot_id = store.save(restaurants(2))
+    clock.advance(61)
+    assert store.load_page(snapshot_id, 0, 10) is None
+
+
+def test_sqlite_store_keeps_plain_dict_rows_without_codec(tmp_path):
+    store = SQLiteSnapshotStore(str(tmp_path / 'snapshots.db'))
+    snapshot_id = store.save([{'İsim': 'Köfteci', 'place_id': 'p1'}])
+    assert store.load_page(snapshot_id, 0, 10) == ([{'İsim': 'Köfteci', 'place_id': 'p1'}], 1, None)
+
+
+def test_sqlite_store_without_codec_does_not_raise_on_objects(tmp_path):
+    store = SQLiteSnapshotStore(str(tmp_path / 'snapshots.db'))
+    # Yazılamayan snapshot bulunamamış sayılır; çağıran arama ile yeniden üretir
+    snapshot_id = store.save(restaurants(1))
+    assert store.load_page(snapshot_id, 0, 10) is None
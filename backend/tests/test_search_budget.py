@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+import search_budget
+from search_budget import SearchBudget
+
+KADIKOY_KOFTE = ('Kadıköy, İstanbul', 'köfte')
+
+
+@pytest.fixture
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(search_budget, 'time', clock)
+    return clock
+
+
+def test_unlimited_budget_never_exhausts():
+    budget = SearchBudget()
+    assert all(budget.spend() for _ in range(1000))
+    assert budget.remaining_calls is None
+    assert not budget.exhausted()
+
+
+def test_max_calls_is_never_exceeded():
+    budget = SearchBudget(max_calls=5)
+    assert budget.spend(3)
+    # Sığmayan çağrı bütçeyi değiştirmez
+    assert not budget.spend(3)
+    assert budget.calls == 3
+    assert budget.remaining_calls == 2
+    assert budget.spend(2)
+    assert budget.exhausted()
+    assert budget.remaining_calls == 0
+
+
+def test_concurrent_spending_stays_within_budget():
+    budget = SearchBudget(max_calls=50)
+    granted = []
+
+    def worker():
+        granted.extend(1 for _ in range(40) if budget.spend())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(granted) == 50
+    assert budget.calls == 50
+
+
+def test_time_limit(fake_time):
+    budget = SearchBudget(time_limit=10)
+    assert budget.spend()
+    fake_time.advance(9.9)
+    assert not budget.exhausted()
+    fake_time.advance(0.1)
+    assert budget.exhausted()
+    assert not budget.spend()
+
+
+def test_budgeted_search_returns_partial_then_resumes(make_scraper):
+    scraper, fake = make_scraper()
+    full = scraper.search_restaurants(*KADIKOY_KOFTE, fetch_details=False)
+
+    scraper, fake = make_scraper()
+    first = scraper.search_with_budget(*KADIKOY_KOFTE, max_calls=2, fetch_details=False)
+    assert first['partial']
+    assert first['resume_token']
+    assert first['api_calls'] <= 2
+    assert fake.count('places') <= 2
+
+    result = first
+    for _ in range(50):
+        if not result['partial']:
+            break
+        result = scraper.search_with_budget(*KADIKOY_KOFTE, max_calls=2, fetch_details=False,
+                                            resume_token=result['resume_token'])
+        assert result['api_calls'] <= 2
+    assert not result['partial']
+    assert result['resume_token'] is None
+    assert {r.place_id for r in result['restaurants']} == {r.place_id for r in full}
+
+
+def test_enough_results_mode_stops_early(make_scraper):
+    scraper, fake = make_scraper()
+    scraper.search_restaurants(*KADIKOY_KOFTE, fetch_details=False, min_rating=0)
+    full_calls = fake.count('places')
+
+    scraper, fake = make_scraper()
+    result = scraper.search_with_budget(*KADIKOY_KOFTE, fetch_details=False, min_rating=0, min_results=1)
+    assert result['restaurants']
+    assert result['partial']
+    assert fake.count('places') < full_calls
+
+
+def test_resume_token_of_another_search_is_rejected(make_scraper):
+    scraper, _ = make_scraper()
+    first = scraper.search_with_budget(*KADIKOY_KOFTE, max_calls=1, fetch_details=False)
+    with pytest.raises(ValueError):
+        scraper.search_with_budget('Beşiktaş, İstanbul', 'köfte', max_calls=1, fetch_details=False,
+                                   resume_token=first['resume_token'])
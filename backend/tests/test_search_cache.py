@@ -0,0 +1,65 @@
+import pytest
+
+import search_cache
+from search_cache import FRESH, STALE, SearchResultCache
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(search_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache():
+    return SearchResultCache(fresh_ttl=60, stale_ttl=600, negative_ttl=10, max_entries=3)
+
+
+def test_missing_key(cache):
+    assert cache.get('yok') == (None, None)
+
+
+def test_entry_is_fresh_then_stale_then_expired(cache, clock):
+    cache.set('kofte', ['a'])
+    assert cache.get('kofte') == (['a'], FRESH)
+    clock.advance(61)
+    assert cache.get('kofte') == (['a'], STALE)
+    clock.advance(540)
+    assert cache.get('kofte') == (None, None)
+    # Süresi dolan kayıt silinir, saat geri gelse de dönmez
+    clock.advance(-600)
+    assert cache.get('kofte') == (None, None)
+
+
+def test_empty_result_uses_negative_ttl_without_stale_window(cache, clock):
+    cache.set('bos', [])
+    assert cache.get('bos') == ([], FRESH)
+    clock.advance(11)
+    assert cache.get('bos') == (None, None)
+
+
+def test_set_overwrites_and_restarts_ttl(cache, clock):
+    cache.set('kofte', ['a'])
+    clock.advance(61)
+    cache.set('kofte', ['b'])
+    assert cache.get('kofte') == (['b'], FRESH)
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    for key in ('a', 'b', 'c'):
+        cache.set(key, [key])
+    cache.get('a')
+    cache.set('d', ['d'])
+    assert cache.get('b') == (None, None)
+    assert cache.get('a') == (['a'], FRESH)
+    assert cache.get('d') == (['d'], FRESH)
+
+
+def test_only_one_refresh_at_a_time(cache):
+    assert cache.begin_refresh('kofte')
+    assert not cache.begin_refresh('kofte')
+    assert cache.begin_refresh('kebap')
+    cache.end_refresh('kofte')
+    assert cache.begin_refresh('kofte')
+    # Başlamamış yenilemeyi bitirmek hata vermez
+    cache.end_refresh('yok')
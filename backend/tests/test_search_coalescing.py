@@ -0,0 +1,135 @@
+import logging
+import threading
+
+import pytest
+
+from search_coalescing import SingleFlight
+
+
+def start_waiters(flight, key, fn, count):
+    """Lider çalışırken aynı anahtarla count çağrı başlatır"""
+    results = []
+    errors = []
+
+    def waiter():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=waiter) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class FollowerCounter(logging.Handler):
+    """Lideri bekleyen çağrıları ("zaten sürüyor" logu) sayar"""
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.count = 0
+
+    def emit(self, record):
+        if 'zaten sürüyor' in record.getMessage():
+            self.count += 1
+
+    def wait_for(self, count):
+        for _ in range(5000):
+            if self.count >= count:
+                return
+            threading.Event().wait(0.001)
+        raise AssertionError("Bekleyen çağrılar başlamadı")
+
+
+@pytest.fixture
+def followers():
+    counter = FollowerCounter()
+    coalescing_logger = logging.getLogger('search_coalescing')
+    level = coalescing_logger.level
+    coalescing_logger.setLevel(logging.INFO)
+    coalescing_logger.addHandler(counter)
+    yield counter
+    coalescing_logger.removeHandler(counter)
+    coalescing_logger.setLevel(level)
+
+
+def test_concurrent_calls_share_one_run(followers):
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return ['sonuç']
+
+    leader = threading.Thread(target=lambda: runs.append(flight.do('kofte', work)))
+    leader.start()
+    started.wait(5)
+    threads, results, errors = start_waiters(flight, 'kofte', work, 3)
+    followers.wait_for(3)
+    release.set()
+    for thread in threads + [leader]:
+        thread.join()
+
+    assert runs.count(1) == 1
+    assert runs[-1] == (['sonuç'], False)
+    assert results == [(['sonuç'], True)] * 3
+    assert not errors
+    assert flight._calls == {}
+
+
+def test_exception_is_shared_and_key_released(followers):
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("Google hatası")
+
+    leader_errors = []
+
+    def leader():
+        try:
+            flight.do('kofte', fail)
+        except RuntimeError as e:
+            leader_errors.append(e)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    started.wait(5)
+    threads, results, errors = start_waiters(flight, 'kofte', fail, 2)
+    followers.wait_for(2)
+    release.set()
+    for thread in threads + [leader_thread]:
+        thread.join()
+
+    assert len(leader_errors) == 1
+    assert not results
+    assert errors == [leader_errors[0]] * 2
+    # Hatadan sonra anahtar silinir, sonraki çağrı yeniden çalışır
+    assert flight.do('kofte', lambda: 'tekrar') == ('tekrar', False)
+
+
+def test_sequential_calls_run_again():
+    flight = SingleFlight()
+    calls = []
+    assert flight.do('a', lambda: calls.append(1) or len(calls)) == (1, False)
+    assert flight.do('a', lambda: calls.append(1) or len(calls)) == (2, False)
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: flight.do('b', lambda: 'iç')) == (('iç', False), False)
+
+
+def test_leader_exception_propagates():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('a', lambda: int('x'))
+    assert flight._calls == {}
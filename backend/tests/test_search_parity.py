@@ -0,0 +1,31 @@
+import json
+import os
+
+import pytest
+
+from fake_gmaps import FakeGoogleMaps
+
+# İlk sürümün search_restaurants çıktısı - aynı FakeGoogleMaps(canonical_queries=True) ile üretildi
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'baseline_search.json')
+
+with open(BASELINE_PATH, encoding='utf-8') as f:
+    BASELINE = json.load(f)
+
+
+@pytest.mark.parametrize('case', BASELINE, ids=lambda case: f"{case['location']}|{case['restaurant_type']}"
+                                                            f"|{case['restaurant_name']}")
+def test_search_restaurants_matches_baseline(make_scraper, case):
+    """
+    Eş zamanlı sorgular, önbellekler, derlenmiş filtre ve sütunlu sıralama ilk
+    sürümle aynı satırları aynı puan sırasıyla döndürmeli. İlk sürüm terimleri
+    set sırasıyla sorguladığı için eşit puanlı satırların kendi aralarındaki sırası
+    karşılaştırılmaz.
+    """
+    scraper, _ = make_scraper(FakeGoogleMaps(canonical_queries=True))
+    restaurants = scraper.search_restaurants(case['location'], case['restaurant_type'],
+                                             restaurant_name=case['restaurant_name'])
+    rows = [restaurant.to_dict() for restaurant in restaurants]
+    expected = case['restaurants']
+
+    assert [row['Puan'] for row in rows] == [row['Puan'] for row in expected]
+    assert sorted(rows, key=lambda row: row['place_id']) == sorted(expected, key=lambda row: row['place_id'])
@@ -0,0 +1,53 @@
+import random
+
+from spatial_index import GeohashIndex, distance_m, geohash_key
+
+
+def random_points(count, seed=1):
+    rng = random.Random(seed)
+    return [(f"p{i}", 40.9 + rng.random() * 0.3, 28.9 + rng.random() * 0.3) for i in range(count)]
+
+
+def test_geohash_key_keeps_nearby_points_close():
+    assert geohash_key(41.0, 29.0) == geohash_key(41.0, 29.0)
+    # Aynı hücredeki noktalar aynı öneki paylaşır
+    assert geohash_key(41.0, 29.0) >> 20 == geohash_key(41.000001, 29.000001) >> 20
+
+
+def test_in_bounds_matches_brute_force():
+    points = random_points(500)
+    index = GeohashIndex()
+    for item_id, lat, lng in points:
+        index.add(item_id, lat, lng)
+
+    for bounds in ({'south': 40.95, 'north': 41.0, 'west': 29.0, 'east': 29.1},
+                   {'south': 40.0, 'north': 42.0, 'west': 28.0, 'east': 30.0},
+                   {'south': 41.1, 'north': 41.1001, 'west': 29.1, 'east': 29.1001}):
+        expected = {item_id for item_id, lat, lng in points
+                    if bounds['south'] <= lat <= bounds['north'] and bounds['west'] <= lng <= bounds['east']}
+        assert set(index.in_bounds(bounds)) == expected
+
+
+def test_within_radius_matches_brute_force_sorted_by_distance():
+    points = random_points(500, seed=2)
+    index = GeohashIndex()
+    for item_id, lat, lng in points:
+        index.add(item_id, lat, lng)
+
+    results = index.within_radius(41.0, 29.0, 3000)
+    expected = {item_id for item_id, lat, lng in points if distance_m(41.0, 29.0, lat, lng) <= 3000}
+    assert {value for _, value in results} == expected
+    distances = [distance for distance, _ in results]
+    assert distances == sorted(distances)
+
+
+def test_add_updates_and_remove_deletes():
+    index = GeohashIndex()
+    index.add('a', 41.0, 29.0, value={'id': 'a'})
+    index.add('a', 40.0, 28.0, value={'id': 'a'})
+    index.add('b', None, 29.0)
+    assert len(index) == 1
+    assert index.in_bounds({'south': 39.9, 'north': 40.1, 'west': 27.9, 'east': 28.1}) == [{'id': 'a'}]
+    index.remove('a')
+    assert 'a' not in index
+    assert index.in_bounds({'south': 39.0, 'north': 42.0, 'west': 27.0, 'east': 30.0}) == []
@@ -19,6 +19,8 @@ function App() {
   const [currentPage, setCurrentPage] = useState(1);
   const [hasMore, setHasMore] = useState(false);
   const [totalCount, setTotalCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null); // Sunucudaki sonuç snapshot'ının sonraki sayfası
+  const [resumeToken, setResumeToken] = useState(null); // Kısmi (yarıda kalan) aramanın devam token'ı
   const [loading2, setLoading2] = useState(false); // Daha fazla yükleme için
   const [fetchAll, setFetchAll] = useState(false); // Tümünü getir (fullScan)
   const [isMobile, setIsMobile] = useState(typeof window !== 'undefined' ? window.innerWidth <= 768 : false);
@@ -114,11 +116,19 @@ function App() {
       setLoading(true);
       setCurrentPage(1);
       setResults([]);
+      setNextCursor(null);
+      setResumeToken(null);
     }
     setError('');
     
     try {
+      const basePerPage = fetchAll ? 500 : 20;
+      // Snapshot bittiyse ama arama kısmi kaldıysa tarama devam token'ıyla sürdürülür. Devam eden
+      // arama listeyi baştan döner (yeni bulunanlar sıralamada araya girebilir), bu yüzden
+      // gösterilenler + bir sayfa tek seferde istenir ve liste yenilenir
+      const resume = loadMore && !nextCursor && resumeToken;
       const page = loadMore ? currentPage + 1 : 1;
+      const perPage = resume ? Math.min(500, results.length + basePerPage) : basePerPage;
       const endpoint = saveToSheets ? 'search-and-save' : 'search';
       const url = `${API_BASE_URL}/${endpoint}`;
       const requestBody = {
@@ -128,8 +138,12 @@ function App() {
         restaurantName: restaurantName || null,
         minRating: minRating,
         saveToSheets: saveToSheets,
-        page: page,
-        perPage: fetchAll ? 500 : 20,
+        page: resume ? 1 : page,
+        cursor: loadMore && !resume ? nextCursor : null,
+        resumeToken: resume ? resumeToken : null,
+        perPage: perPage,
+        // Normal aramada ilk sayfa, sayfayı dolduracak kadar sonuç bulununca döner (kalanı devam token'ıyla)
+        enoughResults: !fetchAll,
         fullScan: fetchAll
       };
       
@@ -154,7 +168,10 @@ function App() {
           url: restaurant['Google Maps URL'] || restaurant.url
         }));
         
-        if (loadMore) {
+        if (resume) {
+          setResults(formattedResults);
+          setCurrentPage(Math.ceil(formattedResults.length / basePerPage) || 1);
+        } else if (loadMore) {
           setResults(prevResults => [...prevResults, ...formattedResults]);
           setCurrentPage(page);
         } else {
@@ -172,7 +189,11 @@ function App() {
           });
         }
         
-        setHasMore(fetchAll ? false : (data.hasMore || false));
+        // "Tümünü getir" de sayfalıdır - 500'den fazla sonuç nextCursor ile yüklenir.
+        // Kısmi sonuçta liste bitse de devam token'ıyla daha fazlası istenebilir
+        setHasMore(data.hasMore || data.partial || false);
+        setNextCursor(data.nextCursor || null);
+        setResumeToken(data.resumeToken || null);
         setTotalCount(data.totalCount || formattedResults.length);
         
         if (saveToSheets && data.sheetName) {